@@ -0,0 +1,85 @@
+"""
+Compare the JSON codecs of tidbcloudy on cluster listing payloads.
+
+Usage:
+    python benchmark/codec.py [--clusters 1000] [--repeat 20]
+"""
+
+import argparse
+import copy
+import json
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from tidbcloudy.util.codec import CODECS, get_codec  # noqa: E402
+
+MOCK_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "mock_server", "mock_config.json")
+
+
+REGIONS = ["us-west-2", "us-east-1", "eu-central-1", "ap-southeast-1"]
+VERSIONS = ["v6.1.0", "v6.5.3", "v7.1.1", "v7.5.0"]
+NODE_SIZES = ["4C16G", "8C16G", "8C32G", "8C64G", "16C64G"]
+
+
+def build_payload(clusters: int, seed: int = 0) -> dict:
+    """
+    Build a cluster listing from the clusters of the mock server, varied like a real fleet: each cluster has its own
+    id, name, creation time, hosts and node names, and draws its region, version, node sizes and quantities from a few
+    choices.
+    """
+    with open(MOCK_CONFIG) as f:
+        templates = json.load(f)["clusters"]
+    rng = random.Random(seed)
+    items = []
+    for i in range(clusters):
+        item = copy.deepcopy(templates[i % len(templates)])
+        region = rng.choice(REGIONS)
+        item["id"] = str(1379661944646400000 + i)
+        item["name"] = f"Cluster{i}"
+        item["region"] = region
+        item["create_timestamp"] = str(1656991448 + rng.randrange(10**8))
+        for component in item["config"]["components"].values():
+            component["node_size"] = rng.choice(NODE_SIZES)
+            component["node_quantity"] = rng.randint(1, 6)
+        status = item["status"]
+        status["tidb_version"] = rng.choice(VERSIONS)
+        for nodes in status["node_map"].values():
+            for j, node in enumerate(nodes):
+                node["node_name"] = f"{node['node_name'].split('-')[0]}-{item['id'][-6:]}-{j}"
+                node["availability_zone"] = region + "abc"[j % 3]
+                node["node_size"] = rng.choice(NODE_SIZES)
+        for name, endpoint in status.get("connection_strings", {}).items():
+            if isinstance(endpoint, dict) and "host" in endpoint:
+                endpoint["host"] = f"{name.replace('_', '-')}.{item['id']}.{region}.prod.aws.tidbcloud.com"
+        items.append(item)
+    return {"items": items, "total": clusters}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clusters", type=int, default=1000, help="the number of clusters in the payload")
+    parser.add_argument("--repeat", type=int, default=20, help="the number of runs of each codec")
+    args = parser.parse_args()
+
+    payload = build_payload(args.clusters)
+    body = json.dumps(payload).encode("utf-8")
+    print(f"payload: {args.clusters} clusters, {len(body) / 1024:.1f} KiB")
+    print(f"{'codec':<10}{'loads ms':>12}{'dumps ms':>12}")
+    for name in CODECS:
+        try:
+            codec = get_codec(name)
+        except ImportError:
+            print(f"{name:<10}{'not installed':>24}")
+            continue
+        assert codec.loads(body) == payload
+        loads = min(timeit.repeat(lambda: codec.loads(body), number=1, repeat=args.repeat)) * 1000
+        dumps = min(timeit.repeat(lambda: codec.dumps(payload), number=1, repeat=args.repeat)) * 1000
+        print(f"{name:<10}{loads:>12.2f}{dumps:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
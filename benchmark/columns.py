@@ -0,0 +1,68 @@
+"""
+Compare an aggregation over the attributes of each cluster with the same aggregation over the columns built by
+ColumnBuilder, which uses NumPy if it is installed.
+
+Usage:
+    python benchmark/columns.py [--clusters 100000] [--repeat 5]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+from collections import defaultdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from benchmark.codec import build_payload  # noqa: E402
+from tidbcloudy.cluster import Cluster  # noqa: E402
+from tidbcloudy.context import Context  # noqa: E402
+from tidbcloudy.util.columns import to_columns  # noqa: E402
+
+COLUMNS = ["status.cluster_status", "config.components.tikv.node_quantity"]
+
+
+def aggregate_objects(clusters) -> dict:
+    # The TiKV nodes of each cluster status
+    result = defaultdict(int)
+    for cluster in clusters:
+        result[cluster.status.cluster_status.value] += cluster.config.components.tikv.node_quantity
+    return dict(result)
+
+
+def aggregate_columns(columns) -> dict:
+    statuses, quantities = columns["status.cluster_status"], columns["config.components.tikv.node_quantity"]
+    try:
+        import numpy
+    except ImportError:
+        result = defaultdict(int)
+        for status, quantity in zip(statuses, quantities):
+            result[status] += quantity
+        return dict(result)
+    keys, codes = numpy.unique(numpy.array(statuses, dtype=object), return_inverse=True)
+    sums = numpy.bincount(codes, weights=quantities)
+    return {key: int(value) for key, value in zip(keys, sums)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clusters", type=int, default=100000, help="the number of clusters")
+    parser.add_argument("--repeat", type=int, default=5, help="the number of runs of each step")
+    args = parser.parse_args()
+
+    context = Context("", "", {})
+    records = Cluster.from_records(context, build_payload(args.clusters)["items"])
+    columns = to_columns(records, COLUMNS)
+    assert aggregate_columns(columns) == aggregate_objects(records)
+
+    def best(fn) -> float:
+        return min(timeit.repeat(fn, number=1, repeat=args.repeat)) * 1000
+
+    print(f"clusters: {args.clusters}, numpy: {type(columns[COLUMNS[1]]).__module__ == 'numpy'}")
+    print(f"attribute loop:   {best(lambda: aggregate_objects(records)):.2f} ms")
+    print(f"build columns:    {best(lambda: to_columns(records, COLUMNS)):.2f} ms")
+    print(f"column aggregate: {best(lambda: aggregate_columns(columns)):.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
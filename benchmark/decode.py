@@ -0,0 +1,102 @@
+"""
+Compare the compiled per-class decoders and encoders of TiDBCloudyBase with the generic field walk they replaced, and
+the bulk from_objects with a from_object call per item, on cluster listing payloads.
+
+Usage:
+    python benchmark/decode.py [--clusters 1000] [--repeat 20]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from benchmark.codec import build_payload  # noqa: E402
+from tidbcloudy._base import TiDBCloudyBase, TiDBCloudyContextualBase, TiDBCloudyListField  # noqa: E402
+from tidbcloudy.cluster import Cluster  # noqa: E402
+from tidbcloudy.context import Context  # noqa: E402
+
+
+def generic_from_object(cls, context, obj):
+    inst = cls(context=context) if issubclass(cls, TiDBCloudyContextualBase) else cls()
+    generic_assign_object(inst, obj)
+    return inst
+
+
+def generic_assign_object(self, obj):
+    context = self._context if isinstance(self, TiDBCloudyContextualBase) else None
+    for key, descriptor in self._keys.items():
+        value = obj.get(key, None)
+        if value is None:
+            continue
+        if isinstance(descriptor, TiDBCloudyListField):
+            setattr(self, key, [generic_from_object(descriptor.item_type, context, item) for item in value])
+        elif issubclass(descriptor.value_type, TiDBCloudyBase):
+            setattr(self, key, generic_from_object(descriptor.value_type, context, value))
+        else:
+            if descriptor.convert_from is not None:
+                value = descriptor.convert_from(value)
+            setattr(self, key, value)
+
+
+def generic_to_object(self):
+    obj = {}
+    for key, descriptor in self._keys.items():
+        value = getattr(self, key)
+        if isinstance(descriptor, TiDBCloudyListField):
+            value = [] if value is None else [generic_to_object(item) for item in value]
+        else:
+            if value is None and descriptor.none_is_empty:
+                continue
+            if issubclass(descriptor.value_type, TiDBCloudyBase):
+                value = generic_to_object(value)
+            elif descriptor.convert_to is not None:
+                value = descriptor.convert_to(value)
+        obj[key] = value
+    return obj
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clusters", type=int, default=1000, help="the number of clusters in the payload")
+    parser.add_argument("--repeat", type=int, default=20, help="the number of runs of each implementation")
+    args = parser.parse_args()
+
+    context = Context("", "", {})
+    items = build_payload(args.clusters)["items"]
+    clusters = [Cluster.from_object(context, item) for item in items]
+    generic = [generic_from_object(Cluster, context, item) for item in items]
+    assert [cluster.to_object() for cluster in clusters] == [generic_to_object(cluster) for cluster in generic]
+
+    def best(fn) -> float:
+        return min(timeit.repeat(fn, number=1, repeat=args.repeat)) * 1000
+
+    results = [
+        (
+            "decode",
+            best(lambda: [generic_from_object(Cluster, context, item) for item in items]),
+            best(lambda: [Cluster.from_object(context, item) for item in items]),
+        ),
+        (
+            "encode",
+            best(lambda: [generic_to_object(cluster) for cluster in clusters]),
+            best(lambda: [cluster.to_object() for cluster in clusters]),
+        ),
+    ]
+    print(f"payload: {args.clusters} clusters")
+    print(f"{'':<8}{'generic ms':>12}{'compiled ms':>13}{'speedup':>10}")
+    for name, generic_ms, compiled_ms in results:
+        print(f"{name:<8}{generic_ms:>12.2f}{compiled_ms:>13.2f}{generic_ms / compiled_ms:>9.1f}x")
+
+    assert [cluster.to_object() for cluster in Cluster.from_objects(context, items)] == [
+        cluster.to_object() for cluster in clusters
+    ]
+    per_item_ms = best(lambda: [Cluster.from_object(context, item) for item in items])
+    bulk_ms = best(lambda: Cluster.from_objects(context, items))
+    print(f"page: from_object per item {per_item_ms:.2f} ms, from_objects {bulk_ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
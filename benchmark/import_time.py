@@ -0,0 +1,82 @@
+"""
+Measure the time of `import tidbcloudy` in fresh interpreters with `python -X importtime`, and fail when it exceeds a
+budget or when it loads a dependency that must only be loaded on first use.
+
+Usage:
+    python benchmark/import_time.py [--repeat 5] [--top 15] [--budget-ms 150]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, Tuple
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# The dependencies only needed by Cluster.connect, the deprecated methods, ColumnBuilder.build, the asyncio API and the
+# prefetching paginators
+LAZY_MODULES = ("MySQLdb", "deprecation", "packaging", "numpy", "asyncio", "concurrent.futures")
+
+
+def measure(module: str = "tidbcloudy") -> Dict[str, Tuple[int, int]]:
+    """
+    Import a module in a fresh interpreter.
+
+    Returns:
+        the (self, cumulative) import time in microseconds of each imported module.
+
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [ROOT, env.get("PYTHONPATH")]))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=env,
+        stderr=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        universal_newlines=True,
+        check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():
+            continue
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="the number of fresh interpreters")
+    parser.add_argument("--top", type=int, default=15, help="the number of slowest modules to print")
+    parser.add_argument("--budget-ms", type=float, default=None, help="the budget of the median import time")
+    args = parser.parse_args()
+
+    # The first run compiles the bytecode caches, so it is not measured
+    measure()
+    runs = [measure() for _ in range(args.repeat)]
+    totals = [run["tidbcloudy"][1] / 1000 for run in runs]
+    median = statistics.median(totals)
+    print(f"import tidbcloudy: median {median:.1f} ms, min {min(totals):.1f} ms over {args.repeat} runs")
+    last = runs[-1]
+    print(f"{'module':<40}{'self ms':>10}{'cumulative ms':>15}")
+    for name, (self_us, cumulative_us) in sorted(last.items(), key=lambda item: -item[1][0])[: args.top]:
+        print(f"{name:<40}{self_us / 1000:>10.1f}{cumulative_us / 1000:>15.1f}")
+
+    failed = False
+    loaded = [name for name in LAZY_MODULES if name in last]
+    if loaded:
+        print(f"FAIL: loaded on import: {', '.join(loaded)}")
+        failed = True
+    if args.budget_ms is not None and median > args.budget_ms:
+        print(f"FAIL: median {median:.1f} ms exceeds the budget of {args.budget_ms:.1f} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Compare the eager and the lazy decoding of cluster listing payloads, for an id-only scan and for a scan reading the
+nested fields of every cluster.
+
+Usage:
+    python benchmark/lazy.py [--clusters 1000] [--repeat 20]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from benchmark.codec import build_payload  # noqa: E402
+from tidbcloudy.cluster import Cluster  # noqa: E402
+from tidbcloudy.context import Context  # noqa: E402
+
+
+def id_scan(context, items, lazy: bool) -> list:
+    return [(cluster.id, cluster.name) for cluster in (Cluster.from_object(context, item, lazy) for item in items)]
+
+
+def full_scan(context, items, lazy: bool) -> list:
+    return [
+        (
+            cluster.id,
+            cluster.config.components.tidb.node_size,
+            [node.node_name for node in cluster.status.node_map.tidb],
+        )
+        for cluster in (Cluster.from_object(context, item, lazy) for item in items)
+    ]
+
+
+def peak_kib(fn) -> float:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clusters", type=int, default=1000, help="the number of clusters in the payload")
+    parser.add_argument("--repeat", type=int, default=20, help="the number of runs of each mode")
+    args = parser.parse_args()
+
+    context = Context("", "", {})
+    items = build_payload(args.clusters)["items"]
+    assert full_scan(context, items, True) == full_scan(context, items, False)
+    lazy = [Cluster.from_object(context, item, lazy=True) for item in items]
+    assert [cluster.to_object() for cluster in lazy] == [
+        Cluster.from_object(context, item).to_object() for item in items
+    ]
+
+    def best(fn) -> float:
+        return min(timeit.repeat(fn, number=1, repeat=args.repeat)) * 1000
+
+    print(f"payload: {args.clusters} clusters")
+    print(f"{'':<10}{'eager ms':>10}{'lazy ms':>10}{'speedup':>10}")
+    for name, scan in (("id scan", id_scan), ("full scan", full_scan)):
+        eager_ms = best(lambda: scan(context, items, False))
+        lazy_ms = best(lambda: scan(context, items, True))
+        print(f"{name:<10}{eager_ms:>10.2f}{lazy_ms:>10.2f}{eager_ms / lazy_ms:>9.1f}x")
+    # The memory allocated to hold the decoded clusters, the lazy ones share the nested dicts with the payload
+    eager_kib = peak_kib(lambda: [Cluster.from_object(context, item) for item in items])
+    lazy_kib = peak_kib(lambda: [Cluster.from_object(context, item, lazy=True) for item in items])
+    print(f"retained: eager {eager_kib:.1f} KiB, lazy {lazy_kib:.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Compare the memory held by cluster listings decoded to full clusters and to compact records, and the time to decode
+them.
+
+Usage:
+    python benchmark/records.py [--clusters 10000] [--page-size 100] [--repeat 5]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from benchmark.codec import build_payload  # noqa: E402
+from tidbcloudy.cluster import Cluster  # noqa: E402
+from tidbcloudy.context import Context  # noqa: E402
+
+
+def retained_kib(fn) -> float:
+    tracemalloc.start()
+    try:
+        result = fn()
+        size = tracemalloc.get_traced_memory()[0]
+        del result
+        return size / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clusters", type=int, default=10000, help="the number of clusters")
+    parser.add_argument("--page-size", type=int, default=100, help="the number of clusters of each list response")
+    parser.add_argument("--repeat", type=int, default=5, help="the number of runs of each mode")
+    args = parser.parse_args()
+
+    context = Context("", "", {})
+    items = build_payload(args.clusters)["items"]
+    pages = [items[i : i + args.page_size] for i in range(0, len(items), args.page_size)]
+    modes = {
+        "full": lambda: [cluster for page in pages for cluster in Cluster.from_objects(context, page)],
+        "compact": lambda: [record for page in pages for record in Cluster.from_records(context, page)],
+    }
+    expected = [cluster.to_object() for cluster in modes["full"]()]
+    assert [record.to_object() for record in modes["compact"]()] == expected
+
+    print(f"listing: {args.clusters} clusters in pages of {args.page_size}")
+    print(f"{'':<9}{'decode ms':>11}{'KiB':>11}{'bytes/cluster':>15}")
+    full_kib = None
+    for name, fn in modes.items():
+        decode_ms = min(timeit.repeat(fn, number=1, repeat=args.repeat)) * 1000
+        kib = retained_kib(fn)
+        full_kib = full_kib or kib
+        print(f"{name:<9}{decode_ms:>11.2f}{kib:>11.1f}{kib * 1024 / args.clusters:>15.0f}  {full_kib / kib:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
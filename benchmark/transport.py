@@ -0,0 +1,44 @@
+"""
+Compare the SDK calls served by the mock server in-process through a WSGI transport with the same calls over TCP.
+
+Usage:
+    python benchmark/transport.py [--calls 200] [--tcp]
+
+The TCP run needs the mock server running in another process: python -m mock_server.run
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import tidbcloudy  # noqa: E402
+from mock_server.wsgi import SERVER_CONFIG, create_api  # noqa: E402
+
+
+def run(api: tidbcloudy.TiDBCloud, calls: int) -> float:
+    project = api.get_project("2", update_from_server=True)
+    start = time.perf_counter()
+    for _ in range(calls):
+        project.list_clusters()
+    return (time.perf_counter() - start) / calls * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200, help="the number of list_clusters calls of each run")
+    parser.add_argument("--tcp", action="store_true", help="also run over TCP against a running mock server")
+    args = parser.parse_args()
+
+    print(f"{'transport':<10}{'ms/call':>10}")
+    with create_api() as api:
+        print(f"{'wsgi':<10}{run(api, args.calls):>10.3f}")
+    if args.tcp:
+        with tidbcloudy.TiDBCloud(public_key="", private_key="", server_config=SERVER_CONFIG) as api:
+            print(f"{'tcp':<10}{run(api, args.calls):>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
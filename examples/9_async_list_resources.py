@@ -0,0 +1,27 @@
+import asyncio
+import os
+
+import tidbcloudy
+
+public_key = os.environ.get("PUBLIC_KEY")
+private_key = os.environ.get("PRIVATE_KEY")
+
+
+async def list_cluster_backups(cluster):
+    return cluster, [backup async for backup in cluster.iter_backups_async()]
+
+
+async def main():
+    async with tidbcloudy.AsyncTiDBCloud(public_key=public_key, private_key=private_key) as api:
+        clusters = []
+        async for project in api.iter_projects():
+            print(project)
+            async for cluster in project.iter_clusters_async():
+                clusters.append(cluster)
+        # List the backups of all clusters concurrently on one event loop
+        for cluster, backups in await asyncio.gather(*[list_cluster_backups(cluster) for cluster in clusters]):
+            print(cluster, backups)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,53 @@
+import httpx
+
+from mock_server.run import app
+from tidbcloudy import AsyncTiDBCloud, TiDBCloud
+
+# The base URLs must use the SERVER_NAME of the app so that Flask routes the requests
+SERVER_CONFIG = {
+    "v1beta": "http://{}/api/v1beta/".format(app.config["SERVER_NAME"]),
+    "billing": "http://{}/billing/v1beta1/".format(app.config["SERVER_NAME"]),
+}
+
+
+def create_transport() -> httpx.WSGITransport:
+    """
+    Create a transport serving the requests with the mock server app in-process, without sockets or a server process.
+    """
+    return httpx.WSGITransport(app=app)
+
+
+def create_api(**kwargs) -> TiDBCloud:
+    """
+    Create a TiDBCloud bound to the in-process mock server.
+    Args:
+        kwargs: the request options of the underlying Context, except transport.
+
+    Examples:
+        .. code-block:: python
+            from mock_server.wsgi import create_api
+            api = create_api()
+            for project in api.iter_projects():
+                print(project)
+    """
+    return TiDBCloud(public_key="", private_key="", server_config=SERVER_CONFIG, transport=create_transport(), **kwargs)
+
+
+class _AsyncWSGITransport(httpx.AsyncBaseTransport):
+    # httpx has no asyncio WSGI transport, the app runs synchronously in the event loop thread
+    def __init__(self):
+        self._transport = create_transport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        response = self._transport.handle_request(request)
+        return httpx.Response(response.status_code, headers=response.headers, content=response.read())
+
+
+def create_async_api(**kwargs) -> AsyncTiDBCloud:
+    """
+    The asyncio version of create_api. The app handles the requests one at a time in the event loop thread.
+    """
+    return AsyncTiDBCloud(
+        public_key="", private_key="", server_config=SERVER_CONFIG, transport=_AsyncWSGITransport(), **kwargs
+    )
@@ -1,3 +1,7 @@
+import httpx
+
+from tidbcloudy.util.transport import TransportProfile
+
 TEST_SERVER_CONFIG = {
     "v1beta": "http://127.0.0.1:5000/api/v1beta/",
     "billing": "http://127.0.0.1:5000/billing/v1beta1/",
@@ -22,3 +26,27 @@ TEST_CLUSTER_CONFIG = {
     "name": "test",
     "region": "us-west-1",
 }
+
+
+class MockTransportProfile(TransportProfile):
+    """Serve the requests of a Context with a handler function instead of the network."""
+
+    def __init__(self, handler):
+        super().__init__()
+        self.handler = handler
+
+    def create_transport(self):
+        return httpx.MockTransport(self.handler)
+
+    def create_async_transport(self):
+        return httpx.MockTransport(self.handler)
+
+
+class FakeClock:
+    """A manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+
+import tidbcloudy
+from test_server_config import TEST_SERVER_CONFIG
+from tidbcloudy.cluster import Cluster
+from tidbcloudy.context import AsyncContext
+from tidbcloudy.project import Project
+from tidbcloudy.specification import BillingMonthSummary, CloudSpecification
+from tidbcloudy.util.page import Page
+
+
+def new_api() -> tidbcloudy.AsyncTiDBCloud:
+    return tidbcloudy.AsyncTiDBCloud(public_key="", private_key="", server_config=TEST_SERVER_CONFIG)
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class TestAsyncTiDBCloud:
+    def test_list_projects(self):
+        async def main():
+            async with new_api() as api:
+                return await api.list_projects(page=1, page_size=1)
+
+        projects = run(main())
+        assert isinstance(projects, Page)
+        assert projects.total == 2
+        assert len(projects.items) == 1
+        assert isinstance(projects.items[0], Project)
+        assert isinstance(projects.items[0].context, AsyncContext)
+
+    def test_iter_projects(self):
+        async def main():
+            async with new_api() as api:
+                return [project async for project in api.iter_projects(page_size=1)]
+
+        projects = run(main())
+        assert [project.id for project in projects] == ["1", "2"]
+
+    def test_get_project(self):
+        async def main():
+            async with new_api() as api:
+                return await api.get_project(project_id="1", update_from_server=True)
+
+        project = run(main())
+        assert project.name == "default_project"
+
+    def test_list_provider_regions(self):
+        async def main():
+            async with new_api() as api:
+                return await api.list_provider_regions()
+
+        provider_regions = run(main())
+        assert len(provider_regions) == 2
+        assert all(isinstance(spec, CloudSpecification) for spec in provider_regions)
+
+    def test_get_monthly_bill(self):
+        async def main():
+            async with new_api() as api:
+                return await api.get_monthly_bill(month="202310")
+
+        billing = run(main())
+        assert isinstance(billing, BillingMonthSummary)
+        assert billing.overview.billedMonth == "2023-10"
+
+
+class TestAsyncProject:
+    def test_clusters(self):
+        async def main():
+            async with new_api() as api:
+                project = await api.get_project(project_id="2")
+                page = await project.list_clusters_async()
+                clusters = [cluster async for cluster in project.iter_clusters_async(page_size=1)]
+                results = await asyncio.gather(*[project.get_cluster_async(cluster.id) for cluster in clusters])
+                available = await results[0].wait_for_available_async(timeout_sec=5, interval_sec=1)
+                return page, clusters, results, available
+
+        page, clusters, results, available = run(main())
+        assert page.total == len(page.items) == 2
+        assert [cluster.id for cluster in clusters] == [cluster.id for cluster in page.items]
+        assert all(isinstance(cluster, Cluster) for cluster in results)
+        assert [cluster.to_object() for cluster in results] == [cluster.to_object() for cluster in clusters]
+        assert available is True
+
+    def test_clusters_stream(self):
+        async def main():
+            async with new_api() as api:
+                project = await api.get_project(project_id="2")
+                page = await project.list_clusters_async(stream=True)
+                clusters = [cluster async for cluster in page.items]
+                return page, clusters, await page.read_total()
+
+        page, clusters, total = run(main())
+        assert total == page.total == len(clusters) == 2
+        assert all(isinstance(cluster, Cluster) for cluster in clusters)
+
+    def test_context_mismatch(self):
+        async def main():
+            async with new_api() as api:
+                project = await api.get_project(project_id="2")
+                with pytest.raises(TypeError, match="list_clusters needs an object bound to a Context"):
+                    project.list_clusters()
+                with pytest.raises(TypeError, match="list_clusters"):
+                    next(project.iter_clusters())
+
+        run(main())
+        project = tidbcloudy.TiDBCloud(public_key="", private_key="", server_config=TEST_SERVER_CONFIG).get_project("2")
+        with pytest.raises(TypeError, match="list_clusters_async needs an object bound to an AsyncContext"):
+            run(project.list_clusters_async())
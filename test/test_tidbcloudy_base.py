@@ -1,6 +1,26 @@
+import json
+import os
+
+import pytest
+
 from test_server_config import TEST_CLUSTER_CONFIG
+from tidbcloudy._base import TiDBCloudyBase, TiDBCloudyField, _Compiled
 from tidbcloudy.cluster import Cluster
 from tidbcloudy.context import Context
+from tidbcloudy.specification import (
+    BillingMonthOverview,
+    ClusterComponents,
+    ClusterConfig,
+    ClusterStatus,
+    ClusterType,
+    IPAccessList,
+    NodeMapSpec,
+    NodeQuantityRange,
+    TiFlashComponent,
+    TiFlashNodeMap,
+    TiKVComponent,
+    TiKVNodeMap,
+)
 
 
 class TestTiDBCloudyBase:
@@ -26,3 +46,133 @@ class TestTiDBCloudyBase:
         assert cluster.name == "test"
         assert cluster.region == "us-west-1"
         assert cluster.to_object() == TEST_CLUSTER_CONFIG
+
+    def test_mock_clusters(self):
+        context = Context("", "", {})
+        with open(os.path.join(os.path.dirname(__file__), "..", "mock_server", "mock_config.json")) as f:
+            items = json.load(f)["clusters"]
+        for item in items:
+            cluster = Cluster.from_object(context, item)
+            assert cluster.context is context
+            assert cluster.status.cluster_status == ClusterStatus(item["status"]["cluster_status"])
+            assert [node.node_name for node in cluster.status.node_map.tidb] == [
+                node["node_name"] for node in item["status"]["node_map"]["tidb"]
+            ]
+            obj = cluster.to_object()
+            assert Cluster.from_object(context, obj).to_object() == obj
+        with pytest.raises(TypeError):
+            Cluster.from_object(None, items[0])
+
+    def test_assign_object(self):
+        context = Context("", "", {})
+        cluster = Cluster.from_object(context, TEST_CLUSTER_CONFIG)
+        cluster.assign_object({"name": "renamed", "status": {"cluster_status": "PAUSED"}})
+        assert cluster.name == "renamed"
+        assert cluster.status.cluster_status == ClusterStatus.PAUSED
+        assert cluster.config.port == 4000
+
+    def test_inherited_fields(self):
+        overview = BillingMonthOverview.from_object(obj={"billedMonth": "2023-10", "totalCost": "1.00"})
+        assert overview.billedMonth == "2023-10"
+        assert overview.totalCost == "1.00"
+        assert overview.credits is None
+        assert overview.to_object() == {"billedMonth": "2023-10", "totalCost": "1.00"}
+        assert BillingMonthOverview.to_object.__qualname__ == "BillingMonthOverview.to_object"
+
+    def test_compile_on_first_use(self):
+        class Inner(TiDBCloudyBase):
+            __slots__ = ["_size"]
+            size: int = TiDBCloudyField(int)
+
+        class Outer(TiDBCloudyBase):
+            __slots__ = ["_name", "_inner"]
+            name: str = TiDBCloudyField(str)
+            inner: Inner = TiDBCloudyField(Inner)
+
+        assert isinstance(Outer.__dict__["_decode"], _Compiled)
+        assert isinstance(Outer.__dict__["Record"], _Compiled)
+        assert Inner(size=1).to_object() == {"size": 1}
+        outer = Outer.from_object(obj={"name": "a", "inner": {"size": 2}})
+        assert not isinstance(Outer.__dict__["_decode"], _Compiled)
+        assert outer.to_object() == {"name": "a", "inner": {"size": 2}}
+        assert Outer._decode.__qualname__.endswith("Outer._decode")
+        assert Outer.from_records(None, [outer.to_object()])[0].inner.size == 2
+
+    def test_lazy(self):
+        context = Context("", "", {})
+        cluster = Cluster.from_object(context, TEST_CLUSTER_CONFIG, lazy=True)
+        assert cluster.cluster_type == ClusterType.DEDICATED
+        assert type(cluster._config) is dict
+        assert cluster.config.port == 4000
+        assert type(cluster._config) is ClusterConfig
+        assert cluster.config is cluster.config
+        assert type(cluster.config._ip_access_list) is list
+        assert type(cluster.config._ip_access_list[0]) is dict
+        assert [item.cidr for item in cluster.config.ip_access_list] == [
+            item["cidr"] for item in TEST_CLUSTER_CONFIG["config"]["ip_access_list"]
+        ]
+        assert type(cluster.config._ip_access_list[0]) is IPAccessList
+        eager = Cluster.from_object(context, TEST_CLUSTER_CONFIG)
+        assert Cluster.from_object(context, TEST_CLUSTER_CONFIG, lazy=True).to_object() == eager.to_object()
+
+    def test_from_objects(self):
+        context = Context("", "", {})
+        with open(os.path.join(os.path.dirname(__file__), "..", "mock_server", "mock_config.json")) as f:
+            items = json.load(f)["clusters"]
+        clusters = Cluster.from_objects(context, items)
+        assert [cluster.to_object() for cluster in clusters] == [
+            Cluster.from_object(context, item).to_object() for item in items
+        ]
+        assert all(cluster.context is context for cluster in clusters)
+        lazy = Cluster.from_objects(context, items, lazy=True)
+        assert all(type(cluster._config) is dict for cluster in lazy)
+        assert [cluster.to_object() for cluster in lazy] == [cluster.to_object() for cluster in clusters]
+        assert Cluster.from_objects(context, []) == []
+        assert [item.cidr for item in IPAccessList.from_objects(items=[{"cidr": "0.0.0.0/0"}, {}])] == [
+            "0.0.0.0/0",
+            None,
+        ]
+        with pytest.raises(TypeError):
+            Cluster.from_objects(None, items)
+
+    def test_records(self):
+        context = Context("", "", {})
+        with open(os.path.join(os.path.dirname(__file__), "..", "mock_server", "mock_config.json")) as f:
+            items = json.load(f)["clusters"]
+        records = Cluster.from_records(context, items + items)
+        clusters = Cluster.from_objects(context, items + items)
+        assert [record.to_object() for record in records] == [cluster.to_object() for cluster in clusters]
+        record = records[0]
+        assert isinstance(record, Cluster.Record) and isinstance(record, tuple)
+        assert record.context is context
+        assert record.cluster_type == clusters[0].cluster_type
+        assert record.status.cluster_status is clusters[0].status.cluster_status
+        assert type(record.status.node_map.tidb) is tuple
+        # The equal nested records of the clusters are shared
+        assert records[len(items)].config is record.config
+        with pytest.raises(AttributeError):
+            record.name = "renamed"
+        cluster = record.materialize()
+        assert isinstance(cluster, Cluster) and cluster.context is context
+        assert cluster.to_object() == clusters[0].to_object()
+        assert repr(IPAccessList.from_records(items=[{"cidr": "0.0.0.0/0"}])[0]) == (
+            "IPAccessListRecord(cidr='0.0.0.0/0', description=None)"
+        )
+        with pytest.raises(TypeError):
+            Cluster.from_records(None, items)
+
+    def test_records_of_equal_values(self):
+        spec = {"node_size": "8C", "node_quantity": 3, "storage_size_gib": 500}
+        obj = {"tidb": {"node_size": "8C", "node_quantity": 1}, "tikv": spec, "tiflash": dict(spec)}
+        record = ClusterComponents.from_records(items=[obj])[0]
+        assert type(record.tikv) is TiKVComponent.Record
+        assert type(record.tiflash) is TiFlashComponent.Record
+        assert type(record.tikv.materialize()) is TiKVComponent
+        assert type(record.tiflash.materialize()) is TiFlashComponent
+        node = {"node_name": "node", "availability_zone": "a", "node_size": "8C", "status": "NODE_STATUS_AVAILABLE"}
+        node_map = NodeMapSpec.from_records(items=[{"tikv": [node], "tiflash": [dict(node)]}])[0]
+        assert type(node_map.tikv[0]) is TiKVNodeMap.Record
+        assert type(node_map.tiflash[0]) is TiFlashNodeMap.Record
+        # True, 1 and 1.0 are equal but must keep their types
+        ranges = NodeQuantityRange.from_records(items=[{"min": True, "step": 1}, {"min": 1, "step": 1.0}])
+        assert [type(value) for value in ranges[0] + ranges[1]] == [bool, int, int, float]
@@ -0,0 +1,43 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# The modules only loaded on first use: by Cluster.connect, the deprecated methods, ColumnBuilder.build, the asyncio
+# API and the prefetching paginators. The import time itself is measured by benchmark/import_time.py
+LAZY_MODULES = ["MySQLdb", "deprecation", "numpy", "asyncio", "concurrent.futures"]
+
+
+def loaded_modules(module: str = "tidbcloudy") -> list:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [ROOT, env.get("PYTHONPATH")]))
+    proc = subprocess.run(
+        [sys.executable, "-c", "import sys, {}; print(*sys.modules)".format(module)],
+        env=env,
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    return proc.stdout.split()
+
+
+def test_lazy_dependencies():
+    modules = loaded_modules()
+    assert "tidbcloudy.specification" in modules
+    for module in LAZY_MODULES:
+        assert module not in modules
+
+
+def test_deprecated():
+    from tidbcloudy.util.lazy import deprecated
+
+    @deprecated(details="Use new_add instead")
+    def add(a, b):
+        return a + b
+
+    assert "Use new_add instead" in add.__doc__
+    with pytest.warns(DeprecationWarning, match="Use new_add instead"):
+        assert add(1, 2) == 3
@@ -170,6 +170,38 @@ class TestCluster:
             else:
                 assert False
 
+    def test_list_clusters_stream(self):
+        clusters = project.list_clusters(stream=True)
+        assert isinstance(clusters, Page)
+        items = list(clusters.items)
+        assert len(items) == clusters.total == 2
+        assert [cluster.to_object() for cluster in items] == [
+            cluster.to_object() for cluster in project.list_clusters().items
+        ]
+
+    def test_iter_clusters_lazy(self):
+        clusters = list(project.iter_clusters(lazy=True))
+        assert len(clusters) == 2
+        assert all(type(cluster._config) is dict for cluster in clusters)
+        for cluster in clusters:
+            if cluster.cluster_type.value == "DEDICATED":
+                TestCluster.assert_cluster_dedicated_properties(cluster)
+            else:
+                TestCluster.assert_cluster_developer_properties(cluster)
+        assert [cluster.to_object() for cluster in clusters] == [
+            cluster.to_object() for cluster in project.list_clusters().items
+        ]
+
+    def test_iter_clusters_compact(self):
+        records = list(project.iter_clusters(compact=True))
+        assert [record.to_object() for record in records] == [
+            cluster.to_object() for cluster in project.list_clusters().items
+        ]
+        assert all(isinstance(record, Cluster.Record) for record in records)
+        streamed = list(project.list_clusters(stream=True, compact=True).items)
+        assert streamed == records
+        assert all(isinstance(record.materialize(), Cluster) for record in records)
+
     def test_get_cluster(self):
         cluster = project.get_cluster(cluster_id="2")
         assert isinstance(cluster, Cluster)
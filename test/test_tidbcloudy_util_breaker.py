@@ -0,0 +1,128 @@
+import asyncio
+
+import httpx
+import pytest
+
+import tidbcloudy
+from test_server_config import FakeClock, MockTransportProfile
+from tidbcloudy.exception import TiDBCloudCircuitOpenException, TiDBCloudResponseException
+from tidbcloudy.util.breaker import CircuitBreaker
+from tidbcloudy.util.retry import RetryPolicy
+
+SERVER_CONFIG = {"v1beta": "https://api.tidbcloud.com/api/v1beta/", "billing": "https://billing.tidbapi.com/v1beta1/"}
+
+
+class TestCircuitBreaker:
+    def test_open_and_close(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_rate_threshold=0.5, window_size=4, min_calls=4, open_seconds=10, clock=clock)
+        for failure in [True, False, True]:
+            assert breaker.acquire("billing") is None
+            breaker.record("billing", failure)
+        assert breaker.state("billing") == "closed"
+        assert breaker.acquire("billing") is None
+        breaker.record("billing", True)
+        assert breaker.state("billing") == "open"
+        assert breaker.acquire("billing") == 10
+        assert breaker.acquire("v1beta") is None
+        clock.now = 10
+        assert breaker.state("billing") == "half_open"
+        assert breaker.acquire("billing") is None
+        assert breaker.acquire("billing") == 0
+        breaker.record("billing", True)
+        assert breaker.state("billing") == "open"
+        clock.now = 20
+        assert breaker.acquire("billing") is None
+        breaker.record("billing", False)
+        assert breaker.state("billing") == "closed"
+        assert breaker.stats()["billing"] == {"state": "closed", "failure_rate": 0.0, "opens": 2, "rejected": 2}
+
+    def test_lost_probe(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(window_size=1, min_calls=1, open_seconds=10, clock=clock)
+        breaker.record("billing", True)
+        clock.now = 10
+        assert breaker.acquire("billing") is None
+        clock.now = 19
+        assert breaker.acquire("billing") == 0
+        clock.now = 20
+        assert breaker.acquire("billing") is None
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            CircuitBreaker(failure_rate_threshold=0)
+
+
+def test_context_fail_fast():
+    calls = []
+    statuses = {"billing": 503, "v1beta": 404}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        server = "billing" if request.url.host == "billing.tidbapi.com" else "v1beta"
+        calls.append(server)
+        return httpx.Response(statuses[server], json={})
+
+    clock = FakeClock()
+    breaker = CircuitBreaker(window_size=4, min_calls=4, open_seconds=30, clock=clock)
+    api = tidbcloudy.TiDBCloud(
+        "",
+        "",
+        SERVER_CONFIG,
+        transport_profile=MockTransportProfile(handler),
+        retry_policy=RetryPolicy(max_retries=10, backoff_base=0),
+        circuit_breaker=breaker,
+    )
+    with pytest.raises(TiDBCloudCircuitOpenException) as exc_info:
+        api.get_monthly_bill("2023-10")
+    assert exc_info.value.server == "billing"
+    assert exc_info.value.retry_after == 30
+    assert calls.count("billing") == 4
+    with pytest.raises(TiDBCloudCircuitOpenException):
+        api.get_monthly_bill("2023-10")
+    assert calls.count("billing") == 4
+    # The 4xx responses are not failures of the server
+    for _ in range(5):
+        with pytest.raises(TiDBCloudResponseException):
+            api.list_projects()
+    assert breaker.state("v1beta") == "closed"
+    statuses["billing"] = 200
+    clock.now = 30
+    api.get_monthly_bill("2023-10")
+    assert breaker.state("billing") == "closed"
+    assert api._context.circuit_breaker is breaker
+
+
+def test_cancelled_probe():
+    entered = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        entered.set()
+        await asyncio.Event().wait()
+
+    clock = FakeClock()
+    breaker = CircuitBreaker(window_size=1, min_calls=1, open_seconds=10, clock=clock)
+    breaker.record("billing", True)
+    clock.now = 10
+
+    async def main():
+        api = tidbcloudy.AsyncTiDBCloud(
+            "", "", SERVER_CONFIG, transport_profile=MockTransportProfile(handler), circuit_breaker=breaker
+        )
+        task = asyncio.ensure_future(api.get_monthly_bill("2023-10"))
+        await entered.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await api.aclose()
+
+    asyncio.run(main())
+    # The cancelled probe neither closes nor reopens the circuit
+    assert breaker.state("billing") == "half_open"
+    assert breaker.stats()["billing"]["opens"] == 1
+
+
+def test_circuit_open_message():
+    assert str(TiDBCloudCircuitOpenException("billing")) == "circuit of server billing is open"
+    assert (
+        str(TiDBCloudCircuitOpenException("billing", 2)) == "circuit of server billing is open, retry after 2.0 seconds"
+    )
@@ -0,0 +1,118 @@
+import httpx
+
+from test_server_config import FakeClock, MockTransportProfile
+from tidbcloudy.context import Context
+from tidbcloudy.project import Project
+from tidbcloudy.util.cache import ResponseCache
+from tidbcloudy.util.singleflight import request_key
+
+
+class TestResponseCache:
+    def test_ttl(self):
+        clock = FakeClock()
+        cache = ResponseCache(ttls={"projects/*/clusters/*": 10, "bills/*": 0}, default_ttl=60, clock=clock)
+        assert cache.get_ttl("projects/1/clusters/2") == 10
+        assert cache.get_ttl("bills/2023-10") == 0
+        assert cache.get_ttl("projects") == 60
+        cluster_key = request_key("v1beta", "projects/1/clusters/2")
+        cache.set(cluster_key, {"id": "2"})
+        cache.set(request_key("billing", "bills/2023-10"), {})
+        assert cache.get(cluster_key) == (True, {"id": "2"})
+        assert cache.get(request_key("billing", "bills/2023-10")) == (False, None)
+        clock.now = 11
+        assert cache.get(cluster_key) == (False, None)
+        assert cache.stats()["size"] == 0
+
+    def test_lru(self):
+        cache = ResponseCache(max_size=2)
+        keys = [request_key("v1beta", "projects", {"page": page}) for page in range(3)]
+        cache.set(keys[0], 0)
+        cache.set(keys[1], 1)
+        cache.get(keys[0])
+        cache.set(keys[2], 2)
+        assert cache.get(keys[0]) == (True, 0)
+        assert cache.get(keys[1]) == (False, None)
+        assert cache.get(keys[2]) == (True, 2)
+        stats = cache.stats()
+        assert stats["evictions"] == 1
+        assert stats["hits"] == 3
+        assert stats["misses"] == 1
+        assert stats["hit_ratio"] == 0.75
+
+    def test_invalidate(self):
+        cache = ResponseCache()
+        paths = [
+            "projects",
+            "projects/1/clusters",
+            "projects/1/clusters/2",
+            "projects/1/clusters/2/backups",
+            "projects/1/clusters/23",
+            "projects/2/clusters",
+        ]
+        for path in paths:
+            cache.set(request_key("v1beta", path), path)
+        cache.set(request_key("billing", "projects"), "billing")
+        cache.invalidate("v1beta", "projects/1/clusters/2")
+        assert [path for path in paths if cache.get(request_key("v1beta", path))[0]] == [
+            "projects/1/clusters/23",
+            "projects/2/clusters",
+        ]
+        assert cache.get(request_key("billing", "projects"))[0] is True
+        assert cache.stats()["invalidations"] == 4
+
+    def test_stale_generation(self):
+        cache = ResponseCache()
+        key = request_key("v1beta", "projects/1/clusters/2")
+        generation = cache.generation
+        cache.invalidate("v1beta", "projects/1/clusters/2")
+        cache.set(key, {"status": "AVAILABLE"}, generation)
+        assert cache.get(key) == (False, None)
+
+
+class TestContextCache:
+    def test_context(self):
+        requests = []
+        status = {"cluster_status": "AVAILABLE"}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            if request.method == "PATCH":
+                status["cluster_status"] = "PAUSED"
+                return httpx.Response(200, json={})
+            return httpx.Response(200, json={"status": dict(status)})
+
+        cache = ResponseCache()
+        context = Context(
+            "", "", {"v1beta": "http://testserver/"}, transport_profile=MockTransportProfile(handler), cache=cache
+        )
+        path = "projects/1/clusters/2"
+        assert context.call_get("v1beta", path)["status"]["cluster_status"] == "AVAILABLE"
+        assert context.call_get("v1beta", path)["status"]["cluster_status"] == "AVAILABLE"
+        assert len(requests) == 1
+        context.call_patch("v1beta", path, json={"config": {"paused": True}})
+        assert context.call_get("v1beta", path)["status"]["cluster_status"] == "PAUSED"
+        assert len(requests) == 3
+        assert context.cache.stats()["hits"] == 1
+
+    def test_restore(self):
+        clusters = [{"id": "1", "project_id": "1", "name": "Cluster1"}]
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.method == "POST":
+                clusters.append({"id": "2", "project_id": "1", "name": "Cluster2"})
+                return httpx.Response(200, json={"id": "3", "cluster_id": "2"})
+            return httpx.Response(200, json={"items": clusters, "total": len(clusters)})
+
+        context = Context(
+            "",
+            "",
+            {"v1beta": "http://testserver/"},
+            transport_profile=MockTransportProfile(handler),
+            cache=ResponseCache(),
+        )
+        project = Project.from_object(context, {"id": "1"})
+        assert [cluster.id for cluster in project.list_clusters().items] == ["1"]
+        assert [cluster.id for cluster in project.list_clusters().items] == ["1"]
+        restore = project.create_restore(name="restored", backup_id="4", cluster_config={"config": {}})
+        assert restore.cluster_id == "2"
+        assert [cluster.id for cluster in project.list_clusters().items] == ["1", "2"]
@@ -0,0 +1,83 @@
+import asyncio
+import time
+
+import pytest
+
+import tidbcloudy
+from test_server_config import TEST_SERVER_CONFIG
+from tidbcloudy.util.cassette import RecordingTransportProfile, ReplayTransportProfile, load_cassette
+
+REPLAY_SERVER_CONFIG = {
+    "v1beta": "http://replay.invalid/api/v1beta/",
+    "billing": "http://replay.invalid/billing/v1beta1/",
+}
+
+
+def clusters_interaction(page: int, latency: float, states: list) -> dict:
+    items = [
+        {"id": str(i), "project_id": "2", "name": f"Cluster{i}", "status": {"cluster_status": state}}
+        for i, state in enumerate(states)
+    ]
+    return {
+        "method": "GET",
+        "path": "/api/v1beta/projects/2/clusters",
+        "params": {"page": str(page), "page_size": "10"},
+        "status": 200,
+        "headers": {"content-type": "application/json"},
+        "body": tidbcloudy.util.codec.get_codec("json").dumps({"items": items, "total": len(states)}).decode(),
+        "latency": latency,
+    }
+
+
+class TestCassette:
+    def test_record_and_replay(self, tmp_path):
+        path = str(tmp_path / "clusters.jsonl.gz")
+        api = tidbcloudy.TiDBCloud("", "", TEST_SERVER_CONFIG, transport_profile=RecordingTransportProfile(path))
+        project = api.get_project("2", update_from_server=True)
+        recorded = [cluster.to_object() for cluster in project.iter_clusters(page_size=2)]
+        api.close()
+        interactions = load_cassette(path)
+        assert interactions[0]["method"] == "GET"
+        assert interactions[0]["path"] == "/api/v1beta/projects"
+        assert all(interaction["status"] == 200 and interaction["latency"] >= 0 for interaction in interactions)
+        assert [interaction["params"]["page"] for interaction in interactions[1:]] == [
+            str(page) for page in range(1, len(interactions))
+        ]
+
+        api = tidbcloudy.TiDBCloud("", "", REPLAY_SERVER_CONFIG, transport_profile=ReplayTransportProfile(path))
+        project = api.get_project("2", update_from_server=True)
+        assert [cluster.to_object() for cluster in project.iter_clusters(page_size=2)] == recorded
+        with pytest.raises(LookupError):
+            project.list_clusters(page=1, page_size=3)
+
+    def test_replay_order(self):
+        interactions = [
+            clusters_interaction(1, 0, ["CREATING"]),
+            clusters_interaction(1, 0, ["AVAILABLE"]),
+        ]
+        api = tidbcloudy.TiDBCloud("", "", REPLAY_SERVER_CONFIG, transport_profile=ReplayTransportProfile(interactions))
+        project = api.get_project("2")
+        statuses = [project.list_clusters().items[0].status.cluster_status.value for _ in range(3)]
+        assert statuses == ["CREATING", "AVAILABLE", "AVAILABLE"]
+
+    def test_latency_scale(self):
+        interactions = [clusters_interaction(1, 0.1, ["AVAILABLE"])]
+        api = tidbcloudy.TiDBCloud(
+            "", "", REPLAY_SERVER_CONFIG, transport_profile=ReplayTransportProfile(interactions, latency_scale=0.5)
+        )
+        project = api.get_project("2")
+        start = time.monotonic()
+        project.list_clusters()
+        assert time.monotonic() - start >= 0.05
+
+    def test_async_replay(self):
+        interactions = [clusters_interaction(1, 0.01, ["AVAILABLE", "PAUSED"])]
+
+        async def main():
+            async with tidbcloudy.AsyncTiDBCloud(
+                "", "", REPLAY_SERVER_CONFIG, transport_profile=ReplayTransportProfile(interactions, latency_scale=1)
+            ) as api:
+                project = await api.get_project("2")
+                return [cluster.name async for cluster in project.iter_clusters_async()]
+
+        assert asyncio.run(main()) == ["Cluster0", "Cluster1"]
@@ -0,0 +1,49 @@
+import httpx
+import pytest
+
+from test_server_config import MockTransportProfile
+from tidbcloudy.context import Context
+from tidbcloudy.util.codec import CODECS, JSONCodec, get_codec
+
+PAYLOAD = {"items": [{"id": "1", "name": "Cluster0", "port": 4000, "paused": False, "tags": None}], "total": 1}
+
+
+@pytest.mark.parametrize("name", list(CODECS))
+def test_round_trip(name):
+    try:
+        codec = get_codec(name)
+    except ImportError:
+        pytest.skip(f"{name} is not installed")
+    assert codec.name == name
+    data = codec.dumps(PAYLOAD)
+    assert isinstance(data, bytes)
+    assert codec.loads(data) == PAYLOAD
+    assert JSONCodec().loads(data) == PAYLOAD
+
+
+def test_get_codec():
+    assert get_codec().name in CODECS
+    assert get_codec("json").name == "json"
+    with pytest.raises(ValueError):
+        get_codec("yaml")
+
+
+def test_context_codec():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, content=b'{"id":"1","name":"\xe6\xb5\x8b\xe8\xaf\x95"}')
+
+    context = Context(
+        "",
+        "",
+        {"v1beta": "https://api.tidbcloud.com/api/v1beta/"},
+        transport_profile=MockTransportProfile(handler),
+        codec=get_codec("json"),
+    )
+    assert context.codec.name == "json"
+    assert context.call_get(server="v1beta", path="projects/1") == {"id": "1", "name": "测试"}
+    context.call_post(server="v1beta", path="projects", json={"name": "测试"})
+    assert requests[-1].headers["Content-Type"] == "application/json"
+    assert JSONCodec().loads(requests[-1].content) == {"name": "测试"}
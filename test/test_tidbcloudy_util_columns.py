@@ -0,0 +1,74 @@
+import json
+import math
+import os
+from array import array
+
+import pytest
+
+from tidbcloudy.backup import Backup
+from tidbcloudy.cluster import Cluster
+from tidbcloudy.context import Context
+from tidbcloudy.util.columns import ColumnBuilder, column_paths, to_columns
+from tidbcloudy.util.page import Page
+
+context = Context("", "", {})
+with open(os.path.join(os.path.dirname(__file__), "..", "mock_server", "mock_config.json")) as f:
+    ITEMS = json.load(f)["clusters"]
+
+
+def test_column_paths():
+    paths = column_paths(Cluster)
+    assert paths["id"] == "string"
+    assert paths["cluster_type"] == "enum"
+    assert paths["create_timestamp"] == "number"
+    assert paths["config.components.tikv.node_quantity"] == "number"
+    assert paths["status.cluster_status"] == "enum"
+    assert paths["config.ip_access_list"] == "object"
+    assert "config" not in paths and "config.components" not in paths
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_to_columns(compact):
+    items = Cluster.from_records(context, ITEMS) if compact else Cluster.from_objects(context, ITEMS)
+    columns = to_columns(Page(items, 1, len(items), len(items)), use_numpy=False)
+    assert list(columns) == list(column_paths(Cluster))
+    assert columns["id"] == [item["id"] for item in ITEMS]
+    assert columns["status.cluster_status"] == [item["status"]["cluster_status"] for item in ITEMS]
+    port = columns["config.port"]
+    assert isinstance(port, array) and port.typecode == "q"
+    assert list(port) == [item["config"]["port"] for item in ITEMS]
+    # A number column with a missing value holds NaN for it
+    tiflash = columns["config.components.tiflash.node_quantity"]
+    expected = [item["config"]["components"].get("tiflash", {}).get("node_quantity") for item in ITEMS]
+    assert tiflash.typecode == "d"
+    assert [None if math.isnan(value) else value for value in tiflash] == expected
+
+
+def test_builder():
+    builder = ColumnBuilder(["id", "status.cluster_status", "config.components.tikv.node_quantity"], use_numpy=False)
+    assert builder.build() == {"id": [], "status.cluster_status": [], "config.components.tikv.node_quantity": []}
+    builder.extend(Cluster.from_objects(context, ITEMS[:1])).extend(iter(Cluster.from_records(context, ITEMS[1:])))
+    assert len(builder) == len(ITEMS)
+    columns = builder.build()
+    assert builder.columns == list(columns)
+    assert list(columns["config.components.tikv.node_quantity"]) == [
+        item["config"]["components"]["tikv"]["node_quantity"] for item in ITEMS
+    ]
+    # The equal strings are shared
+    statuses = columns["status.cluster_status"]
+    assert all(status is statuses[0] for status in statuses if status == statuses[0])
+    with pytest.raises(TypeError):
+        builder.extend([Backup.from_object(context, {"id": "1"})])
+    with pytest.raises(ValueError):
+        ColumnBuilder(["config.ip_access_list.cidr"]).extend(Cluster.from_objects(context, ITEMS))
+    with pytest.raises(ValueError):
+        ColumnBuilder(["config.components"]).extend(Cluster.from_objects(context, ITEMS))
+
+
+def test_numpy():
+    numpy = pytest.importorskip("numpy")
+    columns = to_columns(
+        Cluster.from_records(context, ITEMS), ["config.port", "config.components.tiflash.node_quantity"]
+    )
+    assert columns["config.port"].dtype == numpy.int64
+    assert columns["config.components.tiflash.node_quantity"].dtype == numpy.float64
@@ -0,0 +1,118 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+import tidbcloudy
+from test_server_config import TEST_SERVER_CONFIG
+from tidbcloudy.exception import TiDBCloudResponseException
+from tidbcloudy.util.concurrency import AdaptiveConcurrencyLimiter
+
+
+class TestAdaptiveConcurrencyLimiter:
+    def test_additive_increase(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=4, min_samples=1)
+        for _ in range(50):
+            tokens = [limiter.acquire() for _ in range(limiter.limit)]
+            for token in tokens:
+                limiter.release(token, 0.01, False)
+        assert limiter.limit == 4
+        assert limiter.stats()["increases"] == 2
+
+    def test_no_increase_when_idle(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4)
+        for _ in range(50):
+            limiter.release(limiter.acquire(), 0.01, False)
+        assert limiter.limit == 4
+
+    def test_multiplicative_decrease_once_per_generation(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=8)
+        tokens = [limiter.acquire() for _ in range(8)]
+        for token in tokens:
+            limiter.release(token, 0.01, True)
+        assert limiter.limit == 4
+        limiter.release(limiter.acquire(), 0.01, True)
+        assert limiter.limit == 2
+        stats = limiter.stats()
+        assert stats["decreases"] == 2
+        assert stats["error_rate"] == 1.0
+        for _ in range(3):
+            limiter.release(limiter.acquire(), 0.01, True)
+        assert limiter.limit == 1
+
+    def test_latency_spike(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4, min_samples=5, latency_tolerance=2.0)
+        for _ in range(5):
+            limiter.release(limiter.acquire(), 0.01, False)
+        assert limiter.limit == 4
+        for _ in range(5):
+            limiter.release(limiter.acquire(), 0.1, False)
+        assert limiter.limit == 2
+
+    def test_mixed_endpoints(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4, max_limit=16)
+        limiter.release(limiter.acquire(), 0.02, False, "fast")
+        for i in range(2000):
+            tokens = [limiter.acquire() for _ in range(limiter.limit)]
+            for j, token in enumerate(tokens):
+                limiter.release(token, 0.1 + 0.01 * ((i + j) % 2), False, "slow")
+        assert limiter.stats()["decreases"] == 0
+        assert limiter.limit == 16
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            AdaptiveConcurrencyLimiter(multiplicative_decrease=1)
+        with pytest.raises(ValueError):
+            AdaptiveConcurrencyLimiter(initial_limit=10, max_limit=5)
+
+    def test_threads(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=2)
+        peak = []
+        lock = threading.Lock()
+
+        def work():
+            token = limiter.acquire()
+            with lock:
+                peak.append(limiter.in_flight)
+            time.sleep(0.01)
+            limiter.release(token, 0.01, False)
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert max(peak) <= 2
+        assert limiter.in_flight == 0
+
+    def test_async(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=2)
+        peak = []
+
+        async def work():
+            token = await limiter.acquire_async()
+            peak.append(limiter.in_flight)
+            await asyncio.sleep(0.01)
+            limiter.release(token, 0.01, False)
+
+        async def main():
+            await asyncio.gather(*[work() for _ in range(8)])
+
+        asyncio.run(main())
+        assert len(peak) == 8
+        assert max(peak) <= 2
+        assert limiter.in_flight == 0
+
+
+def test_context_releases_slots():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1)
+    api = tidbcloudy.TiDBCloud(
+        public_key="", private_key="", server_config=TEST_SERVER_CONFIG, concurrency_limiter=limiter
+    )
+    api.list_provider_regions()
+    with pytest.raises(TiDBCloudResponseException):
+        api.get_monthly_bill(month="202308")
+    stats = limiter.stats()
+    assert stats["in_flight"] == 0
+    assert stats["decreases"] == 0
@@ -0,0 +1,135 @@
+import asyncio
+import random
+import time
+
+import httpx
+import pytest
+
+import tidbcloudy
+from test_server_config import FakeClock, MockTransportProfile
+from tidbcloudy.cluster import Cluster
+from tidbcloudy.exception import TiDBCloudDeadlineException
+from tidbcloudy.util.deadline import Deadline, current_deadline, deadline_scope, earliest
+from tidbcloudy.util.retry import RetryPolicy
+
+SERVER_CONFIG = {"v1beta": "https://api.tidbcloud.com/api/v1beta/"}
+PROJECTS = [{"id": str(i), "name": f"project{i}"} for i in range(1, 6)]
+
+
+def new_api(handler, **kwargs) -> tidbcloudy.TiDBCloud:
+    return tidbcloudy.TiDBCloud("", "", SERVER_CONFIG, transport_profile=MockTransportProfile(handler), **kwargs)
+
+
+def test_deadline():
+    clock = FakeClock()
+    deadline = Deadline(10, clock=clock)
+    assert deadline.remaining() == 10
+    assert not deadline.expired
+    clock.now = 12
+    assert deadline.remaining() == 0
+    assert deadline.expired
+    assert earliest(None, Deadline(5, clock=clock), deadline) is deadline
+    assert earliest(None, None) is None
+
+
+def test_deadline_scope():
+    assert current_deadline() is None
+    with deadline_scope(10) as outer:
+        assert current_deadline() is outer
+        with deadline_scope(100) as inner:
+            assert inner is outer
+        with deadline_scope(Deadline(1)) as inner:
+            assert inner is not outer
+            assert current_deadline() is inner
+        assert current_deadline() is outer
+    assert current_deadline() is None
+
+
+def test_request_timeout():
+    timeouts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        timeouts.append(request.extensions["timeout"])
+        return httpx.Response(200, json={"items": [], "total": 0})
+
+    api = new_api(handler, deadlines={"v1beta": 2})
+    api.list_projects()
+    with deadline_scope(0.5):
+        api.list_projects()
+    api.list_provider_regions()
+    assert 1 < timeouts[0]["read"] <= 2
+    assert 0 < timeouts[1]["read"] <= 0.5
+    assert timeouts[1]["connect"] <= 0.5
+
+
+def test_retry_within_deadline():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(503)
+
+    api = new_api(handler, retry_policy=RetryPolicy(max_retries=5, backoff_base=10, rng=random.Random(0)))
+    start = time.monotonic()
+    with pytest.raises(TiDBCloudDeadlineException):
+        with deadline_scope(1):
+            api.list_projects()
+    assert time.monotonic() - start < 1
+    assert len(calls) >= 1
+    with pytest.raises(TiDBCloudDeadlineException):
+        with deadline_scope(0):
+            api.list_projects()
+    assert api.retry_stats() == {}
+
+
+def test_iter_deadline():
+    clock = FakeClock()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        clock.now += 1
+        page = int(request.url.params["page"])
+        return httpx.Response(200, json={"items": PROJECTS[page - 1 : page], "total": len(PROJECTS)})
+
+    api = new_api(handler)
+    projects = []
+    with pytest.raises(TiDBCloudDeadlineException):
+        for project in api.iter_projects(page_size=1, deadline=Deadline(2.5, clock=clock)):
+            projects.append(project)
+    assert [project.id for project in projects] == ["1", "2", "3"]
+
+
+def test_aiter_deadline():
+    clock = FakeClock()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        clock.now += 1
+        page = int(request.url.params["page"])
+        return httpx.Response(200, json={"items": PROJECTS[page - 1 : page], "total": len(PROJECTS)})
+
+    async def main():
+        projects = []
+        async with tidbcloudy.AsyncTiDBCloud(
+            "", "", SERVER_CONFIG, transport_profile=MockTransportProfile(handler)
+        ) as api:
+            with pytest.raises(TiDBCloudDeadlineException):
+                async for project in api.iter_projects(page_size=1, deadline=Deadline(2.5, clock=clock)):
+                    projects.append(project)
+        return projects
+
+    assert [project.id for project in asyncio.run(main())] == ["1", "2", "3"]
+
+
+def test_wait_for_available():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"id": "1", "project_id": "1", "status": {"cluster_status": "CREATING"}})
+
+    api = new_api(handler)
+    cluster = api.get_project("1").get_cluster("1")
+    assert isinstance(cluster, Cluster)
+    start = time.monotonic()
+    assert cluster.wait_for_available(interval_sec=0.05, deadline=Deadline(0.3)) is False
+    assert time.monotonic() - start < 1
+    assert 0 < requests[-1].extensions["timeout"]["read"] <= 0.3
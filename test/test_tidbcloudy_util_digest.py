@@ -0,0 +1,103 @@
+import hashlib
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+from test_server_config import MockTransportProfile
+from tidbcloudy.context import Context
+from tidbcloudy.util.auth import DigestChallengeStore
+
+SERVER_CONFIG = {"v1beta": "https://api.tidbcloud.com/api/v1beta/"}
+
+
+def md5(*parts: str) -> str:
+    return hashlib.md5(":".join(parts).encode()).hexdigest()
+
+
+class DigestServer:
+    def __init__(self, username: str = "public", password: str = "private"):
+        self.username = username
+        self.password = password
+        self.nonce = None
+        self.lock = threading.Lock()
+        self.used = set()
+        self.challenges = 0
+
+    def challenge(self, stale: bool = False) -> httpx.Response:
+        self.challenges += 1
+        if not stale:
+            self.nonce = f"nonce-{self.challenges}"
+        header = f'Digest realm="tidb", nonce="{self.nonce}", qop="auth", algorithm=MD5'
+        if stale:
+            header += ", stale=true"
+        return httpx.Response(401, headers={"WWW-Authenticate": header})
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        header = request.headers.get("Authorization")
+        with self.lock:
+            if header is None:
+                return self.challenge()
+            fields = dict(re.findall(r'(\w+)="?([^",]*)"?', header[len("Digest ") :]))
+            if fields["nonce"] != self.nonce:
+                return self.challenge(stale=True)
+            ha1 = md5(self.username, fields["realm"], self.password)
+            ha2 = md5(request.method, fields["uri"])
+            expected = md5(ha1, fields["nonce"], fields["nc"], fields["cnonce"], fields["qop"], ha2)
+            if fields["response"] != expected or (fields["nonce"], fields["nc"]) in self.used:
+                return self.challenge()
+            self.used.add((fields["nonce"], fields["nc"]))
+        return httpx.Response(200, json={"nc": fields["nc"]})
+
+
+def new_context(server: DigestServer, store: DigestChallengeStore) -> Context:
+    return Context(
+        server.username,
+        server.password,
+        SERVER_CONFIG,
+        transport_profile=MockTransportProfile(server),
+        digest_store=store,
+    )
+
+
+def test_shared_store():
+    server = DigestServer()
+    store = DigestChallengeStore()
+    assert new_context(server, store).call_get(server="v1beta", path="projects") == {"nc": "00000001"}
+    context = new_context(server, store)
+    assert context.call_get(server="v1beta", path="projects") == {"nc": "00000002"}
+    assert context.call_get(server="v1beta", path="projects") == {"nc": "00000003"}
+    assert server.challenges == 1
+    assert context.digest_stats() == {"challenge_round_trips": 1, "stale_round_trips": 0, "preemptive": 2}
+
+
+def test_separate_stores():
+    server = DigestServer()
+    for _ in range(2):
+        new_context(server, DigestChallengeStore()).call_get(server="v1beta", path="projects")
+    assert server.challenges == 2
+
+
+def test_stale_nonce():
+    server = DigestServer()
+    store = DigestChallengeStore()
+    context = new_context(server, store)
+    context.call_get(server="v1beta", path="projects")
+    server.nonce = "rotated"
+    assert context.call_get(server="v1beta", path="projects") == {"nc": "00000001"}
+    assert context.call_get(server="v1beta", path="projects") == {"nc": "00000002"}
+    assert store.stats() == {"challenge_round_trips": 1, "stale_round_trips": 1, "preemptive": 2}
+
+
+def test_concurrent_nonce_count():
+    server = DigestServer()
+    store = DigestChallengeStore()
+    contexts = [new_context(server, store) for _ in range(4)]
+    contexts[0].call_get(server="v1beta", path="projects")
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(
+            executor.map(lambda i: contexts[i % 4].call_get(server="v1beta", path="projects", retry=False), range(64))
+        )
+    assert len({result["nc"] for result in results}) == 64
+    assert server.challenges == 1
@@ -0,0 +1,112 @@
+import asyncio
+
+import httpx
+import pytest
+
+import tidbcloudy
+from test_server_config import FakeClock, MockTransportProfile
+from tidbcloudy.util.index import TTLIndex
+
+SERVER_CONFIG = {"v1beta": "https://api.tidbcloud.com/api/v1beta/"}
+PROJECTS = [{"id": str(i), "name": f"project{i}"} for i in range(1, 26)]
+
+
+class ProjectServer:
+    def __init__(self):
+        self.pages = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.method != "GET":
+            return httpx.Response(200, json={"id": "1"})
+        page = int(request.url.params["page"])
+        page_size = int(request.url.params["page_size"])
+        self.pages.append(page)
+        items = PROJECTS[(page - 1) * page_size : page * page_size]
+        return httpx.Response(200, json={"items": items, "total": len(PROJECTS)})
+
+
+def test_ttl_index():
+    clock = FakeClock()
+    index = TTLIndex(ttl=10, clock=clock)
+    index.put_many([("1", "a"), ("2", "b")])
+    clock.now = 5
+    index.put_many([("2", "c")])
+    assert index.get_many(["1", "2", "3"]) == {"1": "a", "2": "c"}
+    clock.now = 10
+    assert index.get_many(["1", "2"]) == {"2": "c"}
+    assert len(index) == 1
+    index.invalidate("2")
+    assert index.get_many(["2"]) == {}
+    disabled = TTLIndex(ttl=0)
+    disabled.put_many([("1", "a")])
+    assert len(disabled) == 0
+
+
+def test_get_project_index():
+    server = ProjectServer()
+    api = tidbcloudy.TiDBCloud("", "", SERVER_CONFIG, transport_profile=MockTransportProfile(server))
+    clock = FakeClock()
+    api._project_index = TTLIndex(ttl=60, clock=clock)
+    assert [project.name for project in api.get_projects(["12"])] == ["project12"]
+    assert server.pages == [1, 2]
+    # The scan indexed every project it listed
+    assert [project.name for project in api.get_projects(["3", "15", "1"])] == ["project3", "project15", "project1"]
+    assert server.pages == [1, 2]
+    # The missing ids are found by one scan, stopped once all of them are found
+    assert [project.id for project in api.get_projects(["21", "2", "25"])] == ["21", "2", "25"]
+    assert server.pages == [1, 2, 1, 2, 3]
+    clock.now = 60
+    api.get_projects(["1"])
+    assert server.pages == [1, 2, 1, 2, 3, 1]
+    with pytest.raises(ValueError, match="Project 404, 405 not found"):
+        api.get_projects(["1", "405", "404"])
+
+
+def test_get_project_without_index():
+    server = ProjectServer()
+    api = tidbcloudy.TiDBCloud("", "", SERVER_CONFIG, transport_profile=MockTransportProfile(server))
+    api.get_projects(["1"])
+    api.get_projects(["1"])
+    assert server.pages == [1, 1]
+
+
+def test_project_index_freshness():
+    server = ProjectServer()
+    api = tidbcloudy.TiDBCloud(
+        "", "", SERVER_CONFIG, project_index_ttl=60, transport_profile=MockTransportProfile(server)
+    )
+    api.get_projects(["1", "2"])
+    assert server.pages == [1]
+    # update_from_server always reads the server
+    api.get_project("1", update_from_server=True)
+    assert server.pages == [1, 1]
+    # The projects built from the index are not shared
+    project = api.get_projects(["1"])[0]
+    project.name = "renamed"
+    assert api.get_projects(["1"])[0].name == "project1"
+    assert server.pages == [1, 1]
+    # A mutation of a project drops it from the index, the other projects stay
+    api.get_project("1").context.call_post(server="v1beta", path="projects/1/clusters", json={})
+    api.get_projects(["2"])
+    assert server.pages == [1, 1]
+    api.get_projects(["1"])
+    assert server.pages == [1, 1, 1]
+    api.create_project("new")
+    api.get_projects(["2"])
+    assert server.pages == [1, 1, 1, 1]
+
+
+def test_async_get_projects():
+    server = ProjectServer()
+
+    async def main():
+        async with tidbcloudy.AsyncTiDBCloud(
+            "", "", SERVER_CONFIG, project_index_ttl=60, transport_profile=MockTransportProfile(server)
+        ) as api:
+            projects = await api.get_projects(["7", "11"])
+            projects += await api.get_projects(["4"])
+            projects.append(await api.get_project("4", update_from_server=True))
+            return [project.name for project in projects]
+
+    assert asyncio.run(main()) == ["project7", "project11", "project4", "project4"]
+    assert server.pages == [1, 2, 1]
@@ -0,0 +1,83 @@
+import httpx
+import pytest
+
+from test_server_config import MockTransportProfile
+from tidbcloudy.context import Context
+from tidbcloudy.exception import TiDBCloudResponseException
+from tidbcloudy.util.metrics import MetricsRegistry, endpoint_template
+from tidbcloudy.util.retry import RetryPolicy
+
+
+def test_endpoint_template():
+    assert endpoint_template("projects") == "projects"
+    assert endpoint_template("projects/1/clusters/1379661944646413143/backups") == "projects/{id}/clusters/{id}/backups"
+    assert endpoint_template("/bills/2023-10") == "bills/{id}"
+    assert endpoint_template("clusters/provider/regions") == "clusters/provider/regions"
+
+
+def test_registry():
+    metrics = MetricsRegistry(buckets=(0.1, 1.0))
+    labels = ("GET", "v1beta", "projects")
+    metrics.start_request(labels)
+    assert metrics.to_object()["GET v1beta projects"]["in_flight"] == 1
+    metrics.end_request(labels, "200", 0.1, 0, 100)
+    metrics.start_request(labels)
+    metrics.end_request(labels, "503", 5.0, 0, 20)
+    metrics.record_retry(labels)
+    assert metrics.to_object() == {
+        "GET v1beta projects": {
+            "requests": 2,
+            "latency_sum": 5.1,
+            "latency_buckets": {0.1: 1, 1.0: 1},
+            "statuses": {"200": 1, "503": 1},
+            "bytes_out": 0,
+            "bytes_in": 120,
+            "retries": 1,
+            "in_flight": 0,
+        }
+    }
+    text = metrics.to_prometheus()
+    label_text = 'method="GET",server="v1beta",endpoint="projects"'
+    assert f'tidbcloudy_request_duration_seconds_bucket{{{label_text},le="0.1"}} 1' in text
+    assert f'tidbcloudy_request_duration_seconds_bucket{{{label_text},le="+Inf"}} 2' in text
+    assert f"tidbcloudy_request_duration_seconds_count{{{label_text}}} 2" in text
+    assert f'tidbcloudy_responses_total{{{label_text},status="503"}} 1' in text
+    assert f"tidbcloudy_response_bytes_total{{{label_text}}} 120" in text
+    assert f"tidbcloudy_retries_total{{{label_text}}} 1" in text
+    assert "# TYPE tidbcloudy_in_flight_requests gauge" in text
+
+
+def test_write_prometheus(tmp_path):
+    metrics = MetricsRegistry()
+    metrics.start_request(("GET", "v1beta", "projects"))
+    path = tmp_path / "tidbcloudy.prom"
+    metrics.write_prometheus(str(path))
+    assert path.read_text() == metrics.to_prometheus()
+    assert [p.name for p in tmp_path.iterdir()] == ["tidbcloudy.prom"]
+
+
+def test_context_metrics():
+    statuses = [503, 200, 404]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(statuses.pop(0), json={"id": "1"})
+
+    context = Context(
+        "",
+        "",
+        {"v1beta": "https://api.tidbcloud.com/api/v1beta/"},
+        transport_profile=MockTransportProfile(handler),
+        retry_policy=RetryPolicy(backoff_base=0),
+    )
+    context.call_get(server="v1beta", path="projects/1/clusters/2")
+    with pytest.raises(TiDBCloudResponseException):
+        context.call_post(server="v1beta", path="projects/1/clusters", json={"name": "test"})
+    metrics = context.metrics.to_object()
+    get = metrics["GET v1beta projects/{id}/clusters/{id}"]
+    assert get["statuses"] == {"503": 1, "200": 1}
+    assert get["retries"] == 1
+    assert get["bytes_in"] == 2 * len(httpx.Response(200, json={"id": "1"}).content)
+    assert get["in_flight"] == 0
+    post = metrics["POST v1beta projects/{id}/clusters"]
+    assert post["statuses"] == {"404": 1}
+    assert post["bytes_out"] == len(context.codec.dumps({"name": "test"}))
@@ -0,0 +1,157 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+import tidbcloudy
+from test_server_config import TEST_SERVER_CONFIG, MockTransportProfile
+from tidbcloudy.exception import TiDBCloudDeadlineException
+from tidbcloudy.util.deadline import Deadline
+from tidbcloudy.util.page import Paginator
+
+CLUSTERS = [{"id": str(i), "project_id": "1", "name": f"Cluster{i}"} for i in range(95)]
+
+
+class PagedServer:
+    """Serve the clusters by page, slowly, and track the concurrent requests."""
+
+    def __init__(self, latency: float = 0.05):
+        self.latency = latency
+        self.pages = []
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def _page(self, request: httpx.Request) -> dict:
+        page = int(request.url.params["page"])
+        page_size = int(request.url.params["page_size"])
+        self.pages.append(page)
+        return {"items": CLUSTERS[(page - 1) * page_size : page * page_size], "total": len(CLUSTERS)}
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        with self._lock:
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        time.sleep(self.latency)
+        with self._lock:
+            self._in_flight -= 1
+        return httpx.Response(200, json=self._page(request))
+
+
+def test_iter_prefetch():
+    server = PagedServer()
+    api = tidbcloudy.TiDBCloud("", "", TEST_SERVER_CONFIG, transport_profile=MockTransportProfile(server))
+    project = api.get_project("1")
+    start = time.monotonic()
+    clusters = list(project.iter_clusters(page_size=10, prefetch=4))
+    elapsed = time.monotonic() - start
+    assert [cluster.id for cluster in clusters] == [cluster["id"] for cluster in CLUSTERS]
+    assert sorted(server.pages) == list(range(1, 11))
+    assert server.max_in_flight == 4
+    # 1 round trip for the first page, then 3 rounds of up to 4 pages instead of 10 sequential round trips
+    assert elapsed < 8 * server.latency
+
+
+def test_iter_prefetch_early_stop():
+    server = PagedServer(latency=0)
+    api = tidbcloudy.TiDBCloud("", "", TEST_SERVER_CONFIG, transport_profile=MockTransportProfile(server))
+    clusters = api.get_project("1").iter_clusters(page_size=10, prefetch=2)
+    assert [next(clusters).id for _ in range(15)] == [str(i) for i in range(15)]
+    clusters.close()
+    assert len(server.pages) <= 4
+
+
+def test_iter_prefetch_deadline():
+    server = PagedServer(latency=0.1)
+    api = tidbcloudy.TiDBCloud("", "", TEST_SERVER_CONFIG, transport_profile=MockTransportProfile(server))
+    clusters = []
+    with pytest.raises(TiDBCloudDeadlineException):
+        for cluster in api.get_project("1").iter_clusters(page_size=10, prefetch=2, deadline=Deadline(0.25)):
+            clusters.append(cluster)
+    assert [cluster.id for cluster in clusters] == [str(i) for i in range(len(clusters))]
+    assert 10 <= len(clusters) < len(CLUSTERS)
+
+
+def test_aiter_prefetch():
+    class AsyncPagedServer(PagedServer):
+        async def __call__(self, request: httpx.Request) -> httpx.Response:
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+            await asyncio.sleep(self.latency)
+            self._in_flight -= 1
+            return httpx.Response(200, json=self._page(request))
+
+    server = AsyncPagedServer()
+
+    async def main():
+        async with tidbcloudy.AsyncTiDBCloud(
+            "", "", TEST_SERVER_CONFIG, transport_profile=MockTransportProfile(server)
+        ) as api:
+            project = await api.get_project("1")
+            return [cluster.id async for cluster in project.iter_clusters_async(page_size=10, prefetch=3)]
+
+    assert asyncio.run(main()) == [cluster["id"] for cluster in CLUSTERS]
+    assert server.max_in_flight == 3
+
+
+def test_iter_prefetch_mock_server():
+    api = tidbcloudy.TiDBCloud("", "", TEST_SERVER_CONFIG)
+    project = api.get_project("2")
+    expected = [cluster.id for cluster in project.iter_clusters(page_size=1)]
+    assert [cluster.id for cluster in project.iter_clusters(page_size=1, prefetch=3)] == expected
+
+
+def test_adaptive_page_size():
+    sizes = []
+    size_bytes = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        page_size = int(request.url.params["page_size"])
+        sizes.append(page_size)
+        # A fixed latency per request, so larger pages are always cheaper
+        time.sleep(0.05)
+        resp = httpx.Response(
+            200, json={"items": CLUSTERS[(page - 1) * page_size : page * page_size], "total": len(CLUSTERS)}
+        )
+        size_bytes.append(len(resp.content))
+        return resp
+
+    api = tidbcloudy.TiDBCloud("", "", TEST_SERVER_CONFIG, transport_profile=MockTransportProfile(handler))
+    clusters = api.get_project("1").iter_clusters(page_size=10, max_page_size=64)
+    assert isinstance(clusters, Paginator)
+    assert [cluster.id for cluster in clusters] == [cluster["id"] for cluster in CLUSTERS]
+    # Each page size is measured on 2 pages before the next one is tried
+    assert sizes == [10, 10, 20, 20, 20, 40]
+    assert clusters.stats == {"pages": 6, "items": len(CLUSTERS), "bytes": sum(size_bytes), "page_size": 40}
+
+
+def test_adaptive_page_size_per_item_latency():
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        page_size = int(request.url.params["page_size"])
+        # The latency grows with the page size, so larger pages do not save time
+        time.sleep(0.002 * page_size)
+        return httpx.Response(
+            200, json={"items": CLUSTERS[(page - 1) * page_size : page * page_size], "total": len(CLUSTERS)}
+        )
+
+    api = tidbcloudy.TiDBCloud("", "", TEST_SERVER_CONFIG, transport_profile=MockTransportProfile(handler))
+    clusters = api.get_project("1").iter_clusters(page_size=10, max_page_size=100)
+    assert len(list(clusters)) == len(CLUSTERS)
+    assert clusters.page_size == 20
+
+
+def test_paginator_read_ahead():
+    server = PagedServer(latency=0.05)
+    api = tidbcloudy.TiDBCloud("", "", TEST_SERVER_CONFIG, transport_profile=MockTransportProfile(server))
+    start = time.monotonic()
+    for i, cluster in enumerate(Paginator(api.get_project("1").list_clusters, 10, prefetch=1)):
+        if i % 10 == 0:
+            # Process a page as long as a request takes, while the next page is being read
+            time.sleep(server.latency)
+    # 10 requests and 10 pages of processing would take 20 latencies sequentially
+    assert time.monotonic() - start < 16 * server.latency
+    assert server.max_in_flight == 1
@@ -0,0 +1,82 @@
+import threading
+
+import httpx
+import pytest
+
+from test_server_config import FakeClock, MockTransportProfile
+from tidbcloudy.context import Context
+from tidbcloudy.exception import TiDBCloudDeadlineException
+from tidbcloudy.util.deadline import Deadline, deadline_scope
+from tidbcloudy.util.ratelimit import RateLimiter, TokenBucket
+
+
+class TestTokenBucket:
+    def test_pacing(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10, burst=2, clock=clock)
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0
+        # Callers beyond the burst are queued 1/rate seconds apart
+        assert bucket.reserve() == pytest.approx(0.1)
+        assert bucket.reserve() == pytest.approx(0.2)
+        clock.now = 1.0
+        assert bucket.reserve() == 0
+
+    def test_invalid_rate(self):
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+
+
+class TestRateLimiter:
+    def test_per_server(self):
+        clock = FakeClock()
+        limiter = RateLimiter({"v1beta": 10, "billing": 1}, clock=clock)
+        assert limiter.reserve("v1beta") == 0
+        assert limiter.reserve("v1beta") == pytest.approx(0.1)
+        assert limiter.reserve("billing") == 0
+        assert limiter.reserve("billing") == pytest.approx(1)
+        assert limiter.reserve("unlimited") == 0
+        stats = limiter.stats()
+        assert stats["v1beta"]["waits"] == stats["billing"]["waits"] == 1
+        assert stats["billing"]["wait_seconds"] == pytest.approx(1)
+
+    def test_threads(self):
+        clock = FakeClock()
+        limiter = RateLimiter({"v1beta": 100}, clock=clock)
+        delays = []
+
+        def reserve():
+            for _ in range(25):
+                delays.append(limiter.reserve("v1beta"))
+
+        threads = [threading.Thread(target=reserve) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert sorted(delays) == pytest.approx([i / 100 for i in range(100)])
+
+    def test_for_key(self):
+        limiter = RateLimiter.for_key("test_for_key", {"v1beta": 5})
+        assert RateLimiter.for_key("test_for_key", {"v1beta": 50}) is limiter
+        assert RateLimiter.for_key("test_for_key_other", {"v1beta": 5}) is not limiter
+
+
+def test_refund_on_deadline():
+    clock = FakeClock()
+    limiter = RateLimiter({"v1beta": 1}, clock=clock)
+    context = Context(
+        "",
+        "",
+        {"v1beta": "http://testserver/"},
+        transport_profile=MockTransportProfile(lambda request: httpx.Response(200, json={})),
+        rate_limiter=limiter,
+    )
+    context.call_get("v1beta", "projects")
+    # The next slot is 1 second away, after the deadline, so the call fails without using it
+    for _ in range(3):
+        with deadline_scope(Deadline(0.5, clock=clock)):
+            with pytest.raises(TiDBCloudDeadlineException):
+                context.call_get("v1beta", "projects")
+    assert limiter.stats()["v1beta"] == {"rate": 1, "waits": 0, "wait_seconds": 0.0}
+    assert limiter.reserve("v1beta") == pytest.approx(1.0)
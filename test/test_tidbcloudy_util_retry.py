@@ -0,0 +1,91 @@
+import random
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import httpx
+import pytest
+
+from test_server_config import MockTransportProfile
+from tidbcloudy.context import Context
+from tidbcloudy.exception import TiDBCloudResponseException
+from tidbcloudy.util.retry import RetryPolicy, parse_retry_after
+
+
+def status_error(status: int, headers: dict = None) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "http://testserver/")
+    response = httpx.Response(status, headers=headers, request=request)
+    return httpx.HTTPStatusError("", request=request, response=response)
+
+
+def new_context(responses: list, retry_policy: RetryPolicy) -> (Context, list):
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        status, headers = responses[min(len(requests), len(responses)) - 1]
+        return httpx.Response(status, headers=headers, json={"items": [], "total": 0})
+
+    context = Context(
+        "",
+        "",
+        {"v1beta": "http://testserver/"},
+        transport_profile=MockTransportProfile(handler),
+        retry_policy=retry_policy,
+    )
+    return context, requests
+
+
+class TestRetryPolicy:
+    def test_is_retryable(self):
+        policy = RetryPolicy()
+        assert policy.is_retryable("GET", status_error(503)) is True
+        assert policy.is_retryable("GET", status_error(429)) is True
+        assert policy.is_retryable("GET", status_error(400)) is False
+        assert policy.is_retryable("POST", status_error(503)) is False
+        assert policy.is_retryable("POST", status_error(503), retry=True) is True
+        assert policy.is_retryable("GET", status_error(503), retry=False) is False
+        request = httpx.Request("POST", "http://testserver/")
+        assert policy.is_retryable("POST", httpx.ConnectError("", request=request)) is True
+        assert policy.is_retryable("POST", httpx.ReadTimeout("", request=request)) is False
+        assert policy.is_retryable("GET", httpx.ReadTimeout("", request=request)) is True
+
+    def test_get_delay(self):
+        policy = RetryPolicy(backoff_base=1, backoff_max=5, rng=random.Random(0))
+        for attempt in range(10):
+            assert 0 <= policy.get_delay(attempt) <= min(5, 2**attempt)
+        assert policy.get_delay(0, status_error(429, {"Retry-After": "3"})) == 3
+        assert policy.get_delay(0, status_error(429, {"Retry-After": "120"})) == 5
+        assert 0 <= policy.get_delay(0, status_error(503, {"Retry-After": "soon"})) <= 1
+
+    def test_parse_retry_after(self):
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("7") == 7
+        retry_at = datetime.now(tz=timezone.utc) + timedelta(seconds=30)
+        assert 25 <= parse_retry_after(format_datetime(retry_at, usegmt=True)) <= 30
+
+
+class TestContextRetry:
+    def test_retry_then_succeed(self):
+        policy = RetryPolicy(max_retries=3, backoff_base=0.01)
+        context, requests = new_context([(503, None), (429, {"Retry-After": "0"}), (200, None)], policy)
+        assert context.call_get(server="v1beta", path="projects") == {"items": [], "total": 0}
+        assert len(requests) == 3
+        assert context.retry_stats() == {"v1beta": {"retries": 2, "exhausted": 0}}
+
+    def test_retry_exhausted(self):
+        policy = RetryPolicy(max_retries=2, backoff_base=0.01)
+        context, requests = new_context([(503, None)], policy)
+        with pytest.raises(TiDBCloudResponseException) as exc_info:
+            context.call_get(server="v1beta", path="projects")
+        assert exc_info.value.status == 503
+        assert exc_info.value.retries == 2
+        assert len(requests) == 3
+        assert context.retry_stats() == {"v1beta": {"retries": 2, "exhausted": 1}}
+
+    def test_no_retry_for_post(self):
+        policy = RetryPolicy(max_retries=2, backoff_base=0.01)
+        context, requests = new_context([(503, None), (200, None)], policy)
+        with pytest.raises(TiDBCloudResponseException):
+            context.call_post(server="v1beta", path="projects", json={})
+        assert len(requests) == 1
+        assert context.call_post(server="v1beta", path="projects", json={}, retry=True) == {"items": [], "total": 0}
@@ -0,0 +1,190 @@
+import asyncio
+import threading
+import time
+
+import httpx
+
+from test_server_config import MockTransportProfile
+from tidbcloudy.context import AsyncContext, Context
+from tidbcloudy.util.singleflight import SingleFlight, request_key
+
+
+def test_request_key():
+    assert request_key("v1beta", "projects", {"page": 1, "page_size": 10}) == request_key(
+        "v1beta", "projects", {"page_size": 10, "page": 1}
+    )
+    assert request_key("v1beta", "projects", None) == request_key("v1beta", "projects", {})
+    assert request_key("v1beta", "projects", {"page": 1}) != request_key("v1beta", "projects", {"page": 2})
+    assert request_key("v1beta", "projects") != request_key("billing", "projects")
+
+
+class TestSingleFlight:
+    def test_threads(self):
+        single_flight = SingleFlight()
+        calls = []
+        results = []
+
+        def fn():
+            calls.append(1)
+            time.sleep(0.1)
+            return {"id": "1"}
+
+        threads = [threading.Thread(target=lambda: results.append(single_flight.do("key", fn))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(calls) == 1
+        assert len(results) == 8
+        assert all(result is results[0] for result in results)
+        assert single_flight.stats() == {"leaders": 1, "shared": 7}
+        # The key is released after the call, so the next call runs again
+        single_flight.do("key", fn)
+        assert len(calls) == 2
+
+    def test_threads_error(self):
+        single_flight = SingleFlight()
+        errors = []
+
+        def fn():
+            time.sleep(0.1)
+            raise ValueError("failed")
+
+        def call():
+            try:
+                single_flight.do("key", fn)
+            except ValueError as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=call) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(errors) == 4
+
+    def test_async(self):
+        single_flight = SingleFlight()
+        calls = []
+
+        async def fn():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return {"id": "1"}
+
+        async def main():
+            return await asyncio.gather(*[single_flight.do_async("key", fn) for _ in range(8)])
+
+        results = asyncio.run(main())
+        assert len(calls) == 1
+        assert all(result is results[0] for result in results)
+
+    def test_async_error(self):
+        single_flight = SingleFlight()
+
+        async def fn():
+            await asyncio.sleep(0.05)
+            raise ValueError("failed")
+
+        async def main():
+            return await asyncio.gather(*[single_flight.do_async("key", fn) for _ in range(4)], return_exceptions=True)
+
+        results = asyncio.run(main())
+        assert all(isinstance(result, ValueError) for result in results)
+
+    def test_async_leader_cancelled(self):
+        single_flight = SingleFlight()
+        calls = []
+
+        async def fn():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return {"id": "1"}
+
+        async def main():
+            leader = asyncio.ensure_future(single_flight.do_async("key", fn))
+            await asyncio.sleep(0)
+            followers = [asyncio.ensure_future(single_flight.do_async("key", fn)) for _ in range(2)]
+            await asyncio.sleep(0)
+            leader.cancel()
+            results = await asyncio.gather(leader, *followers, return_exceptions=True)
+            # Once every caller is cancelled, the call is cancelled too
+            abandoned = asyncio.ensure_future(single_flight.do_async("other", fn))
+            await asyncio.sleep(0)
+            abandoned.cancel()
+            await asyncio.gather(abandoned, return_exceptions=True)
+            await asyncio.sleep(0)
+            return results
+
+        results = asyncio.run(main())
+        assert isinstance(results[0], asyncio.CancelledError)
+        assert results[1] == results[2] == {"id": "1"}
+        assert results[1] is results[2]
+        assert len(calls) == 2
+        assert single_flight._tasks == {}
+
+
+def new_handler(requests: list):
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        time.sleep(0.1)
+        return httpx.Response(200, json={"id": request.url.path})
+
+    return handler
+
+
+class TestContextSingleFlight:
+    def test_context(self):
+        requests = []
+        context = Context(
+            "",
+            "",
+            {"v1beta": "http://testserver/"},
+            transport_profile=MockTransportProfile(new_handler(requests)),
+            single_flight=True,
+        )
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(context.call_get("v1beta", "projects/1/clusters/2")))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(requests) == 1
+        assert results == [{"id": "/projects/1/clusters/2"}] * 4
+        assert context.single_flight_stats() == {"leaders": 1, "shared": 3}
+
+    def test_disabled(self):
+        context = Context("", "", {"v1beta": "http://testserver/"})
+        assert context.single_flight_stats() is None
+
+    def test_async_context(self):
+        requests = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            await asyncio.sleep(0.1)
+            return httpx.Response(200, json={"id": request.url.path})
+
+        async def main():
+            context = AsyncContext(
+                "",
+                "",
+                {"v1beta": "http://testserver/"},
+                transport_profile=MockTransportProfile(handler),
+                single_flight=True,
+            )
+            results = await asyncio.gather(
+                context.call_get("v1beta", "clusters/provider/regions"),
+                context.call_get("v1beta", "clusters/provider/regions"),
+                context.call_get("v1beta", "projects"),
+            )
+            await context.aclose()
+            return results
+
+        results = asyncio.run(main())
+        assert len(requests) == 2
+        assert results[0] is results[1]
+        assert results[2] == {"id": "/projects"}
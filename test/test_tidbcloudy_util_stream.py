@@ -0,0 +1,150 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from test_server_config import MockTransportProfile
+from tidbcloudy.context import AsyncContext, Context
+from tidbcloudy.exception import TiDBCloudResponseException
+from tidbcloudy.util.page import AsyncStreamPage, StreamPage
+from tidbcloudy.util.stream import ItemsParser, ItemStream
+
+ITEMS = [
+    {"id": "1", "name": 'a "quoted" [name] {x}', "node_map": {"tidb": [{"vcpu_num": 8}]}},
+    {"id": "2", "name": "测试\\", "tags": [], "paused": False, "ratio": -1.5e3},
+    "text",
+    12345,
+    None,
+]
+
+
+def parse(body: bytes, chunk_size: int) -> tuple:
+    parser = ItemsParser()
+    items = []
+    for i in range(0, len(body), chunk_size):
+        items.extend(parser.feed(body[i : i + chunk_size]))
+    items.extend(parser.close())
+    return items, parser.fields
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 64, 4096])
+def test_parse_chunks(chunk_size):
+    body = json.dumps({"items": ITEMS, "total": 12345}, ensure_ascii=False, indent=2).encode("utf-8")
+    assert parse(body, chunk_size) == (ITEMS, {"total": 12345})
+    body = json.dumps({"total": 5, "meta": {"items": [1]}, "items": [], "next": "x"}).encode("utf-8")
+    assert parse(body, chunk_size) == ([], {"total": 5, "meta": {"items": [1]}, "next": "x"})
+
+
+def test_parse_split_numbers():
+    body = b'{"items":[1.5,2e3,-0.25E-2,10,true,null,1e+2],"total":7.5e1}'
+    expected = json.loads(body)
+    for offset in range(1, len(body)):
+        parser = ItemsParser()
+        items = parser.feed(body[:offset]) + parser.feed(body[offset:]) + parser.close()
+        assert (items, parser.fields) == (expected["items"], {"total": expected["total"]}), offset
+
+
+def test_parse_invalid():
+    with pytest.raises(ValueError):
+        parse(b'[{"id": "1"}]', 4)
+    with pytest.raises(ValueError):
+        parse(b'{"items": [{"id": "1"}', 4)
+    for body in (
+        b'{"items": [1,,2]}',
+        b'{"items": [1 2]}',
+        b'{"items": [,1]}',
+        b'{"items": [1,]}',
+        b'{"items": [{"a": 1} {"b": 2}]}',
+        b'{"items": [], , "total": 1}',
+        b'{"total": 1 "items": []}',
+        b'{"items": [1.5x]}',
+    ):
+        for chunk_size in (1, 3, 4096):
+            with pytest.raises(ValueError):
+                parse(body, chunk_size)
+
+
+def test_item_stream_total():
+    chunks = iter([b'{"items": [1, 2', b", 3], ", b'"total": 3}'])
+    closed = []
+    stream = ItemStream(chunks, lambda: closed.append(True))
+    iterator = iter(stream)
+    assert next(iterator) == 1
+    assert stream.total == 3
+    assert list(iterator) == [2, 3]
+    assert closed == [True]
+
+
+def test_context_stream_get():
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("missing"):
+            return httpx.Response(404, json={"message": "not found"})
+        return httpx.Response(200, json={"items": ITEMS, "total": len(ITEMS)})
+
+    context = Context(
+        "", "", {"v1beta": "https://api.tidbcloud.com/api/v1beta/"}, transport_profile=MockTransportProfile(handler)
+    )
+    stream = context.stream_get(server="v1beta", path="projects")
+    assert list(stream) == ITEMS
+    assert stream.total == len(ITEMS)
+    with pytest.raises(TiDBCloudResponseException) as exc_info:
+        context.stream_get(server="v1beta", path="missing")
+    assert exc_info.value.status == 404
+    assert "not found" in exc_info.value.message
+
+
+class ChunkStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    def __init__(self, chunks: list):
+        self.chunks = chunks
+        self.closed = False
+
+    def __iter__(self):
+        yield from self.chunks
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            yield chunk
+
+    def close(self):
+        self.closed = True
+
+    async def aclose(self):
+        self.closed = True
+
+
+def test_stream_page_close():
+    body = json.dumps({"items": ITEMS, "total": len(ITEMS)}).encode("utf-8")
+    streams = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        streams.append(ChunkStream([body[i : i + 8] for i in range(0, len(body), 8)]))
+        return httpx.Response(200, stream=streams[-1])
+
+    context = Context(
+        "", "", {"v1beta": "https://api.tidbcloud.com/api/v1beta/"}, transport_profile=MockTransportProfile(handler)
+    )
+    items = context.stream_get(server="v1beta", path="projects")
+    with StreamPage(iter(items), 1, 10, items) as page:
+        assert next(page.items) == ITEMS[0]
+        assert not streams[0].closed
+    assert streams[0].closed
+    items = context.stream_get(server="v1beta", path="projects")
+    page = StreamPage(iter(items), 1, 10, items)
+    assert next(page.items) == ITEMS[0]
+    page.close()
+    page.close()
+    assert streams[1].closed
+
+    async def main():
+        async_context = AsyncContext(
+            "", "", {"v1beta": "https://api.tidbcloud.com/api/v1beta/"}, transport_profile=MockTransportProfile(handler)
+        )
+        items = await async_context.stream_get(server="v1beta", path="projects")
+        async with AsyncStreamPage(items.__aiter__(), 1, 10, items) as page:
+            assert await page.items.__anext__() == ITEMS[0]
+            assert not streams[2].closed
+        assert streams[2].closed
+        await async_context.aclose()
+
+    asyncio.run(main())
@@ -0,0 +1,92 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+import tidbcloudy
+from test_server_config import MockTransportProfile
+from tidbcloudy.util.tracing import InMemorySpanExporter, SpanExporter, Tracer
+
+SERVER_CONFIG = {"v1beta": "https://api.tidbcloud.com/api/v1beta/"}
+PROJECTS = [{"id": str(i), "name": f"project{i}"} for i in range(1, 6)]
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    if request.url.path.endswith("/projects"):
+        page = int(request.url.params["page"])
+        page_size = int(request.url.params["page_size"])
+        items = PROJECTS[(page - 1) * page_size : page * page_size]
+        return httpx.Response(200, json={"items": items, "total": len(PROJECTS)})
+    return httpx.Response(404, json={"message": "not found"})
+
+
+def test_span_tree():
+    tracer = Tracer()
+    api = tidbcloudy.TiDBCloud("", "", SERVER_CONFIG, transport_profile=MockTransportProfile(handler), tracer=tracer)
+    project = api.get_project("5", update_from_server=True)
+    assert project.name == "project5"
+    http_span, list_span, root = tracer.exporter.spans
+    assert [span.name for span in (http_span, list_span, root)] == [
+        "HTTP GET projects",
+        "TiDBCloud.list_projects",
+        "TiDBCloud.get_project",
+    ]
+    assert root.parent_id is None
+    assert list_span.parent_id == root.span_id
+    assert http_span.parent_id == list_span.span_id
+    assert http_span.trace_id == list_span.trace_id == root.trace_id
+    assert http_span.attributes["page"] == 1
+    assert http_span.attributes["http.status_code"] == 200
+    assert http_span.attributes["items"] == 5
+    assert http_span.attributes["bytes_in"] > 0
+    assert root.duration >= list_span.duration >= http_span.duration >= 0
+    assert json.loads(tracer.exporter.to_json())[-1]["name"] == "TiDBCloud.get_project"
+
+
+def test_paged_spans():
+    tracer = Tracer()
+    api = tidbcloudy.TiDBCloud("", "", SERVER_CONFIG, transport_profile=MockTransportProfile(handler), tracer=tracer)
+    assert len(list(api.iter_projects(page_size=2))) == 5
+    spans = tracer.exporter.spans
+    assert [span.name for span in spans] == ["HTTP GET projects", "TiDBCloud.list_projects"] * 3
+    assert [span.attributes["items"] for span in spans[0::2]] == [2, 2, 1]
+    assert len({span.trace_id for span in spans}) == 3
+
+
+def test_error_span():
+    tracer = Tracer(InMemorySpanExporter(max_spans=1))
+    api = tidbcloudy.TiDBCloud("", "", SERVER_CONFIG, transport_profile=MockTransportProfile(handler), tracer=tracer)
+    with pytest.raises(tidbcloudy.TiDBCloudException):
+        api.get_project("1").get_cluster("1")
+    [span] = tracer.exporter.spans
+    assert span.name == "Project.get_cluster"
+    assert span.error.startswith("TiDBCloudResponseException")
+
+
+def test_async_span_tree():
+    tracer = Tracer()
+
+    async def main():
+        async with tidbcloudy.AsyncTiDBCloud(
+            "", "", SERVER_CONFIG, transport_profile=MockTransportProfile(handler), tracer=tracer
+        ) as api:
+            await asyncio.gather(api.list_projects(page=1, page_size=2), api.list_projects(page=2, page_size=2))
+
+    asyncio.run(main())
+    spans = tracer.exporter.spans
+    roots = {span.span_id: span for span in spans if span.name == "AsyncTiDBCloud.list_projects"}
+    assert len(roots) == 2
+    http_spans = [span for span in spans if span.name == "HTTP GET projects"]
+    assert {roots[span.parent_id].trace_id for span in http_spans} == {span.trace_id for span in roots.values()}
+    assert sorted(span.attributes["page"] for span in http_spans) == [1, 2]
+
+
+def test_span_exporter_abstract():
+    class NoExport(SpanExporter):
+        pass
+
+    with pytest.raises(TypeError):
+        SpanExporter()
+    with pytest.raises(TypeError):
+        NoExport()
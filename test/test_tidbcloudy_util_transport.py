@@ -0,0 +1,66 @@
+import asyncio
+
+import httpx
+import pytest
+
+import tidbcloudy
+from test_server_config import TEST_SERVER_CONFIG
+from tidbcloudy.util.transport import TransportProfile
+
+
+def test_transport_profile():
+    profile = TransportProfile(max_connections=8, max_keepalive_connections=4, keepalive_expiry=30)
+    assert profile.limits.max_connections == 8
+    assert profile.limits.max_keepalive_connections == 4
+    assert profile.limits.keepalive_expiry == 30
+    assert profile.http2 is False
+
+
+def test_pool_stats():
+    profile = TransportProfile(max_connections=2, max_keepalive_connections=2)
+    api = tidbcloudy.TiDBCloud(
+        public_key="", private_key="", server_config=TEST_SERVER_CONFIG, transport_profile=profile
+    )
+    for _ in range(3):
+        api.list_provider_regions()
+    api.get_monthly_bill(month="202310")
+    stats = api.pool_stats()
+    assert stats["servers"]["v1beta"]["requests"] >= 3
+    assert stats["servers"]["billing"]["requests"] >= 1
+    for server in stats["servers"].values():
+        assert 1 <= server["new_connections"] <= server["requests"]
+        assert server["new_connections"] + server["reused"] == server["requests"]
+    assert sum(stats["http_versions"].values()) >= 4
+    assert stats["connections"] == stats["idle"] + stats["active"] <= profile.max_connections
+
+
+def test_custom_transport():
+    paths = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        paths.append(request.url.path)
+        return httpx.Response(200, json={"items": [], "total": 0})
+
+    api = tidbcloudy.TiDBCloud(
+        public_key="", private_key="", server_config=TEST_SERVER_CONFIG, transport=httpx.MockTransport(handler)
+    )
+    assert api.list_projects().total == 0
+    assert paths == ["/api/v1beta/projects"]
+
+
+def test_wsgi_transport():
+    pytest.importorskip("flask")
+    from mock_server.wsgi import create_api, create_async_api
+
+    with create_api() as api:
+        projects = list(api.iter_projects())
+        assert len(projects) >= 2
+        clusters = list(projects[1].iter_clusters())
+        assert api.pool_stats()["servers"]["v1beta"]["requests"] >= 2
+
+    async def main():
+        async with create_async_api() as async_api:
+            return [project.id async for project in async_api.iter_projects()]
+
+    assert asyncio.run(main()) == [project.id for project in projects]
+    assert all(cluster.project_id == projects[1].id for cluster in clusters)
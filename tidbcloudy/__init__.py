@@ -1,8 +1,19 @@
 from .backup import Backup
 from .cluster import Cluster
-from .context import Context
+from .context import AsyncContext, Context
 from .exception import TiDBCloudException
 from .project import Project
 from .restore import Restore
-from .tidbcloud import TiDBCloud
+from .tidbcloud import AsyncTiDBCloud, TiDBCloud
+from .util.auth import DigestChallengeStore
+from .util.breaker import CircuitBreaker
+from .util.cache import ResponseCache
+from .util.columns import ColumnBuilder
+from .util.concurrency import AdaptiveConcurrencyLimiter
+from .util.deadline import Deadline, deadline_scope
 from .util.log import log
+from .util.metrics import MetricsRegistry
+from .util.ratelimit import RateLimiter
+from .util.retry import RetryPolicy
+from .util.tracing import Tracer
+from .util.transport import TransportProfile
@@ -1,5 +1,8 @@
+import functools
+import threading
 from enum import Enum
-from typing import Callable
+from operator import itemgetter
+from typing import Callable, Dict, Iterable, List, Tuple
 
 from tidbcloudy.context import Context
 
@@ -25,6 +28,12 @@ class TiDBCloudyBase:
             if key.startswith("_"):
                 key = key[1:]
             cls._keys[key] = getattr(cls, key)
+        # The functions and the Record type are compiled on first use, so importing the models stays cheap
+        names = list(_COMPILED)
+        if "to_object" not in cls.__dict__:
+            names.append("to_object")
+        for name in names:
+            setattr(cls, name, _Compiled(cls, name))
 
     def __init__(self, **kwargs):
         for key in self._keys:
@@ -32,57 +41,322 @@ class TiDBCloudyBase:
         super().__init__(**kwargs)
 
     @classmethod
-    def from_object(cls, context: Context = None, obj: dict = None):
+    def from_object(cls, context: Context = None, obj: dict = None, lazy: bool = False):
         # Add context argument, and raise Exception when context is None
         #  and base class has TiDBCloudyContextualBase
-        if issubclass(cls, TiDBCloudyContextualBase):
-            if context is None:
-                raise TypeError("context is None")
-            inst = cls(context=context)
-        else:
-            inst = cls()
-        inst.assign_object(obj)
-        return inst
+        # With lazy, the nested objects keep their dict and are decoded the first time they are read
+        if context is None and issubclass(cls, TiDBCloudyContextualBase):
+            raise TypeError("context is None")
+        if lazy:
+            return cls._decode_lazy(context, obj)
+        return cls._decode(context, obj)
+
+    @classmethod
+    def from_objects(cls, context: Context = None, items: List[dict] = None, lazy: bool = False) -> list:
+        """
+        Build the objects of a list of dicts, for example, the items of a list response. It checks the context once
+        and returns the same objects as calling from_object on each dict.
+        Args:
+            context: the context of the objects, which is required for a TiDBCloudyContextualBase subclass.
+            items: the dicts of the objects.
+            lazy: whether to decode the nested fields of each object on first access, see from_object.
+
+        Returns:
+            the list of the objects, in the order of the items.
+
+        """
+        if context is None and issubclass(cls, TiDBCloudyContextualBase):
+            raise TypeError("context is None")
+        if lazy:
+            return cls._decode_many_lazy(context, items)
+        return cls._decode_many(context, items)
+
+    @classmethod
+    def record_decoder(cls, context: Context = None) -> Callable[[dict], "TiDBCloudyRecord"]:
+        """
+        Get a function building the compact read-only record of a dict, see from_records. The records built by the
+        same function share their equal strings and nested records.
+        """
+        if context is None and issubclass(cls, TiDBCloudyContextualBase):
+            raise TypeError("context is None")
+        return functools.partial(cls._decode_record, context, table={})
+
+    @classmethod
+    def from_records(cls, context: Context = None, items: Iterable[dict] = None) -> list:
+        """
+        Build the compact read-only records of a list of dicts, for example, the items of a large list response.
+        A record is a tuple of cls.Record with the same attribute names as cls, its nested objects are records and
+        its lists are tuples. The equal strings and nested records, such as the node sizes and the components of
+        the clusters, are shared by the records instead of being copied in each of them.
+        Args:
+            context: the context of the records, which is required for a TiDBCloudyContextualBase subclass.
+            items: the dicts of the records.
+
+        Returns:
+            the list of the records, in the order of the items.
+
+        Examples:
+            .. code-block:: python
+                import tidbcloudy
+                api = tidbcloudy.TiDBCloud(public_key="your_public_key", private_key="your_private_key")
+                for cluster in api.get_project(project_id).iter_clusters(compact=True):
+                    print(cluster.id, cluster.status.cluster_status)
+                    full_cluster = cluster.materialize() # This is a Cluster instance.
+        """
+        decode = cls.record_decoder(context)
+        return [decode(item) for item in items]
 
     def assign_object(self, obj: dict):
         # In from_object, forward context argument when self is subclass of TiDBCloudyContextualBase
         #  and forward a None context argument when self is not subclass of TiDBCloudyContextualBase
-        context = self._context if isinstance(self, TiDBCloudyContextualBase) else None
-        for key, descriptor in self._keys.items():
-            value = obj.get(key, None)
-            if value is None:
-                continue
-            if isinstance(descriptor, TiDBCloudyListField):
-                setattr(self, key, [descriptor.item_type.from_object(context, item) for item in value])
-            elif issubclass(descriptor.value_type, TiDBCloudyBase):
-                setattr(self, key, descriptor.value_type.from_object(context, value))
-            else:
-                assert isinstance(descriptor, TiDBCloudyField)
-                if descriptor.convert_from is not None:
-                    value = descriptor.convert_from(value)
-                setattr(self, key, value)
+        self._assign(obj)
 
     def to_object(self) -> dict:
+        # Replaced in each subclass by the encoder compiled for its fields
+        return {}
+
+
+# The attributes compiled for each model class besides to_object
+_COMPILED = (
+    "_decode",
+    "_decode_lazy",
+    "_decode_many",
+    "_decode_many_lazy",
+    "_assign",
+    "Record",
+    "_decode_record",
+)
+_compile_lock = threading.RLock()
+
+
+class _Compiled:
+    # The placeholder of a compiled attribute, which compiles all the attributes of its class on first access
+    __slots__ = ["cls", "name"]
+
+    def __init__(self, cls, name: str):
+        self.cls = cls
+        self.name = name
+
+    def __get__(self, instance, owner):
+        _compile_class(self.cls)
+        return getattr(self.cls if instance is None else instance, self.name)
+
+
+def _compile_class(cls):
+    with _compile_lock:
+        if not isinstance(cls.__dict__.get("_decode"), _Compiled):
+            # Compiled already, for example, by another thread
+            return
+        attributes = _compile_decoders(cls)
+        if isinstance(cls.__dict__.get("to_object"), _Compiled):
+            attributes["to_object"] = _compile_encoder(cls)
+        # The record decoder reads the Record type of its class
+        cls.Record = _record_type(cls)
+        attributes["_decode_record"] = staticmethod(_compile_record_decoder(cls))
+        # The placeholder of _decode goes last, once the other attributes are in place
+        for name, attribute in sorted(attributes.items(), key=lambda item: item[0] == "_decode"):
+            setattr(cls, name, attribute)
+
+
+def _compile(cls, name: str, args: str, lines: List[str], namespace: dict) -> Callable:
+    source = "def {}({}):\n    {}\n".format(name, args, "\n    ".join(lines))
+    exec(source, namespace)
+    function = namespace[name]
+    function.__qualname__ = "{}.{}".format(cls.__qualname__, name)
+    function.__module__ = cls.__module__
+    return function
+
+
+def _decode_lines(cls, lazy: bool = False, assign: bool = False) -> Tuple[List[str], dict]:
+    # The straight-line body assigning the fields of obj to self, with the converters and the nested decoders
+    # resolved once per class instead of once per field and object. A decoded object gets every slot assigned once,
+    # an assigned one only the fields present in obj. The lazy body keeps the nested dicts and lists as they are, the
+    # descriptors decode them on first access
+    context = "context" if issubclass(cls, TiDBCloudyContextualBase) else "None"
+    lines = ["get = obj.get"]
+    namespace = {}
+    for i, (key, descriptor) in enumerate(cls._keys.items()):
+        nested = isinstance(descriptor, TiDBCloudyListField) or descriptor.nested
+        if isinstance(descriptor, TiDBCloudyListField):
+            namespace["decode_{}".format(i)] = descriptor.item_type._decode_many
+            value = "decode_{}({}, value)".format(i, context)
+        elif descriptor.nested:
+            namespace["decode_{}".format(i)] = descriptor.value_type._decode
+            value = "decode_{}({}, value)".format(i, context)
+        elif descriptor.convert_from is not None:
+            namespace["convert_{}".format(i)] = descriptor.convert_from
+            value = "convert_{}(value)".format(i)
+        else:
+            value = "value"
+        if assign:
+            lines.append("value = get({!r})".format(key))
+            lines.append("if value is not None:")
+            lines.append("    self.{} = {}".format(descriptor._private, value))
+        elif value == "value" or (lazy and nested):
+            lines.append("self.{} = get({!r})".format(descriptor._private, key))
+        else:
+            lines.append("value = get({!r})".format(key))
+            lines.append("self.{} = None if value is None else {}".format(descriptor._private, value))
+    return lines, namespace
+
+
+def _compile_decoders(cls) -> Dict[str, Callable]:
+    # Build the instances like __init__ does, without the per-key setattr calls and the None defaults
+    init = ["self = new(cls)"]
+    if issubclass(cls, TiDBCloudyContextualBase):
+        init.append("self._context = context")
+    functions = {}
+    for suffix, lazy in (("", False), ("_lazy", True)):
+        lines, namespace = _decode_lines(cls, lazy)
+        namespace["cls"] = cls
+        namespace["new"] = object.__new__
+        name = "_decode" + suffix
+        functions[name] = _compile(cls, name, "context, obj", init + lines + ["return self"], namespace)
+        # The whole page in one call, building the same objects as the per-item decoder
+        body = ["result = []", "append = result.append", "for obj in items:"]
+        body.extend("    " + line for line in init + lines + ["append(self)"])
+        name = "_decode_many" + suffix
+        functions[name] = _compile(cls, name, "context, items", body + ["return result"], namespace)
+    functions = {name: staticmethod(function) for name, function in functions.items()}
+    lines, namespace = _decode_lines(cls, assign=True)
+    if issubclass(cls, TiDBCloudyContextualBase):
+        lines.insert(0, "context = self._context")
+    functions["_assign"] = _compile(cls, "_assign", "self, obj", lines, namespace)
+    return functions
+
+
+def _compile_encoder(cls) -> Callable:
+    lines = ["obj = {}"]
+    namespace = {}
+    for i, (key, descriptor) in enumerate(cls._keys.items()):
+        if isinstance(descriptor, TiDBCloudyListField):
+            # Read the nested values through the descriptor, which decodes them if they are still lazy
+            lines.append("value = self.{}".format(descriptor._public))
+            lines.append("obj[{!r}] = [] if value is None else [item.to_object() for item in value]".format(key))
+            continue
+        if descriptor.nested:
+            lines.append("value = self.{}".format(descriptor._public))
+            value = "value.to_object()"
+        elif descriptor.convert_to is not None:
+            lines.append("value = self.{}".format(descriptor._private))
+            namespace["convert_{}".format(i)] = descriptor.convert_to
+            value = "convert_{}(value)".format(i)
+        else:
+            lines.append("value = self.{}".format(descriptor._private))
+            value = "value"
+        if descriptor.none_is_empty:
+            lines.append("if value is not None:")
+            lines.append("    obj[{!r}] = {}".format(key, value))
+        else:
+            lines.append("obj[{!r}] = {}".format(key, value))
+    return _compile(cls, "to_object", "self", lines + ["return obj"], namespace)
+
+
+class TiDBCloudyRecord(tuple):
+    __slots__ = ()
+    # The model class and its field names, set in each record type
+    _model = None
+    _fields = ()
+
+    def __setattr__(self, key, value):
+        raise AttributeError("{} is read-only".format(type(self).__name__))
+
+    def __repr__(self):
+        fields = ", ".join("{}={!r}".format(key, value) for key, value in zip(self._fields, self))
+        return "{}({})".format(type(self).__name__, fields)
+
+    def to_object(self) -> dict:
+        """
+        Convert the record to the dict the to_object of its model returns.
+        """
         obj = {}
-        for key, descriptor in self._keys.items():
-            value = getattr(self, key)
+        for key, value in zip(self._fields, self):
+            descriptor = self._model._keys[key]
             if isinstance(descriptor, TiDBCloudyListField):
-                if value is None:
-                    value = []
-                else:
-                    value = [item.to_object() for item in value]
-            else:
-                assert isinstance(descriptor, TiDBCloudyField)
-                if value is None and descriptor.none_is_empty:
-                    continue
-                if issubclass(descriptor.value_type, TiDBCloudyBase):
+                obj[key] = [] if value is None else [item.to_object() for item in value]
+                continue
+            if value is not None:
+                if descriptor.nested:
                     value = value.to_object()
-                else:
-                    if descriptor.convert_to is not None:
-                        value = descriptor.convert_to(value)
-            obj[key] = value
+                elif descriptor.convert_to is not None:
+                    value = descriptor.convert_to(value)
+            if value is not None or not descriptor.none_is_empty:
+                obj[key] = value
         return obj
 
+    def materialize(self) -> "TiDBCloudyBase":
+        """
+        Build the full object of the record, bound to the context of the record.
+        """
+        context = self[len(self._fields)] if len(self) > len(self._fields) else None
+        return self._model.from_object(context, self.to_object())
+
+
+def _record_type(cls) -> type:
+    fields = tuple(cls._keys)
+    namespace = {"__slots__": (), "_model": cls, "_fields": fields, "__module__": cls.__module__}
+    for i, key in enumerate(fields):
+        namespace[key] = property(itemgetter(i))
+    if issubclass(cls, TiDBCloudyContextualBase):
+        # The context is stored after the fields
+        namespace["context"] = property(itemgetter(len(fields)))
+    record = type("{}Record".format(cls.__name__), (TiDBCloudyRecord,), namespace)
+    record.__qualname__ = "{}.Record".format(cls.__qualname__)
+    return record
+
+
+def _compile_record_decoder(cls) -> Callable:
+    # The nested records, decoded with a None context, are shared through the table with the equal ones decoded
+    # before. Tuples compare equal across types and True == 1 == 1.0, so the key holds the record type and the type of
+    # each plain value, for example, a TiKVComponent and a TiFlashComponent record of the same spec are not merged.
+    # The nested records and tuples are shared already, so they are keyed by identity
+    lines = ["get = obj.get", "setdefault = table.setdefault"]
+    namespace = {"new": tuple.__new__, "record": cls.Record}
+    values = []
+    keys = []
+    for i, (key, descriptor) in enumerate(cls._keys.items()):
+        lines.append("v{} = get({!r})".format(i, key))
+        if isinstance(descriptor, TiDBCloudyListField):
+            namespace["decode_{}".format(i)] = descriptor.item_type._decode_record
+            namespace["record_{}".format(i)] = descriptor.item_type.Record
+            lines.append("if v{} is not None:".format(i))
+            lines.append("    v{0} = tuple([decode_{0}(None, item, table) for item in v{0}])".format(i))
+            lines.append("    v{0} = setdefault((tuple, record_{0}, *map(id, v{0})), v{0})".format(i))
+            keys.append("id(v{})".format(i))
+        elif descriptor.nested:
+            namespace["decode_{}".format(i)] = descriptor.value_type._decode_record
+            lines.append("if v{} is not None:".format(i))
+            lines.append("    v{0} = decode_{0}(None, v{0}, table)".format(i))
+            keys.append("id(v{})".format(i))
+        elif descriptor.members is not None:
+            # The enum members are shared already, look up the exact values before converting the other ones
+            namespace["members_{}".format(i)] = descriptor.members
+            namespace["convert_{}".format(i)] = descriptor.convert_from
+            lines.append("if v{} is not None:".format(i))
+            lines.append("    v{0} = members_{0}.get(v{0}) or convert_{0}(v{0})".format(i))
+            keys.append("v{}".format(i))
+        elif descriptor.convert_from is not None:
+            namespace["convert_{}".format(i)] = descriptor.convert_from
+            lines.append("if v{} is not None:".format(i))
+            lines.append("    v{0} = convert_{0}(v{0})".format(i))
+            keys.append("type(v{0}), v{0}".format(i))
+        else:
+            lines.append("if type(v{0}) is str:".format(i))
+            lines.append("    v{0} = setdefault(v{0}, v{0})".format(i))
+            keys.append("type(v{0}), v{0}".format(i))
+        values.append("v{}".format(i))
+    if issubclass(cls, TiDBCloudyContextualBase):
+        values.append("context")
+    lines.append("value = new(record, ({}))".format("".join(value + ", " for value in values)))
+    lines.append("if context is not None:")
+    lines.append("    return value")
+    lines.append("try:")
+    lines.append("    return setdefault((record, {}), value)".format(", ".join(keys)))
+    lines.append("except TypeError:")
+    lines.append("    # A plain value is not hashable, for example, a dict")
+    lines.append("    return value")
+    return _compile(cls, "_decode_record", "context, obj, table", lines, namespace)
+
 
 class TiDBCloudyField:
     def __init__(self, value_type, convert_from: Callable = None, convert_to: Callable = None, none_is_empty=True):
@@ -92,10 +366,14 @@ class TiDBCloudyField:
         self.convert_from = convert_from
         self.convert_to = convert_to
         self.none_is_empty = none_is_empty
+        self.nested = isinstance(value_type, type) and issubclass(value_type, TiDBCloudyBase)
+        # The enum members by value, for the record decoders to skip the conversion of the exact values
+        self.members = None
 
         if issubclass(self.value_type, Enum):
             if self.convert_from is None:
                 self.convert_from = lambda x: self.value_type(x.upper())
+                self.members = {member.value: member for member in self.value_type}
             if self.convert_to is None:
                 self.convert_to = lambda x: x.value
 
@@ -106,7 +384,12 @@ class TiDBCloudyField:
     def __get__(self, instance, owner):
         if instance is None:
             return self
-        return getattr(instance, self._private, None)
+        value = getattr(instance, self._private, None)
+        if self.nested and type(value) is dict:
+            # Left by a lazy from_object, decoding it twice from two threads only builds an equal object twice
+            value = self.value_type._decode_lazy(getattr(instance, "_context", None), value)
+            setattr(instance, self._private, value)
+        return value
 
     def __set__(self, instance, value):
         setattr(instance, self._private, value)
@@ -125,7 +408,12 @@ class TiDBCloudyListField:
     def __get__(self, instance, owner):
         if instance is None:
             return self
-        return getattr(instance, self._private)
+        value = getattr(instance, self._private)
+        if value and type(value[0]) is dict:
+            # Left by a lazy from_object
+            value = self.item_type._decode_many_lazy(getattr(instance, "_context", None), value)
+            setattr(instance, self._private, value)
+        return value
 
     def __set__(self, instance, value):
         setattr(instance, self._private, value)
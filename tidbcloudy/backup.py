@@ -1,6 +1,7 @@
 from ._base import TiDBCloudyBase, TiDBCloudyContextualBase, TiDBCloudyField
 from .specification import BackupStatus, BackupType
 from .util.log import log
+from .util.tracing import traced
 
 
 # noinspection PyShadowingBuiltins
@@ -40,10 +41,17 @@ class Backup(TiDBCloudyBase, TiDBCloudyContextualBase):
         _from: internal use only
     """
 
+    @traced
     def delete(self):
         path = "projects/{}/clusters/{}/backups/{}".format(self.project_id, self.cluster_id, self.id)
         self.context.call_delete(server="v1beta", path=path)
         log("backup task id={} has been deleted".format(self.id))
 
+    @traced
+    async def delete_async(self):
+        path = "projects/{}/clusters/{}/backups/{}".format(self.project_id, self.cluster_id, self.id)
+        await self.context.call_delete(server="v1beta", path=path)
+        log("backup task id={} has been deleted".format(self.id))
+
     def __repr__(self):
         return "<backup id={} name={} create_at= {}>".format(self.id, self.name, self.create_timestamp)
@@ -1,15 +1,17 @@
+import functools
 import time
-from typing import Iterator, Union
-
-import MySQLdb
-import deprecation
+from typing import Callable, Union
 
 from ._base import TiDBCloudyBase, TiDBCloudyContextualBase, TiDBCloudyField
 from .backup import Backup
 from .specification import CloudProvider, ClusterConfig, ClusterInfo, ClusterStatus, ClusterType, UpdateClusterConfig
+from .exception import TiDBCloudDeadlineException
+from .util.deadline import Deadline, current_deadline, deadline_scope, earliest
+from .util.lazy import deprecated
 from .util.log import log
-from .util.page import Page
+from .util.page import AsyncPaginator, AsyncStreamPage, Page, Paginator, StreamPage, page_query
 from .util.timestamp import timestamp_to_string
+from .util.tracing import traced
 
 
 # noinspection PyShadowingBuiltins
@@ -41,12 +43,14 @@ class Cluster(TiDBCloudyBase, TiDBCloudyContextualBase):
         resp = self.context.call_get(server="v1beta", path=path)
         self.assign_object(resp)
 
-    def wait_for_available(self, *, timeout_sec: int = None, interval_sec: int = 10) -> bool:
+    @traced
+    def wait_for_available(self, *, timeout_sec: int = None, interval_sec: int = 10, deadline: Deadline = None) -> bool:
         """
         Wait for cluster to be ready.
         Args:
             timeout_sec: timeout in seconds.
             interval_sec: interval in seconds.
+            deadline: the deadline of the wait, which also bounds the requests made while waiting.
 
         Returns:
             True if cluster is ready, False if timeout.
@@ -62,26 +66,32 @@ class Cluster(TiDBCloudyBase, TiDBCloudyContextualBase):
             cluster = project.create_cluster(cluster_config)
             cluster.wait_for_available()
         """
+        deadline = earliest(current_deadline(), deadline, Deadline(timeout_sec) if timeout_sec is not None else None)
         time_start = time.monotonic()
         counter = 1
         while True:
             duration = time.monotonic() - time_start
             minutes = duration - 60 * counter
-            if timeout_sec is not None and duration > timeout_sec:
+            if deadline is not None and deadline.expired:
                 return False
             elif minutes > 0:
                 counter += 1
                 log("Waiting for cluster {} to be ready, {} seconds passed...".format(self.id, int(duration)))
-            self._update_info_from_server()
+            try:
+                with deadline_scope(deadline):
+                    self._update_info_from_server()
+            except TiDBCloudDeadlineException:
+                return False
             if self.status.cluster_status == ClusterStatus.AVAILABLE:
                 log("Cluster id={} is {}".format(self.id, self.status.cluster_status.value))
                 return True
-            time.sleep(interval_sec)
+            time.sleep(interval_sec if deadline is None else min(interval_sec, deadline.remaining()))
 
-    @deprecation.deprecated(details="Use wait_for_available instead")
+    @deprecated("Use wait_for_available instead")
     def wait_for_ready(self, *, timeout_sec: int = None, interval_sec: int = 10) -> bool:
         return self.wait_for_available(timeout_sec=timeout_sec, interval_sec=interval_sec)
 
+    @traced
     def update(self, config: Union[UpdateClusterConfig, dict], update_from_server: bool = False):
         path = "projects/{}/clusters/{}".format(self.project_id, self.id)
         if isinstance(config, UpdateClusterConfig):
@@ -91,6 +101,7 @@ class Cluster(TiDBCloudyBase, TiDBCloudyContextualBase):
         if update_from_server:
             self._update_info_from_server()
 
+    @traced
     def pause(self):
         path = "projects/{}/clusters/{}".format(self.project_id, self.id)
         config = {"config": {"paused": True}}
@@ -98,6 +109,7 @@ class Cluster(TiDBCloudyBase, TiDBCloudyContextualBase):
         self._update_info_from_server()
         log("Cluster id={} status={}".format(self.id, self.status.cluster_status.value))
 
+    @traced
     def resume(self):
         path = "projects/{}/clusters/{}".format(self.project_id, self.id)
         config = {"config": {"paused": False}}
@@ -105,11 +117,13 @@ class Cluster(TiDBCloudyBase, TiDBCloudyContextualBase):
         self._update_info_from_server()
         log("Cluster id={} status={}".format(self.id, self.status.cluster_status.value))
 
+    @traced
     def delete(self):
         path = "projects/{}/clusters/{}".format(self.project_id, self.id)
         self.context.call_delete(server="v1beta", path=path)
         log("Cluster id={} has been deleted".format(self.id))
 
+    @traced
     def create_backup(self, *, name: str, description: str = None) -> Backup:
         """
         Create a backup of the cluster.
@@ -128,6 +142,7 @@ class Cluster(TiDBCloudyBase, TiDBCloudyContextualBase):
         resp = self.context.call_post(server="v1beta", path=path, json=config)
         return self.get_backup(resp["id"])
 
+    @traced
     def delete_backup(self, backup_id: str):
         """
         Delete a backup of the cluster.
@@ -140,54 +155,62 @@ class Cluster(TiDBCloudyBase, TiDBCloudyContextualBase):
         """
         Backup(context=self.context, backup_id=backup_id, cluster_id=self.id, project_id=self.project_id).delete()
 
-    def iter_backups(self, *, page_size: int = 10) -> Iterator[Backup]:
+    def iter_backups(
+        self,
+        *,
+        page_size: int = 10,
+        deadline: Deadline = None,
+        prefetch: int = 0,
+        max_page_size: int = None,
+        compact: bool = False,
+    ) -> Paginator[Backup]:
         """
         This is not a TiDB Cloud official endpoint.
         Iterate all backups of the cluster.
         Args:
             page_size: the page size of the response.
+            deadline: the deadline of the iteration, which raises TiDBCloudDeadlineException once it is exceeded.
+            prefetch: the number of pages fetched in the background once the first page gives the total.
+            max_page_size: the largest page size the page size grows to, see Paginator.
+            compact: whether to iterate compact read-only records instead of backups, see Backup.from_records.
 
         Returns:
             Backup instance.
 
         """
-        page = 1
-        total = None
-        while total is None or (page - 1) * page_size < total:
-            backups = self.list_backups(page=page, page_size=page_size)
-            total = backups.total
-            for backup in backups.items:
-                yield backup
-            page += 1
+        return Paginator(
+            functools.partial(self.list_backups, compact=compact),
+            page_size,
+            deadline=deadline,
+            prefetch=prefetch,
+            max_page_size=max_page_size,
+        )
 
-    def list_backups(self, *, page: int = None, page_size: int = None) -> Page[Backup]:
+    @traced
+    def list_backups(
+        self, *, page: int = None, page_size: int = None, stream: bool = False, compact: bool = False
+    ) -> Page[Backup]:
         """
         List all backups of the cluster.
         Args:
             page: the page of the response.
             page_size: the page size of each page.
+            stream: whether to build the backups while the response is being received, see StreamPage.
+            compact: whether to list compact read-only records instead of backups, see Backup.from_records.
 
         Returns:
             The response of the API.
 
         """
         path = "projects/{}/clusters/{}/backups".format(self.project_id, self.id)
-        query = {}
-        if page is not None:
-            query["page"] = page
-        if page_size is not None:
-            query["page_size"] = page_size
-        resp = self.context.call_get(server="v1beta", path=path, params=query)
-        return Page(
-            [
-                Backup.from_object(self.context, {"cluster_id": self.id, "project_id": self.project_id, **backup})
-                for backup in resp["items"]
-            ],
-            page,
-            page_size,
-            resp["total"],
-        )
+        if stream:
+            items = self.context.stream_get(server="v1beta", path=path, params=page_query(page, page_size))
+            decode = self._backup_decoder(compact)
+            return StreamPage((decode(item) for item in items), page, page_size, items)
+        resp = self.context.call_get(server="v1beta", path=path, params=page_query(page, page_size))
+        return self._backups_page(resp, page, page_size, compact)
 
+    @traced
     def get_backup(self, backup_id: str) -> Backup:
         """
         Get a backup of the cluster.
@@ -202,7 +225,200 @@ class Cluster(TiDBCloudyBase, TiDBCloudyContextualBase):
         resp = self.context.call_get(server="v1beta", path=path)
         return Backup.from_object(self.context, {"cluster_id": self.id, "project_id": self.project_id, **resp})
 
+    def _backup_decoder(self, compact: bool) -> Callable[[dict], Backup]:
+        decode = Backup.record_decoder(self.context) if compact else functools.partial(Backup.from_object, self.context)
+        return lambda backup: decode({"cluster_id": self.id, "project_id": self.project_id, **backup})
+
+    def _backups_page(self, resp: dict, page: int, page_size: int, compact: bool = False) -> Page[Backup]:
+        items = [{"cluster_id": self.id, "project_id": self.project_id, **backup} for backup in resp["items"]]
+        if compact:
+            return Page(Backup.from_records(self.context, items), page, page_size, resp["total"])
+        return Page(Backup.from_objects(self.context, items), page, page_size, resp["total"])
+
+    async def _update_info_from_server_async(self):
+        path = "projects/{}/clusters/{}".format(self.project_id, self.id)
+        resp = await self.context.call_get(server="v1beta", path=path)
+        self.assign_object(resp)
+
+    @traced
+    async def wait_for_available_async(
+        self, *, timeout_sec: int = None, interval_sec: int = 10, deadline: Deadline = None
+    ) -> bool:
+        """
+        The async version of wait_for_available. The cluster must be bound to an AsyncContext.
+        Args:
+            timeout_sec: timeout in seconds.
+            interval_sec: interval in seconds.
+            deadline: the deadline of the wait, which also bounds the requests made while waiting.
+
+        Returns:
+            True if cluster is ready, False if timeout.
+
+        Examples:
+            .. code-block:: python
+                import tidbcloudy
+                async with tidbcloudy.AsyncTiDBCloud(public_key="your_public_key", private_key="your_private_key") as api:
+                    project = await api.get_project(project_id)
+                    cluster = await project.create_cluster_async(cluster_config)
+                    await cluster.wait_for_available_async()
+        """
+        import asyncio
+
+        deadline = earliest(current_deadline(), deadline, Deadline(timeout_sec) if timeout_sec is not None else None)
+        time_start = time.monotonic()
+        counter = 1
+        while True:
+            duration = time.monotonic() - time_start
+            minutes = duration - 60 * counter
+            if deadline is not None and deadline.expired:
+                return False
+            elif minutes > 0:
+                counter += 1
+                log("Waiting for cluster {} to be ready, {} seconds passed...".format(self.id, int(duration)))
+            try:
+                with deadline_scope(deadline):
+                    await self._update_info_from_server_async()
+            except TiDBCloudDeadlineException:
+                return False
+            if self.status.cluster_status == ClusterStatus.AVAILABLE:
+                log("Cluster id={} is {}".format(self.id, self.status.cluster_status.value))
+                return True
+            await asyncio.sleep(interval_sec if deadline is None else min(interval_sec, deadline.remaining()))
+
+    @traced
+    async def update_async(self, config: Union[UpdateClusterConfig, dict], update_from_server: bool = False):
+        """
+        The async version of update. The cluster must be bound to an AsyncContext.
+        """
+        path = "projects/{}/clusters/{}".format(self.project_id, self.id)
+        if isinstance(config, UpdateClusterConfig):
+            config = config.to_object()
+        await self.context.call_patch(server="v1beta", path=path, json=config)
+        log("Cluster id={} has been updated".format(self.id))
+        if update_from_server:
+            await self._update_info_from_server_async()
+
+    @traced
+    async def pause_async(self):
+        """
+        The async version of pause. The cluster must be bound to an AsyncContext.
+        """
+        path = "projects/{}/clusters/{}".format(self.project_id, self.id)
+        await self.context.call_patch(server="v1beta", path=path, json={"config": {"paused": True}})
+        await self._update_info_from_server_async()
+        log("Cluster id={} status={}".format(self.id, self.status.cluster_status.value))
+
+    @traced
+    async def resume_async(self):
+        """
+        The async version of resume. The cluster must be bound to an AsyncContext.
+        """
+        path = "projects/{}/clusters/{}".format(self.project_id, self.id)
+        await self.context.call_patch(server="v1beta", path=path, json={"config": {"paused": False}})
+        await self._update_info_from_server_async()
+        log("Cluster id={} status={}".format(self.id, self.status.cluster_status.value))
+
+    @traced
+    async def delete_async(self):
+        """
+        The async version of delete. The cluster must be bound to an AsyncContext.
+        """
+        path = "projects/{}/clusters/{}".format(self.project_id, self.id)
+        await self.context.call_delete(server="v1beta", path=path)
+        log("Cluster id={} has been deleted".format(self.id))
+
+    @traced
+    async def create_backup_async(self, *, name: str, description: str = None) -> Backup:
+        """
+        The async version of create_backup. The cluster must be bound to an AsyncContext.
+        """
+        path = "projects/{}/clusters/{}/backups".format(self.project_id, self.id)
+        config = {"name": name}
+        if description is not None:
+            config["description"] = description
+        resp = await self.context.call_post(server="v1beta", path=path, json=config)
+        return await self.get_backup_async(resp["id"])
+
+    @traced
+    async def delete_backup_async(self, backup_id: str):
+        """
+        The async version of delete_backup. The cluster must be bound to an AsyncContext.
+        """
+        backup = Backup(context=self.context, id=backup_id, cluster_id=self.id, project_id=self.project_id)
+        await backup.delete_async()
+
+    def iter_backups_async(
+        self,
+        *,
+        page_size: int = 10,
+        deadline: Deadline = None,
+        prefetch: int = 0,
+        max_page_size: int = None,
+        compact: bool = False,
+    ) -> AsyncPaginator[Backup]:
+        """
+        The async version of iter_backups. The cluster must be bound to an AsyncContext.
+        Args:
+            page_size: the page size of the response.
+            deadline: the deadline of the iteration, which raises TiDBCloudDeadlineException once it is exceeded.
+            prefetch: the number of pages fetched in the background once the first page gives the total.
+            max_page_size: the largest page size the page size grows to, see Paginator.
+            compact: whether to iterate compact read-only records instead of backups, see Backup.from_records.
+
+        Returns:
+            The async iterator of the backups.
+
+        Examples:
+            .. code-block:: python
+                async for backup in cluster.iter_backups_async():
+                    print(backup) # This is a Backup instance.
+
+        """
+        return AsyncPaginator(
+            functools.partial(self.list_backups_async, compact=compact),
+            page_size,
+            deadline=deadline,
+            prefetch=prefetch,
+            max_page_size=max_page_size,
+        )
+
+    @traced
+    async def list_backups_async(
+        self, *, page: int = None, page_size: int = None, stream: bool = False, compact: bool = False
+    ) -> Page[Backup]:
+        """
+        The async version of list_backups. The cluster must be bound to an AsyncContext.
+        Args:
+            page: the page of the response.
+            page_size: the page size of each page.
+            stream: whether to build the backups while the response is being received, see AsyncStreamPage.
+            compact: whether to list compact read-only records instead of backups, see Backup.from_records.
+
+        Returns:
+            The page of the backups.
+
+        """
+        path = "projects/{}/clusters/{}/backups".format(self.project_id, self.id)
+        if stream:
+            items = await self.context.stream_get(server="v1beta", path=path, params=page_query(page, page_size))
+            decode = self._backup_decoder(compact)
+            return AsyncStreamPage((decode(item) async for item in items), page, page_size, items)
+        resp = await self.context.call_get(server="v1beta", path=path, params=page_query(page, page_size))
+        return self._backups_page(resp, page, page_size, compact)
+
+    @traced
+    async def get_backup_async(self, backup_id: str) -> Backup:
+        """
+        The async version of get_backup. The cluster must be bound to an AsyncContext.
+        """
+        path = "projects/{}/clusters/{}/backups/{}".format(self.project_id, self.id, backup_id)
+        resp = await self.context.call_get(server="v1beta", path=path)
+        return Backup.from_object(self.context, {"cluster_id": self.id, "project_id": self.project_id, **resp})
+
     def connect(self, type: str, database: str, password: str):
+        # MySQLdb loads the MySQL C extension, so it is only imported by the callers connecting to a cluster
+        import MySQLdb
+
         connection_strings = self.status.connection_strings.to_object()
         user = connection_strings["default_user"]
         if connection_strings is None:
@@ -1,47 +1,599 @@
+import time
+from typing import Callable, Dict, List, Optional, Union
+
 import httpx
 
-from tidbcloudy.exception import TiDBCloudResponseException
+from tidbcloudy.exception import (
+    TiDBCloudCircuitOpenException,
+    TiDBCloudDeadlineException,
+    TiDBCloudResponseException,
+)
+from tidbcloudy.util.auth import DigestChallengeStore, SharedDigestAuth
+from tidbcloudy.util.breaker import CircuitBreaker
+from tidbcloudy.util.cache import ResponseCache
+from tidbcloudy.util.codec import JSONCodec, get_codec
+from tidbcloudy.util.concurrency import AdaptiveConcurrencyLimiter
+from tidbcloudy.util.deadline import Deadline, current_deadline, earliest
+from tidbcloudy.util.log import log
+from tidbcloudy.util.metrics import Labels, MetricsRegistry, endpoint_template
+from tidbcloudy.util.page import record_fetched_bytes
+from tidbcloudy.util.ratelimit import RateLimiter
+from tidbcloudy.util.retry import RetryPolicy, RetryStats
+from tidbcloudy.util.singleflight import SingleFlight, request_key
+from tidbcloudy.util.stream import AsyncItemStream, ItemStream
+from tidbcloudy.util.tracing import Span, Tracer
+from tidbcloudy.util.transport import PoolStats, TransportProfile
+
 
+class _BaseContext:
+    # Whether the call_* methods are coroutines
+    is_async = False
 
-class Context:
-    def __init__(self, public_key: str, private_key: str, server_config: dict):
+    def __init__(
+        self,
+        public_key: str,
+        private_key: str,
+        server_config: dict,
+        *,
+        transport_profile: TransportProfile = None,
+        retry_policy: RetryPolicy = None,
+        rate_limiter: RateLimiter = None,
+        concurrency_limiter: AdaptiveConcurrencyLimiter = None,
+        single_flight: bool = False,
+        cache: ResponseCache = None,
+        digest_store: DigestChallengeStore = None,
+        codec: JSONCodec = None,
+        metrics: MetricsRegistry = None,
+        tracer: Tracer = None,
+        deadlines: Dict[str, float] = None,
+        circuit_breaker: CircuitBreaker = None,
+        transport: Union[httpx.BaseTransport, httpx.AsyncBaseTransport] = None,
+    ):
         """
         Args:
             public_key: your public key to access to TiDB Cloud
             private_key: your private key to access to TiDB Cloud
             server_config: the server configuration dict to access to TiDB Cloud
+            transport_profile: the connection pool settings, use the default TransportProfile if None
+            retry_policy: the retry policy of failed calls, use the default RetryPolicy if None
+            rate_limiter: the client-side rate limiter, which can be shared by several contexts, no limit if None
+            concurrency_limiter: the adaptive limiter of in-flight requests, which can be shared by several contexts,
+                no limit if None
+            single_flight: whether concurrent identical GET calls share one in-flight request and its decoded
+                response, which callers must then treat as read-only
+            cache: the cache of GET responses, invalidated by the POST, PATCH and DELETE calls of this context,
+                no cache if None
+            digest_store: the store of digest challenges used to sign requests preemptively, use the store shared by
+                all contexts of the process if None
+            codec: the JSON codec of request and response bodies, use orjson or msgspec if installed and the standard
+                json module otherwise if None
+            metrics: the registry of the request metrics, which can be shared by several contexts, use a new
+                MetricsRegistry if None
+            tracer: the tracer of the SDK methods and their HTTP requests, no tracing if None
+            deadlines: the budget in seconds of each call to a server key, including its retries, for example,
+                {"billing": 10}. A shorter deadline_scope around the call wins.
+            circuit_breaker: the per-server circuit breaker, which can be shared by several contexts, no breaker if None
+            transport: the httpx transport sending the requests instead of the one of transport_profile, for example,
+                an httpx.WSGITransport serving an app in-process. It must be an httpx.AsyncBaseTransport for
+                AsyncContext, and it is closed with the context.
         """
-        self._client = httpx.Client()
-        self._client.auth = httpx.DigestAuth(public_key, private_key)
+        self._auth = SharedDigestAuth(public_key, private_key, store=digest_store)
         self._server_config = server_config
+        self._transport_profile = transport_profile if transport_profile is not None else TransportProfile()
+        self._pool_stats = PoolStats()
+        self._retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self._retry_stats = RetryStats()
+        self._rate_limiter = rate_limiter
+        self._concurrency_limiter = concurrency_limiter
+        self._single_flight = SingleFlight() if single_flight else None
+        self._cache = cache
+        self._codec = codec if codec is not None else get_codec()
+        self._metrics = metrics if metrics is not None else MetricsRegistry()
+        self._tracer = tracer
+        self._deadlines = dict(deadlines) if deadlines is not None else {}
+        self._circuit_breaker = circuit_breaker
+        self._transport = transport
+        self._invalidation_listeners: List[Callable[[str, str], None]] = []
+
+    @property
+    def retry_policy(self) -> RetryPolicy:
+        return self._retry_policy
+
+    def retry_stats(self) -> dict:
+        """
+        Get the retry statistics.
+
+        Returns:
+            a dict with the number of retries and of calls that still failed after all retries of each server.
+
+        """
+        return self._retry_stats.to_object()
+
+    @property
+    def rate_limiter(self) -> Optional[RateLimiter]:
+        return self._rate_limiter
+
+    @property
+    def concurrency_limiter(self) -> Optional[AdaptiveConcurrencyLimiter]:
+        return self._concurrency_limiter
+
+    def single_flight_stats(self) -> Optional[dict]:
+        """
+        Get the GET coalescing statistics, or None if single_flight is disabled.
+
+        Returns:
+            a dict with the number of GET calls actually sent and of calls that shared an in-flight response.
+
+        """
+        return self._single_flight.stats() if self._single_flight is not None else None
+
+    @property
+    def cache(self) -> Optional[ResponseCache]:
+        return self._cache
+
+    def digest_stats(self) -> dict:
+        """
+        Get the digest challenge statistics of the digest store, which may be shared by other contexts.
+
+        Returns:
+            a dict with the number of cold challenge round trips, of round trips caused by a stale nonce, and of
+            requests signed preemptively with a cached nonce.
+
+        """
+        return self._auth.store.stats()
+
+    @property
+    def codec(self) -> JSONCodec:
+        return self._codec
+
+    @property
+    def metrics(self) -> MetricsRegistry:
+        return self._metrics
+
+    @property
+    def tracer(self) -> Optional[Tracer]:
+        return self._tracer
+
+    @property
+    def circuit_breaker(self) -> Optional[CircuitBreaker]:
+        return self._circuit_breaker
+
+    @property
+    def transport_profile(self) -> TransportProfile:
+        return self._transport_profile
 
-    def _call_api(self, method: str, path: str, server: str, **kwargs) -> dict:
+    def pool_stats(self) -> dict:
+        """
+        Get the connection pool statistics.
+
+        Returns:
+            a dict with the requests, newly opened and reused connections of each server, the count of each HTTP
+            version, and the current number of connections, idle connections and active connections in the pool.
+
+        """
+        return self._pool_stats.to_object(self._transport)
+
+    def _build_url(self, server: str, path: str) -> str:
         base_url = self._server_config.get(server)
         if base_url[-1] != "/":
             base_url += "/"
+        return base_url + path
+
+    def _encode_body(self, kwargs: dict):
+        # Encode the json body once with the codec, instead of letting httpx encode it with the json module
+        json_body = kwargs.pop("json", None)
+        if json_body is not None:
+            kwargs["content"] = self._codec.dumps(json_body)
+            kwargs["headers"] = {"Content-Type": "application/json"}
+
+    def invalidate_cache(self, server: str, path: str):
+        """
+        Drop the cached responses of a resource changed by a call to another path, see ResponseCache.invalidate. For
+        example, creating a restore creates a cluster, which changes the clusters listing of the project. The POST,
+        PATCH and DELETE calls of this context call it with their own path. The invalidation listeners are called too.
+        Args:
+            server: the server key of the resource.
+            path: the path of the resource.
+        """
+        if self._cache is not None:
+            self._cache.invalidate(server, path)
+        for listener in self._invalidation_listeners:
+            listener(server, path)
+
+    def add_invalidation_listener(self, listener: Callable[[str, str], None]):
+        """
+        Call a function with the server key and the path of each resource invalidated by this context, see
+        invalidate_cache, for example, to drop the objects a client keeps from the listings.
+        Args:
+            listener: the function, called with the server key and the path.
+        """
+        self._invalidation_listeners.append(listener)
+
+    def _reserve_rate_limit(self, server: str, deadline: Optional[Deadline], method: str, url: str) -> float:
+        self._check_deadline(deadline, method, url)
+        if self._rate_limiter is None:
+            return 0.0
+        delay = self._rate_limiter.reserve(server)
+        try:
+            self._check_deadline(deadline, method, url, delay)
+        except TiDBCloudDeadlineException:
+            # The request is not sent, so its slot goes back to the other requests
+            self._rate_limiter.refund(server, delay)
+            raise
+        return delay
+
+    def _acquire_circuit(self, server: str, error: Optional[Exception]) -> bool:
+        # Return whether the outcome of the request must be recorded, raise if the circuit of the server is open
+        if self._circuit_breaker is None:
+            return False
+        retry_after = self._circuit_breaker.acquire(server)
+        if retry_after is not None:
+            raise TiDBCloudCircuitOpenException(server, retry_after) from error
+        return True
+
+    def _record_circuit(self, server: str, error: Optional[Exception]):
+        if isinstance(error, httpx.HTTPStatusError):
+            failure = error.response.status_code >= 500
+        else:
+            failure = isinstance(error, httpx.RequestError)
+        self._circuit_breaker.record(server, failure)
+
+    def _release_slot(self, slot: Optional[int], labels: Labels, latency: float, error: Optional[Exception]):
+        if slot is None:
+            return
+        if isinstance(error, httpx.HTTPStatusError):
+            overloaded = error.response.status_code == 429 or error.response.status_code >= 500
+        else:
+            overloaded = isinstance(error, httpx.TimeoutException)
+        self._concurrency_limiter.release(slot, latency, overloaded, labels)
+
+    def _record_metrics(self, labels: Labels, latency: float, resp: Optional[httpx.Response], bytes_out: int):
+        if resp is None:
+            self._metrics.end_request(labels, "error", latency, bytes_out, 0)
+            return
+        # The body of a streamed response is still being received, so count its announced length
+        bytes_in = len(resp.content) if resp.is_stream_consumed else int(resp.headers.get("Content-Length", 0))
+        self._metrics.end_request(labels, str(resp.status_code), latency, bytes_out, bytes_in)
+
+    def _start_http_span(self, labels: Labels, attempt: int, params: Optional[dict]) -> Optional[Span]:
+        if self._tracer is None:
+            return None
+        method, server, endpoint = labels
+        attributes = {"http.method": method, "server": server, "endpoint": endpoint, "attempt": attempt}
+        if params:
+            for key in ("page", "page_size"):
+                if key in params:
+                    attributes[key] = params[key]
+        return self._tracer.start_span("HTTP {} {}".format(method, endpoint), attributes)
+
+    def _end_http_span(
+        self, span: Optional[Span], resp: Optional[httpx.Response], error: Optional[Exception], bytes_out: int
+    ):
+        if span is None:
+            return
+        span.set_attribute("bytes_out", bytes_out)
+        if resp is not None:
+            span.set_attribute("http.status_code", resp.status_code)
+            if resp.is_stream_consumed:
+                span.set_attribute("bytes_in", len(resp.content))
+        self._tracer.end_span(span, error)
+
+    def _decode(self, resp: httpx.Response, span: Optional[Span], bytes_out: int) -> dict:
+        record_fetched_bytes(len(resp.content))
         try:
-            resp = self._client.request(method=method, url=base_url + path, **kwargs)
-            resp.raise_for_status()
-            return resp.json()
-        except httpx.RequestError as exc:
+            result = self._codec.loads(resp.content)
+        except Exception as exc:
+            self._end_http_span(span, resp, exc, bytes_out)
+            raise
+        if span is not None and isinstance(result, dict) and isinstance(result.get("items"), list):
+            span.set_attribute("items", len(result["items"]))
+        self._end_http_span(span, resp, None, bytes_out)
+        return result
+
+    def _get_deadline(self, server: str) -> Optional[Deadline]:
+        budget = self._deadlines.get(server)
+        return earliest(current_deadline(), Deadline(budget) if budget is not None else None)
+
+    @staticmethod
+    def _check_deadline(deadline: Optional[Deadline], method: str, url: str, wait: float = 0.0):
+        if deadline is not None and deadline.remaining() <= wait:
+            raise TiDBCloudDeadlineException(f"{method} {url}")
+
+    def _get_timeout(self, deadline: Optional[Deadline]):
+        # Shorten each timeout of the client to the remaining budget
+        if deadline is None:
+            return httpx.USE_CLIENT_DEFAULT
+        remaining = deadline.remaining()
+        timeout = self._client.timeout
+        return httpx.Timeout(
+            connect=remaining if timeout.connect is None else min(timeout.connect, remaining),
+            read=remaining if timeout.read is None else min(timeout.read, remaining),
+            write=remaining if timeout.write is None else min(timeout.write, remaining),
+            pool=remaining if timeout.pool is None else min(timeout.pool, remaining),
+        )
+
+    def _get_retry_delay(
+        self, method: str, server: str, attempt: int, exc: Exception, retry: bool, deadline: Optional[Deadline]
+    ) -> Optional[float]:
+        # Return None when the error is not retried, otherwise the seconds to wait before the next attempt
+        if deadline is not None and deadline.expired and isinstance(exc, httpx.TimeoutException):
+            raise TiDBCloudDeadlineException(f"{method} {exc.request.url} after {attempt + 1} attempts") from exc
+        if not self._retry_policy.is_retryable(method, exc, retry):
+            return None
+        if attempt >= self._retry_policy.max_retries:
+            self._retry_stats.record_exhausted(server)
+            return None
+        delay = self._retry_policy.get_delay(attempt, exc)
+        if deadline is not None and deadline.remaining() <= delay:
+            raise TiDBCloudDeadlineException(f"{method} {exc.request.url} after {attempt + 1} attempts") from exc
+        self._retry_stats.record_retry(server)
+        log(
+            "Retry {} {} in {:.2f} seconds ({}/{})".format(
+                method, exc.request.url, delay, attempt + 1, self._retry_policy.max_retries
+            )
+        )
+        return delay
+
+    @staticmethod
+    def _raise_error(exc: Exception, retries: int):
+        if isinstance(exc, httpx.HTTPStatusError):
             raise TiDBCloudResponseException(
-                status="Error", message=f"An error occurred when requesting {exc.request.url}"
+                status=exc.response.status_code, message=exc.response.text, retries=retries
             )
-        except httpx.HTTPStatusError as exc:
-            raise TiDBCloudResponseException(status=exc.response.status_code, message=exc.response.text)
+        raise TiDBCloudResponseException(
+            status="Error", message=f"An error occurred when requesting {exc.request.url}", retries=retries
+        )
+
+
+class Context(_BaseContext):
+    def __init__(self, public_key: str, private_key: str, server_config: dict, **kwargs):
+        """
+        Args:
+            public_key: your public key to access to TiDB Cloud
+            private_key: your private key to access to TiDB Cloud
+            server_config: the server configuration dict to access to TiDB Cloud
+            kwargs: the request options, such as transport_profile, retry_policy and rate_limiter
+        """
+        super().__init__(public_key, private_key, server_config, **kwargs)
+        if self._transport is None:
+            self._transport = self._transport_profile.create_transport()
+        self._client = httpx.Client(transport=self._transport)
+        self._client.auth = self._auth
+
+    def _call_api(self, method: str, path: str, server: str, retry: bool = None, stream: bool = False, **kwargs):
+        url = self._build_url(server, path)
+        self._encode_body(kwargs)
+        labels = (method, server, endpoint_template(path))
+        bytes_out = len(kwargs.get("content") or b"")
+        deadline = self._get_deadline(server)
+        attempt = 0
+        error = None
+        while True:
+            rate_limit_delay = self._reserve_rate_limit(server, deadline, method, url)
+            if rate_limit_delay > 0:
+                time.sleep(rate_limit_delay)
+            circuit = self._acquire_circuit(server, error)
+            slot = self._concurrency_limiter.acquire() if self._concurrency_limiter is not None else None
+            start = time.monotonic()
+            error = None
+            resp = None
+            self._metrics.start_request(labels)
+            span = self._start_http_span(labels, attempt, kwargs.get("params"))
+            # Whether the request ended with a response or a classified failure, any other exception, such as a
+            # cancellation, says nothing about the server
+            completed = False
+            try:
+                resp = self._client.send(
+                    self._client.build_request(method=method, url=url, timeout=self._get_timeout(deadline), **kwargs),
+                    stream=stream,
+                )
+                self._pool_stats.record(server, resp)
+                if stream and resp.is_error:
+                    resp.read()
+                resp.raise_for_status()
+                completed = True
+            except (httpx.RequestError, httpx.HTTPStatusError) as exc:
+                error = exc
+                completed = True
+            finally:
+                latency = time.monotonic() - start
+                self._release_slot(slot, labels, latency, error)
+                if circuit and completed:
+                    self._record_circuit(server, error)
+                self._record_metrics(labels, latency, resp, bytes_out)
+            if error is None:
+                if stream:
+                    self._end_http_span(span, resp, None, bytes_out)
+                    return ItemStream(resp.iter_bytes(), resp.close)
+                return self._decode(resp, span, bytes_out)
+            self._end_http_span(span, resp, error, bytes_out)
+            delay = self._get_retry_delay(method, server, attempt, error, retry, deadline)
+            if delay is None:
+                self._raise_error(error, attempt)
+            self._metrics.record_retry(labels)
+            time.sleep(delay)
+            attempt += 1
 
-    def call_get(self, server: str, path: str, *, params: dict = None) -> dict:
-        resp = self._call_api(method="GET", path=path, server=server, params=params)
+    def call_get(self, server: str, path: str, *, params: dict = None, retry: bool = None) -> dict:
+        key = request_key(server, path, params)
+        if self._cache is not None:
+            hit, resp = self._cache.get(key)
+            if hit:
+                return resp
+            generation = self._cache.generation
+        if self._single_flight is not None:
+            resp = self._single_flight.do(
+                key, lambda: self._call_api(method="GET", path=path, server=server, retry=retry, params=params)
+            )
+        else:
+            resp = self._call_api(method="GET", path=path, server=server, retry=retry, params=params)
+        if self._cache is not None:
+            self._cache.set(key, resp, generation)
         return resp
 
-    def call_post(self, server: str, path: str, *, data: dict = None, json: dict = None) -> dict:
-        resp = self._call_api(method="POST", path=path, server=server, data=data, json=json)
+    def stream_get(self, server: str, path: str, *, params: dict = None, retry: bool = None) -> ItemStream:
+        """
+        Send a GET request of a list endpoint and decode its items while the response body is being received, so the
+        memory stays flat regardless of the page size. The call bypasses the cache and single flight, and is only
+        retried before the response headers arrive.
+        Args:
+            server: the server key of the request.
+            path: the path of the request.
+            params: the query parameters of the request.
+            retry: whether to retry the call, use the retry policy if None.
+
+        Returns:
+            the stream of the items, iterate it once to the end or close it.
+
+        """
+        return self._call_api(method="GET", path=path, server=server, retry=retry, stream=True, params=params)
+
+    def call_post(self, server: str, path: str, *, data: dict = None, json: dict = None, retry: bool = None) -> dict:
+        try:
+            resp = self._call_api(method="POST", path=path, server=server, retry=retry, data=data, json=json)
+        finally:
+            self.invalidate_cache(server, path)
         return resp
 
-    def call_patch(self, server: str, path: str, *, data: dict = None, json: dict = None) -> dict:
-        resp = self._call_api(method="PATCH", path=path, server=server, data=data, json=json)
+    def call_patch(self, server: str, path: str, *, data: dict = None, json: dict = None, retry: bool = None) -> dict:
+        try:
+            resp = self._call_api(method="PATCH", path=path, server=server, retry=retry, data=data, json=json)
+        finally:
+            self.invalidate_cache(server, path)
         return resp
 
-    def call_delete(self, server: str, path: str) -> dict:
-        resp = self._call_api(method="DELETE", server=server, path=path)
+    def call_delete(self, server: str, path: str, *, retry: bool = None) -> dict:
+        try:
+            resp = self._call_api(method="DELETE", server=server, path=path, retry=retry)
+        finally:
+            self.invalidate_cache(server, path)
         return resp
+
+    def close(self):
+        self._client.close()
+
+
+class AsyncContext(_BaseContext):
+    is_async = True
+
+    def __init__(self, public_key: str, private_key: str, server_config: dict, **kwargs):
+        """
+        The asyncio version of Context. All call_* methods are coroutines and share one httpx.AsyncClient.
+        Args:
+            public_key: your public key to access to TiDB Cloud
+            private_key: your private key to access to TiDB Cloud
+            server_config: the server configuration dict to access to TiDB Cloud
+            kwargs: the request options, such as transport_profile, retry_policy and rate_limiter
+        """
+        super().__init__(public_key, private_key, server_config, **kwargs)
+        if self._transport is None:
+            self._transport = self._transport_profile.create_async_transport()
+        self._client = httpx.AsyncClient(transport=self._transport)
+        self._client.auth = self._auth
+
+    async def _call_api(self, method: str, path: str, server: str, retry: bool = None, stream: bool = False, **kwargs):
+        import asyncio
+
+        url = self._build_url(server, path)
+        self._encode_body(kwargs)
+        labels = (method, server, endpoint_template(path))
+        bytes_out = len(kwargs.get("content") or b"")
+        deadline = self._get_deadline(server)
+        attempt = 0
+        error = None
+        while True:
+            rate_limit_delay = self._reserve_rate_limit(server, deadline, method, url)
+            if rate_limit_delay > 0:
+                await asyncio.sleep(rate_limit_delay)
+            circuit = self._acquire_circuit(server, error)
+            slot = await self._concurrency_limiter.acquire_async() if self._concurrency_limiter is not None else None
+            start = time.monotonic()
+            error = None
+            resp = None
+            self._metrics.start_request(labels)
+            span = self._start_http_span(labels, attempt, kwargs.get("params"))
+            # Whether the request ended with a response or a classified failure, any other exception, such as a
+            # cancellation, says nothing about the server
+            completed = False
+            try:
+                resp = await self._client.send(
+                    self._client.build_request(method=method, url=url, timeout=self._get_timeout(deadline), **kwargs),
+                    stream=stream,
+                )
+                self._pool_stats.record(server, resp)
+                if stream and resp.is_error:
+                    await resp.aread()
+                resp.raise_for_status()
+                completed = True
+            except (httpx.RequestError, httpx.HTTPStatusError) as exc:
+                error = exc
+                completed = True
+            finally:
+                latency = time.monotonic() - start
+                self._release_slot(slot, labels, latency, error)
+                if circuit and completed:
+                    self._record_circuit(server, error)
+                self._record_metrics(labels, latency, resp, bytes_out)
+            if error is None:
+                if stream:
+                    self._end_http_span(span, resp, None, bytes_out)
+                    return AsyncItemStream(resp.aiter_bytes(), resp.aclose)
+                return self._decode(resp, span, bytes_out)
+            self._end_http_span(span, resp, error, bytes_out)
+            delay = self._get_retry_delay(method, server, attempt, error, retry, deadline)
+            if delay is None:
+                self._raise_error(error, attempt)
+            self._metrics.record_retry(labels)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def call_get(self, server: str, path: str, *, params: dict = None, retry: bool = None) -> dict:
+        key = request_key(server, path, params)
+        if self._cache is not None:
+            hit, resp = self._cache.get(key)
+            if hit:
+                return resp
+            generation = self._cache.generation
+        if self._single_flight is not None:
+            resp = await self._single_flight.do_async(
+                key, lambda: self._call_api(method="GET", path=path, server=server, retry=retry, params=params)
+            )
+        else:
+            resp = await self._call_api(method="GET", path=path, server=server, retry=retry, params=params)
+        if self._cache is not None:
+            self._cache.set(key, resp, generation)
+        return resp
+
+    async def stream_get(self, server: str, path: str, *, params: dict = None, retry: bool = None) -> AsyncItemStream:
+        """
+        The async version of Context.stream_get.
+        """
+        return await self._call_api(method="GET", path=path, server=server, retry=retry, stream=True, params=params)
+
+    async def call_post(
+        self, server: str, path: str, *, data: dict = None, json: dict = None, retry: bool = None
+    ) -> dict:
+        try:
+            resp = await self._call_api(method="POST", path=path, server=server, retry=retry, data=data, json=json)
+        finally:
+            self.invalidate_cache(server, path)
+        return resp
+
+    async def call_patch(
+        self, server: str, path: str, *, data: dict = None, json: dict = None, retry: bool = None
+    ) -> dict:
+        try:
+            resp = await self._call_api(method="PATCH", path=path, server=server, retry=retry, data=data, json=json)
+        finally:
+            self.invalidate_cache(server, path)
+        return resp
+
+    async def call_delete(self, server: str, path: str, *, retry: bool = None) -> dict:
+        try:
+            resp = await self._call_api(method="DELETE", server=server, path=path, retry=retry)
+        finally:
+            self.invalidate_cache(server, path)
+        return resp
+
+    async def aclose(self):
+        await self._client.aclose()
@@ -3,10 +3,11 @@ class TiDBCloudException(Exception):
 
 
 class TiDBCloudResponseException(TiDBCloudException):
-    def __init__(self, status, message=None, raw=None):
+    def __init__(self, status, message=None, raw=None, retries=0):
         self._status = status
         self._message = message
         self._raw = raw
+        self._retries = retries
 
     @property
     def status(self):
@@ -20,5 +21,40 @@ class TiDBCloudResponseException(TiDBCloudException):
     def raw(self):
         return self._raw
 
+    @property
+    def retries(self):
+        return self._retries
+
     def __str__(self):
         return "status: {}, message: {}".format(self._status, self._message)
+
+
+class TiDBCloudDeadlineException(TiDBCloudException):
+    def __init__(self, message=None):
+        self._message = message
+
+    @property
+    def message(self):
+        return self._message
+
+    def __str__(self):
+        return "deadline exceeded: {}".format(self._message)
+
+
+class TiDBCloudCircuitOpenException(TiDBCloudException):
+    def __init__(self, server, retry_after=None):
+        self._server = server
+        self._retry_after = retry_after
+
+    @property
+    def server(self):
+        return self._server
+
+    @property
+    def retry_after(self):
+        return self._retry_after
+
+    def __str__(self):
+        if self._retry_after is None:
+            return "circuit of server {} is open".format(self._server)
+        return "circuit of server {} is open, retry after {:.1f} seconds".format(self._server, self._retry_after)
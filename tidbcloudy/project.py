@@ -1,11 +1,14 @@
-from typing import Iterator, List, Tuple, Union
+import functools
+from typing import AsyncIterator, Callable, Iterator, List, Tuple, Union
 
 from ._base import TiDBCloudyBase, TiDBCloudyContextualBase, TiDBCloudyField
 from .cluster import Cluster
 from .restore import Restore
 from .specification import CreateClusterConfig, ProjectAWSCMEK, UpdateClusterConfig
-from .util.page import Page
+from .util.deadline import Deadline
+from .util.page import AsyncPaginator, AsyncStreamPage, Page, Paginator, StreamPage, page_query
 from .util.timestamp import timestamp_to_string
+from .util.tracing import traced
 
 
 # noinspection PyShadowingBuiltins
@@ -19,6 +22,7 @@ class Project(TiDBCloudyBase, TiDBCloudyContextualBase):
     create_timestamp: int = TiDBCloudyField(int, convert_from=int, convert_to=str)
     aws_cmek_enabled: bool = TiDBCloudyField(bool)
 
+    @traced
     def create_cluster(self, config: Union[CreateClusterConfig, dict]) -> Cluster:
         """
         Create a cluster in the project.
@@ -54,6 +58,7 @@ class Project(TiDBCloudyBase, TiDBCloudyContextualBase):
         resp = self.context.call_post(server="v1beta", path=path, json=config)
         return Cluster(context=self.context, id=resp["id"], project_id=self.id)
 
+    @traced
     def update_cluster(self, cluster_id: str, config: Union[UpdateClusterConfig, dict]):
         """
         Update the cluster.
@@ -76,6 +81,7 @@ class Project(TiDBCloudyBase, TiDBCloudyContextualBase):
         """
         Cluster(context=self.context, id=cluster_id, project_id=self.id).update(config)
 
+    @traced
     def delete_cluster(self, cluster_id: str):
         """
         Delete the cluster.
@@ -94,6 +100,7 @@ class Project(TiDBCloudyBase, TiDBCloudyContextualBase):
         """
         Cluster(context=self.context, id=cluster_id, project_id=self.id).delete()
 
+    @traced
     def get_cluster(self, cluster_id: str) -> Cluster:
         """
         Get the cluster.
@@ -115,12 +122,25 @@ class Project(TiDBCloudyBase, TiDBCloudyContextualBase):
         resp = self.context.call_get(server="v1beta", path=path)
         return Cluster.from_object(self.context, resp)
 
-    def iter_clusters(self, page_size: int = 10) -> Iterator[Cluster]:
+    def iter_clusters(
+        self,
+        page_size: int = 10,
+        deadline: Deadline = None,
+        prefetch: int = 0,
+        max_page_size: int = None,
+        lazy: bool = False,
+        compact: bool = False,
+    ) -> Paginator[Cluster]:
         """
         This is not a TiDB Cloud API official endpoint.
         Iterate all clusters in the project.
         Args:
             page_size:
+            deadline: the deadline of the iteration, which raises TiDBCloudDeadlineException once it is exceeded.
+            prefetch: the number of pages fetched in the background once the first page gives the total.
+            max_page_size: the largest page size the page size grows to, see Paginator.
+            lazy: whether to decode the nested fields of each cluster, such as config and status, on first access.
+            compact: whether to iterate compact read-only records instead of clusters, see Cluster.from_records.
 
         Returns:
             The iterator of the clusters.
@@ -134,21 +154,28 @@ class Project(TiDBCloudyBase, TiDBCloudyContextualBase):
                     print(cluster) # This is a Cluster instance.
 
         """
-        page = 1
-        total = None
-        while total is None or (page - 1) * page_size < total:
-            clusters = self.list_clusters(page=page, page_size=page_size)
-            total = clusters.total
-            for cluster in clusters.items:
-                yield cluster
-            page += 1
+        return Paginator(
+            functools.partial(self.list_clusters, lazy=lazy, compact=compact),
+            page_size,
+            deadline=deadline,
+            prefetch=prefetch,
+            max_page_size=max_page_size,
+        )
 
-    def list_clusters(self, page: int = 1, page_size: int = 10) -> Page[Cluster]:
+    @traced
+    def list_clusters(
+        self, page: int = 1, page_size: int = 10, stream: bool = False, lazy: bool = False, compact: bool = False
+    ) -> Page[Cluster]:
         """
         List all clusters in the project.
         Args:
             page:
             page_size:
+            stream: whether to build the clusters while the response is being received, see StreamPage.
+            lazy: whether to decode the nested fields of each cluster, such as config and status, on first access.
+            compact: whether to list compact read-only records instead of clusters, see Cluster.from_records. The
+                records take about two thirds of the memory of the clusters, for example, for an inventory of many
+                clusters, see benchmark/records.py.
 
         Returns:
 
@@ -163,14 +190,14 @@ class Project(TiDBCloudyBase, TiDBCloudyContextualBase):
 
         """
         path = "projects/{}/clusters".format(self.id)
-        query = {}
-        if page is not None:
-            query["page"] = page
-        if page_size is not None:
-            query["page_size"] = page_size
-        resp = self.context.call_get(server="v1beta", path=path, params=query)
-        return Page([Cluster.from_object(self.context, item) for item in resp["items"]], page, page_size, resp["total"])
-
+        if stream:
+            items = self.context.stream_get(server="v1beta", path=path, params=page_query(page, page_size))
+            decode = self._cluster_decoder(lazy, compact)
+            return StreamPage((decode(item) for item in items), page, page_size, items)
+        resp = self.context.call_get(server="v1beta", path=path, params=page_query(page, page_size))
+        return self._clusters_page(resp, page, page_size, lazy, compact)
+
+    @traced
     def create_restore(self, *, name: str, backup_id: str, cluster_config: Union[CreateClusterConfig, dict]) -> Restore:
         """
         Create a restore in the project.
@@ -186,9 +213,14 @@ class Project(TiDBCloudyBase, TiDBCloudyContextualBase):
         if isinstance(cluster_config, CreateClusterConfig):
             cluster_config = cluster_config.to_object()
         create_config = {"name": name, "backup_id": backup_id, "config": cluster_config["config"]}
-        resp = self.context.call_post(server="v1beta", path=path, json=create_config)
+        try:
+            resp = self.context.call_post(server="v1beta", path=path, json=create_config)
+        finally:
+            # The restore creates a cluster in the project
+            self.context.invalidate_cache(server="v1beta", path="projects/{}/clusters".format(self.id))
         return Restore(context=self.context, id=resp["id"], cluster_id=resp["cluster_id"])
 
+    @traced
     def get_restore(self, restore_id: str) -> Restore:
         """
         Get the restore.
@@ -202,6 +234,7 @@ class Project(TiDBCloudyBase, TiDBCloudyContextualBase):
         resp = self.context.call_get(server="v1beta", path=path)
         return Restore.from_object(self.context, resp)
 
+    @traced
     def list_restores(self, *, page: int = None, page_size: int = None) -> Page[Restore]:
         """
         List all restores in the project.
@@ -213,33 +246,29 @@ class Project(TiDBCloudyBase, TiDBCloudyContextualBase):
 
         """
         path = "projects/{}/restores".format(self.id)
-        query = {}
-        if page is not None:
-            query["page"] = page
-        if page_size is not None:
-            query["page_size"] = page_size
-        resp = self.context.call_get(server="v1beta", path=path, params=query)
-        return Page([Restore.from_object(self.context, item) for item in resp["items"]], page, page_size, resp["total"])
+        resp = self.context.call_get(server="v1beta", path=path, params=page_query(page, page_size))
+        return self._restores_page(resp, page, page_size)
 
-    def iter_restores(self, page_size: int = 10) -> Iterator[Restore]:
+    def iter_restores(
+        self, page_size: int = 10, deadline: Deadline = None, prefetch: int = 0, max_page_size: int = None
+    ) -> Paginator[Restore]:
         """
         This is not a TiDB Cloud API official endpoint.
         Iterate all restores in the project.
         Args:
             page_size:
+            deadline: the deadline of the iteration, which raises TiDBCloudDeadlineException once it is exceeded.
+            prefetch: the number of pages fetched in the background once the first page gives the total.
+            max_page_size: the largest page size the page size grows to, see Paginator.
 
         Returns:
 
         """
-        page = 1
-        total = None
-        while total is None or (page - 1) * page_size < total:
-            restores = self.list_restores(page=page, page_size=page_size)
-            total = restores.total
-            for restore in restores.items:
-                yield restore
-            page += 1
+        return Paginator(
+            self.list_restores, page_size, deadline=deadline, prefetch=prefetch, max_page_size=max_page_size
+        )
 
+    @traced
     def create_aws_cmek(self, config: List[Tuple[str, str]]) -> None:
         """
         Configure the AWS Customer-Managed Encryption Keys (CMEK) for the project.
@@ -261,6 +290,7 @@ class Project(TiDBCloudyBase, TiDBCloudyContextualBase):
         path = f"projects/{self.id}/aws-cmek"
         self.context.call_post(server="v1beta", path=path, json=payload)
 
+    @traced
     def list_aws_cmek(self) -> Page[ProjectAWSCMEK]:
         """
         List all AWS Customer-Managed Encryption Keys (CMEK) in the project.
@@ -280,7 +310,7 @@ class Project(TiDBCloudyBase, TiDBCloudyContextualBase):
         path = f"projects/{self.id}/aws-cmek"
         resp = self.context.call_get(server="v1beta", path=path)
         total = len(resp["items"])
-        return Page([ProjectAWSCMEK.from_object(self.context, item) for item in resp["items"]], 1, total, total)
+        return Page(ProjectAWSCMEK.from_objects(self.context, resp["items"]), 1, total, total)
 
     def iter_aws_cmek(self) -> Iterator[ProjectAWSCMEK]:
         """
@@ -302,6 +332,218 @@ class Project(TiDBCloudyBase, TiDBCloudyContextualBase):
         for cmek in cmeks.items:
             yield cmek
 
+    def _cluster_decoder(self, lazy: bool, compact: bool) -> Callable[[dict], Cluster]:
+        if compact:
+            return Cluster.record_decoder(self.context)
+        return functools.partial(Cluster.from_object, self.context, lazy=lazy)
+
+    def _clusters_page(
+        self, resp: dict, page: int, page_size: int, lazy: bool = False, compact: bool = False
+    ) -> Page[Cluster]:
+        if compact:
+            return Page(Cluster.from_records(self.context, resp["items"]), page, page_size, resp["total"])
+        return Page(Cluster.from_objects(self.context, resp["items"], lazy), page, page_size, resp["total"])
+
+    def _restores_page(self, resp: dict, page: int, page_size: int) -> Page[Restore]:
+        return Page(Restore.from_objects(self.context, resp["items"]), page, page_size, resp["total"])
+
+    @traced
+    async def create_cluster_async(self, config: Union[CreateClusterConfig, dict]) -> Cluster:
+        """
+        The async version of create_cluster. The project must be bound to an AsyncContext.
+        Args:
+            config: the configuration of the cluster.
+
+        Returns:
+            The created cluster instance.
+
+        """
+        if isinstance(config, CreateClusterConfig):
+            config = config.to_object()
+        path = "projects/{}/clusters".format(self.id)
+        resp = await self.context.call_post(server="v1beta", path=path, json=config)
+        return Cluster(context=self.context, id=resp["id"], project_id=self.id)
+
+    @traced
+    async def update_cluster_async(self, cluster_id: str, config: Union[UpdateClusterConfig, dict]):
+        """
+        The async version of update_cluster. The project must be bound to an AsyncContext.
+        Args:
+            cluster_id: the id of the cluster you want to update.
+            config: the updated configuration of the cluster.
+
+        """
+        await Cluster(context=self.context, id=cluster_id, project_id=self.id).update_async(config)
+
+    @traced
+    async def delete_cluster_async(self, cluster_id: str):
+        """
+        The async version of delete_cluster. The project must be bound to an AsyncContext.
+        Args:
+            cluster_id: the id of the cluster you want to delete.
+
+        """
+        await Cluster(context=self.context, id=cluster_id, project_id=self.id).delete_async()
+
+    @traced
+    async def get_cluster_async(self, cluster_id: str) -> Cluster:
+        """
+        The async version of get_cluster. The project must be bound to an AsyncContext.
+        Args:
+            cluster_id: the id of the cluster you want to get.
+
+        Returns:
+            The cluster instance.
+
+        Examples:
+            .. code-block:: python
+                import tidbcloudy
+                async with tidbcloudy.AsyncTiDBCloud(public_key="your_public_key", private_key="your_private_key") as api:
+                    project = await api.get_project(project_id)
+                    cluster = await project.get_cluster_async(cluster_id)
+
+        """
+        path = "projects/{}/clusters/{}".format(self.id, cluster_id)
+        resp = await self.context.call_get(server="v1beta", path=path)
+        return Cluster.from_object(self.context, resp)
+
+    @traced
+    async def list_clusters_async(
+        self, page: int = 1, page_size: int = 10, stream: bool = False, lazy: bool = False, compact: bool = False
+    ) -> Page[Cluster]:
+        """
+        The async version of list_clusters. The project must be bound to an AsyncContext.
+        Args:
+            page: the page number.
+            page_size: the page size of each page.
+            stream: whether to build the clusters while the response is being received, see AsyncStreamPage.
+            lazy: whether to decode the nested fields of each cluster on first access.
+            compact: whether to list compact read-only records instead of clusters, see Cluster.from_records.
+
+        Returns:
+            The page of the clusters in the project.
+
+        """
+        path = "projects/{}/clusters".format(self.id)
+        if stream:
+            items = await self.context.stream_get(server="v1beta", path=path, params=page_query(page, page_size))
+            decode = self._cluster_decoder(lazy, compact)
+            return AsyncStreamPage((decode(item) async for item in items), page, page_size, items)
+        resp = await self.context.call_get(server="v1beta", path=path, params=page_query(page, page_size))
+        return self._clusters_page(resp, page, page_size, lazy, compact)
+
+    def iter_clusters_async(
+        self,
+        page_size: int = 10,
+        deadline: Deadline = None,
+        prefetch: int = 0,
+        max_page_size: int = None,
+        lazy: bool = False,
+        compact: bool = False,
+    ) -> AsyncPaginator[Cluster]:
+        """
+        The async version of iter_clusters. The project must be bound to an AsyncContext.
+        Args:
+            page_size: the page size of each page.
+            deadline: the deadline of the iteration, which raises TiDBCloudDeadlineException once it is exceeded.
+            prefetch: the number of pages fetched in the background once the first page gives the total.
+            max_page_size: the largest page size the page size grows to, see Paginator.
+            lazy: whether to decode the nested fields of each cluster on first access.
+            compact: whether to iterate compact read-only records instead of clusters, see Cluster.from_records.
+
+        Returns:
+            The async iterator of the clusters.
+
+        Examples:
+            .. code-block:: python
+                import tidbcloudy
+                async with tidbcloudy.AsyncTiDBCloud(public_key="your_public_key", private_key="your_private_key") as api:
+                    project = await api.get_project(project_id)
+                    async for cluster in project.iter_clusters_async():
+                        print(cluster) # This is a Cluster instance.
+
+        """
+        return AsyncPaginator(
+            functools.partial(self.list_clusters_async, lazy=lazy, compact=compact),
+            page_size,
+            deadline=deadline,
+            prefetch=prefetch,
+            max_page_size=max_page_size,
+        )
+
+    @traced
+    async def create_restore_async(
+        self, *, name: str, backup_id: str, cluster_config: Union[CreateClusterConfig, dict]
+    ) -> Restore:
+        """
+        The async version of create_restore. The project must be bound to an AsyncContext.
+        """
+        path = "projects/{}/restores".format(self.id)
+        if isinstance(cluster_config, CreateClusterConfig):
+            cluster_config = cluster_config.to_object()
+        create_config = {"name": name, "backup_id": backup_id, "config": cluster_config["config"]}
+        try:
+            resp = await self.context.call_post(server="v1beta", path=path, json=create_config)
+        finally:
+            # The restore creates a cluster in the project
+            self.context.invalidate_cache(server="v1beta", path="projects/{}/clusters".format(self.id))
+        return Restore(context=self.context, id=resp["id"], cluster_id=resp["cluster_id"])
+
+    @traced
+    async def get_restore_async(self, restore_id: str) -> Restore:
+        """
+        The async version of get_restore. The project must be bound to an AsyncContext.
+        """
+        path = "projects/{}/restores/{}".format(self.id, restore_id)
+        resp = await self.context.call_get(server="v1beta", path=path)
+        return Restore.from_object(self.context, resp)
+
+    @traced
+    async def list_restores_async(self, *, page: int = None, page_size: int = None) -> Page[Restore]:
+        """
+        The async version of list_restores. The project must be bound to an AsyncContext.
+        """
+        path = "projects/{}/restores".format(self.id)
+        resp = await self.context.call_get(server="v1beta", path=path, params=page_query(page, page_size))
+        return self._restores_page(resp, page, page_size)
+
+    def iter_restores_async(
+        self, page_size: int = 10, deadline: Deadline = None, prefetch: int = 0, max_page_size: int = None
+    ) -> AsyncPaginator[Restore]:
+        """
+        The async version of iter_restores. The project must be bound to an AsyncContext.
+        """
+        return AsyncPaginator(
+            self.list_restores_async, page_size, deadline=deadline, prefetch=prefetch, max_page_size=max_page_size
+        )
+
+    @traced
+    async def create_aws_cmek_async(self, config: List[Tuple[str, str]]) -> None:
+        """
+        The async version of create_aws_cmek. The project must be bound to an AsyncContext.
+        """
+        payload = {"specs": [{"region": region, "kms_arn": kms_arn} for region, kms_arn in config]}
+        path = f"projects/{self.id}/aws-cmek"
+        await self.context.call_post(server="v1beta", path=path, json=payload)
+
+    @traced
+    async def list_aws_cmek_async(self) -> Page[ProjectAWSCMEK]:
+        """
+        The async version of list_aws_cmek. The project must be bound to an AsyncContext.
+        """
+        path = f"projects/{self.id}/aws-cmek"
+        resp = await self.context.call_get(server="v1beta", path=path)
+        total = len(resp["items"])
+        return Page(ProjectAWSCMEK.from_objects(self.context, resp["items"]), 1, total, total)
+
+    async def iter_aws_cmek_async(self) -> AsyncIterator[ProjectAWSCMEK]:
+        """
+        The async version of iter_aws_cmek. The project must be bound to an AsyncContext.
+        """
+        cmeks = await self.list_aws_cmek_async()
+        for cmek in cmeks.items:
+            yield cmek
+
     def __repr__(self):
         return "<Project id={} name={} aws_cmek_enabled={} create_at={}>".format(
             self.id, self.name, self.aws_cmek_enabled, timestamp_to_string(self.create_timestamp)
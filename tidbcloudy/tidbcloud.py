@@ -1,10 +1,15 @@
-from typing import Iterator, List
+import contextlib
+from typing import Dict, Iterable, List, Set
 
-from tidbcloudy.context import Context
+from tidbcloudy.context import AsyncContext, Context
 from tidbcloudy.project import Project
 from tidbcloudy.specification import BillingMonthSummary, CloudSpecification
-from tidbcloudy.util.page import Page
+from tidbcloudy.util.deadline import Deadline
+from tidbcloudy.util.index import TTLIndex
+from tidbcloudy.util.metrics import MetricsRegistry
+from tidbcloudy.util.page import AsyncPaginator, Page, Paginator, page_query
 from tidbcloudy.util.timestamp import get_current_year_month
+from tidbcloudy.util.tracing import traced
 
 SERVER_CONFIG_DEFAULT = {
     "v1beta": "https://api.tidbcloud.com/api/v1beta/",
@@ -12,12 +17,81 @@ SERVER_CONFIG_DEFAULT = {
 }
 
 
+def _ordered_projects(project_ids: List[str], found: Dict[str, Project], missing: Set[str]) -> List[Project]:
+    if missing:
+        raise ValueError("Project {} not found".format(", ".join(sorted(missing))))
+    return [found[project_id] for project_id in project_ids]
+
+
 class TiDBCloud:
-    def __init__(self, public_key: str, private_key: str, server_config: dict = None):
+    def __init__(
+        self, public_key: str, private_key: str, server_config: dict = None, project_index_ttl: float = 0, **kwargs
+    ):
+        """
+        Args:
+            public_key: your public key to access to TiDB Cloud
+            private_key: your private key to access to TiDB Cloud
+            server_config: the server configuration dict, use SERVER_CONFIG_DEFAULT if None
+            project_index_ttl: the seconds the listed projects are kept in the project index used by get_projects, 0
+                disables the index. The POST, PATCH and DELETE calls on a project drop it from the index
+            kwargs: the request options of the underlying Context, such as transport_profile, retry_policy and
+                rate_limiter
+
+        Examples:
+            .. code-block:: python
+                import tidbcloudy
+                api = tidbcloudy.TiDBCloud(
+                    public_key="your_public_key",
+                    private_key="your_private_key",
+                    transport_profile=tidbcloudy.TransportProfile(max_connections=20),
+                    retry_policy=tidbcloudy.RetryPolicy(max_retries=5),
+                    rate_limiter=tidbcloudy.RateLimiter.for_key("your_public_key", {"v1beta": 10}),
+                )
+        """
         if server_config is None:
             server_config = SERVER_CONFIG_DEFAULT
-        self._context = Context(public_key, private_key, server_config)
+        self._context = Context(public_key, private_key, server_config, **kwargs)
+        self._project_index: TTLIndex[str, dict] = TTLIndex(project_index_ttl)
+        self._context.add_invalidation_listener(self._invalidate_project_index)
 
+    @property
+    def metrics(self) -> MetricsRegistry:
+        """
+        The request metrics of the underlying context, see MetricsRegistry.
+        """
+        return self._context.metrics
+
+    def pool_stats(self) -> dict:
+        """
+        Get the connection pool statistics of the underlying context, see Context.pool_stats.
+        """
+        return self._context.pool_stats()
+
+    def retry_stats(self) -> dict:
+        """
+        Get the retry statistics of the underlying context, see Context.retry_stats.
+        """
+        return self._context.retry_stats()
+
+    def digest_stats(self) -> dict:
+        """
+        Get the digest challenge statistics of the underlying context, see Context.digest_stats.
+        """
+        return self._context.digest_stats()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """
+        Close the connections of the underlying context and its transport, for example, to finish a cassette file.
+        """
+        self._context.close()
+
+    @traced
     def create_project(self, name: str, aws_cmek_enabled: bool = False, update_from_server: bool = False) -> Project:
         """
         Create a project.
@@ -44,6 +118,7 @@ class TiDBCloud:
             return self.get_project(project_id=project_id, update_from_server=True)
         return Project(context=self._context, id=project_id)
 
+    @traced
     def get_project(self, project_id: str, update_from_server: bool = False) -> Project:
         """
         Get the project object by project_id.
@@ -61,14 +136,46 @@ class TiDBCloud:
                 api = tidbcloudy.TiDBCloud(public_key="your_public_key", private_key="your_private_key")
                 project = api.get_project("your_project_id", update_from_server=True)
         """
-        project = Project(context=self._context, id=project_id)
         if update_from_server:
-            for item in self.iter_projects():
-                if item.id == project_id:
-                    return item
-            raise ValueError("Project {} not found".format(project_id))
-        return project
+            return self._get_projects([project_id], use_index=False)[0]
+        return Project(context=self._context, id=project_id)
 
+    @traced
+    def get_projects(self, project_ids: Iterable[str]) -> List[Project]:
+        """
+        Get several projects with all the info. The projects listed within the project index TTL are built from the
+        index, see project_index_ttl, and the others are found by one scan of the projects, which stops once all of
+        them are found.
+        Args:
+            project_ids: the project ids.
+
+        Returns:
+            the projects, in the order of the ids.
+
+        Examples:
+            .. code-block:: python
+                import tidbcloudy
+                api = tidbcloudy.TiDBCloud(public_key="your_public_key", private_key="your_private_key")
+                for project in api.get_projects(["your_project_id_1", "your_project_id_2"]):
+                    print(project)
+        """
+        return self._get_projects(project_ids)
+
+    def _get_projects(self, project_ids: Iterable[str], use_index: bool = True) -> List[Project]:
+        project_ids = list(project_ids)
+        found = self._indexed_projects(project_ids) if use_index else {}
+        missing = set(project_ids) - set(found)
+        if missing:
+            with contextlib.closing(self.iter_projects()) as projects:
+                for project in projects:
+                    if project.id in missing:
+                        found[project.id] = project
+                        missing.discard(project.id)
+                        if not missing:
+                            break
+        return _ordered_projects(project_ids, found, missing)
+
+    @traced
     def list_projects(self, page: int = None, page_size: int = None) -> Page[Project]:
         """
         List all projects.
@@ -89,21 +196,32 @@ class TiDBCloud:
                     print(project) # This is a Project object
 
         """
-        query = {}
-        if page is not None:
-            query["page"] = page
-        if page_size is not None:
-            query["page_size"] = page_size
-        resp = self._context.call_get(server="v1beta", path="projects", params=query)
-        return Page(
-            [Project.from_object(self._context, item) for item in resp["items"]], page, page_size, resp["total"]
-        )
+        resp = self._context.call_get(server="v1beta", path="projects", params=page_query(page, page_size))
+        projects = Project.from_objects(self._context, resp["items"])
+        self._project_index.put_many((item["id"], item) for item in resp["items"])
+        return Page(projects, page, page_size, resp["total"])
+
+    def _indexed_projects(self, project_ids: List[str]) -> Dict[str, Project]:
+        # New projects each time, so a caller changing one does not change the others
+        found = self._project_index.get_many(project_ids)
+        return {project_id: Project.from_object(self._context, obj) for project_id, obj in found.items()}
 
-    def iter_projects(self, page_size: int = 10) -> Iterator[Project]:
+    def _invalidate_project_index(self, server: str, path: str):
+        parts = path.strip("/").split("/")
+        if parts[0] == "projects":
+            # A change of the projects collection itself, such as a new project, drops all the projects
+            self._project_index.invalidate(parts[1] if len(parts) > 1 else None)
+
+    def iter_projects(
+        self, page_size: int = 10, deadline: Deadline = None, prefetch: int = 0, max_page_size: int = None
+    ) -> Paginator[Project]:
         """
         Iterate all projects.
         Args:
             page_size: the page size of each page.
+            deadline: the deadline of the iteration, which raises TiDBCloudDeadlineException once it is exceeded.
+            prefetch: the number of pages fetched in the background once the first page gives the total.
+            max_page_size: the largest page size the page size grows to, see Paginator.
 
         Returns:
             the projects iterator.
@@ -116,15 +234,11 @@ class TiDBCloud:
                     print(project) # This is a Project object
 
         """
-        page = 1
-        total = None
-        while total is None or (page - 1) * page_size < total:
-            projects = self.list_projects(page=page, page_size=page_size)
-            total = projects.total
-            for project in projects.items:
-                yield project
-            page += 1
+        return Paginator(
+            self.list_projects, page_size, deadline=deadline, prefetch=prefetch, max_page_size=max_page_size
+        )
 
+    @traced
     def list_provider_regions(self) -> List[CloudSpecification]:
         """
         List all provider regions.
@@ -141,8 +255,9 @@ class TiDBCloud:
 
         """
         resp = self._context.call_get(server="v1beta", path="clusters/provider/regions")
-        return [CloudSpecification.from_object(obj=item) for item in resp["items"]]
+        return CloudSpecification.from_objects(items=resp["items"])
 
+    @traced
     def get_monthly_bill(self, month: str) -> BillingMonthSummary:
         """
         Get the monthly billing.
@@ -165,6 +280,7 @@ class TiDBCloud:
         resp = self._context.call_get(server="billing", path=path)
         return BillingMonthSummary.from_object(self._context, resp)
 
+    @traced
     def get_current_month_bill(self) -> BillingMonthSummary:
         """
         Get the billing of current month.
@@ -180,3 +296,170 @@ class TiDBCloud:
 
         """
         return self.get_monthly_bill(month=get_current_year_month())
+
+
+class AsyncTiDBCloud:
+    def __init__(
+        self, public_key: str, private_key: str, server_config: dict = None, project_index_ttl: float = 0, **kwargs
+    ):
+        """
+        The asyncio version of TiDBCloud. All methods are coroutines, and the returned objects are bound to an
+        AsyncContext, so use their *_async methods, for example, Project.list_clusters_async. The arguments are the
+        same as TiDBCloud.
+
+        Examples:
+            .. code-block:: python
+                import asyncio
+                import tidbcloudy
+
+                async def main():
+                    async with tidbcloudy.AsyncTiDBCloud(public_key="your_public_key", private_key="your_private_key") as api:
+                        async for project in api.iter_projects():
+                            async for cluster in project.iter_clusters_async():
+                                print(cluster)
+
+                asyncio.run(main())
+        """
+        if server_config is None:
+            server_config = SERVER_CONFIG_DEFAULT
+        self._context = AsyncContext(public_key, private_key, server_config, **kwargs)
+        self._project_index: TTLIndex[str, dict] = TTLIndex(project_index_ttl)
+        self._context.add_invalidation_listener(self._invalidate_project_index)
+
+    @property
+    def metrics(self) -> MetricsRegistry:
+        """
+        The request metrics of the underlying context, see MetricsRegistry.
+        """
+        return self._context.metrics
+
+    def pool_stats(self) -> dict:
+        """
+        Get the connection pool statistics of the underlying context, see Context.pool_stats.
+        """
+        return self._context.pool_stats()
+
+    def retry_stats(self) -> dict:
+        """
+        Get the retry statistics of the underlying context, see Context.retry_stats.
+        """
+        return self._context.retry_stats()
+
+    def digest_stats(self) -> dict:
+        """
+        Get the digest challenge statistics of the underlying context, see Context.digest_stats.
+        """
+        return self._context.digest_stats()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def aclose(self):
+        await self._context.aclose()
+
+    @traced
+    async def create_project(
+        self, name: str, aws_cmek_enabled: bool = False, update_from_server: bool = False
+    ) -> Project:
+        """
+        The async version of TiDBCloud.create_project.
+        """
+        config = {"name": name, "aws_cmek_enabled": aws_cmek_enabled}
+        resp = await self._context.call_post(server="v1beta", path="projects", json=config)
+        project_id = resp["id"]
+        if update_from_server:
+            return await self.get_project(project_id=project_id, update_from_server=True)
+        return Project(context=self._context, id=project_id)
+
+    @traced
+    async def get_project(self, project_id: str, update_from_server: bool = False) -> Project:
+        """
+        The async version of TiDBCloud.get_project.
+        """
+        if update_from_server:
+            return (await self._get_projects([project_id], use_index=False))[0]
+        return Project(context=self._context, id=project_id)
+
+    @traced
+    async def get_projects(self, project_ids: Iterable[str]) -> List[Project]:
+        """
+        The async version of TiDBCloud.get_projects.
+        """
+        return await self._get_projects(project_ids)
+
+    async def _get_projects(self, project_ids: Iterable[str], use_index: bool = True) -> List[Project]:
+        project_ids = list(project_ids)
+        found = self._indexed_projects(project_ids) if use_index else {}
+        missing = set(project_ids) - set(found)
+        if missing:
+            projects = self.iter_projects()
+            try:
+                async for project in projects:
+                    if project.id in missing:
+                        found[project.id] = project
+                        missing.discard(project.id)
+                        if not missing:
+                            break
+            finally:
+                await projects.aclose()
+        return _ordered_projects(project_ids, found, missing)
+
+    @traced
+    async def list_projects(self, page: int = None, page_size: int = None) -> Page[Project]:
+        """
+        The async version of TiDBCloud.list_projects.
+        """
+        resp = await self._context.call_get(server="v1beta", path="projects", params=page_query(page, page_size))
+        projects = Project.from_objects(self._context, resp["items"])
+        self._project_index.put_many((item["id"], item) for item in resp["items"])
+        return Page(projects, page, page_size, resp["total"])
+
+    def _indexed_projects(self, project_ids: List[str]) -> Dict[str, Project]:
+        # New projects each time, so a caller changing one does not change the others
+        found = self._project_index.get_many(project_ids)
+        return {project_id: Project.from_object(self._context, obj) for project_id, obj in found.items()}
+
+    def _invalidate_project_index(self, server: str, path: str):
+        parts = path.strip("/").split("/")
+        if parts[0] == "projects":
+            # A change of the projects collection itself, such as a new project, drops all the projects
+            self._project_index.invalidate(parts[1] if len(parts) > 1 else None)
+
+    def iter_projects(
+        self, page_size: int = 10, deadline: Deadline = None, prefetch: int = 0, max_page_size: int = None
+    ) -> AsyncPaginator[Project]:
+        """
+        The async version of TiDBCloud.iter_projects, use it with `async for`.
+        """
+        return AsyncPaginator(
+            self.list_projects, page_size, deadline=deadline, prefetch=prefetch, max_page_size=max_page_size
+        )
+
+    @traced
+    async def list_provider_regions(self) -> List[CloudSpecification]:
+        """
+        The async version of TiDBCloud.list_provider_regions.
+        """
+        resp = await self._context.call_get(server="v1beta", path="clusters/provider/regions")
+        return CloudSpecification.from_objects(items=resp["items"])
+
+    @traced
+    async def get_monthly_bill(self, month: str) -> BillingMonthSummary:
+        """
+        The async version of TiDBCloud.get_monthly_bill.
+        """
+        if "-" not in month and len(month) == 6:
+            month = f"{month[:4]}-{month[4:]}"
+        path = f"bills/{month}"
+        resp = await self._context.call_get(server="billing", path=path)
+        return BillingMonthSummary.from_object(self._context, resp)
+
+    @traced
+    async def get_current_month_bill(self) -> BillingMonthSummary:
+        """
+        The async version of TiDBCloud.get_current_month_bill.
+        """
+        return await self.get_monthly_bill(month=get_current_year_month())
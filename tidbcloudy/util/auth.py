@@ -0,0 +1,163 @@
+import threading
+import typing
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+
+class DigestChallengeStore:
+    def __init__(self):
+        """
+        A thread-safe store of the last digest challenge of each user and origin. Every DigestAuth sharing the store
+        signs its requests with the cached nonce, so only the first request of a process or a stale nonce pays for
+        the 401 challenge round trip.
+        """
+        self._lock = threading.Lock()
+        self._challenges: Dict[tuple, list] = {}
+        self._challenge_round_trips = 0
+        self._stale_round_trips = 0
+        self._preemptive = 0
+
+    def next(self, key: tuple) -> Optional[Tuple[typing.Any, int]]:
+        """
+        Reserve the next nonce count of the cached challenge.
+        Args:
+            key: the (username, scheme, host, port) key.
+
+        Returns:
+            the (challenge, nonce_count) tuple, or None if no challenge is cached.
+
+        """
+        with self._lock:
+            entry = self._challenges.get(key)
+            if entry is None:
+                return None
+            challenge, nonce_count = entry
+            entry[1] = nonce_count + 1
+            self._preemptive += 1
+            return challenge, nonce_count
+
+    def update(self, key: tuple, challenge: typing.Any, stale: bool) -> int:
+        """
+        Replace the cached challenge after a 401 response and reserve its first nonce count.
+        Args:
+            key: the (username, scheme, host, port) key.
+            challenge: the new challenge.
+            stale: whether the 401 rejected a request signed with a cached challenge.
+
+        Returns:
+            the nonce count to sign the retried request with.
+
+        """
+        with self._lock:
+            self._challenges[key] = [challenge, 2]
+            if stale:
+                self._stale_round_trips += 1
+            else:
+                self._challenge_round_trips += 1
+            return 1
+
+    def clear(self):
+        with self._lock:
+            self._challenges.clear()
+
+    def stats(self) -> dict:
+        """
+        Get the challenge statistics.
+
+        Returns:
+            a dict with the number of cold challenge round trips, of round trips caused by a stale nonce, and of
+            requests signed preemptively with a cached nonce.
+
+        """
+        with self._lock:
+            return {
+                "challenge_round_trips": self._challenge_round_trips,
+                "stale_round_trips": self._stale_round_trips,
+                "preemptive": self._preemptive,
+            }
+
+
+DEFAULT_DIGEST_CHALLENGE_STORE = DigestChallengeStore()
+
+
+class SharedDigestAuth(httpx.DigestAuth):
+    def __init__(
+        self,
+        username: typing.Union[str, bytes],
+        password: typing.Union[str, bytes],
+        store: DigestChallengeStore = None,
+    ):
+        """
+        A DigestAuth that keeps its challenges in a DigestChallengeStore, which is shared by all contexts of the
+        process by default, and reserves each nonce count atomically so concurrent threads never reuse one.
+        Args:
+            username: the username, which is the public key of TiDB Cloud.
+            password: the password, which is the private key of TiDB Cloud.
+            store: the challenge store, use DEFAULT_DIGEST_CHALLENGE_STORE if None.
+        """
+        super().__init__(username, password)
+        self._store = store if store is not None else DEFAULT_DIGEST_CHALLENGE_STORE
+
+    @property
+    def store(self) -> DigestChallengeStore:
+        return self._store
+
+    def auth_flow(self, request: httpx.Request) -> typing.Generator[httpx.Request, httpx.Response, None]:
+        key = (self._username, request.url.scheme, request.url.host, request.url.port)
+        cached = self._store.next(key)
+        if cached is not None:
+            request.headers["Authorization"] = self._sign(request, *cached)
+
+        response = yield request
+
+        if response.status_code != 401:
+            return
+        for auth_header in response.headers.get_list("www-authenticate"):
+            if auth_header.lower().startswith("digest "):
+                break
+        else:
+            return
+
+        challenge = self._parse_challenge(request, response, auth_header)
+        nonce_count = self._store.update(key, challenge, stale=cached is not None)
+        request.headers["Authorization"] = self._sign(request, challenge, nonce_count)
+        yield request
+
+    def _sign(self, request: httpx.Request, challenge: typing.Any, nonce_count: int) -> str:
+        # The same as httpx.DigestAuth._build_auth_header, except that the nonce count is passed in instead of being
+        #  read and incremented on the instance, which is not thread-safe
+        hash_func = self._ALGORITHM_TO_HASH_FUNCTION[challenge.algorithm.upper()]
+
+        def digest(data: bytes) -> bytes:
+            return hash_func(data).hexdigest().encode()
+
+        path = request.url.raw_path
+        ha1 = digest(b":".join((self._username, challenge.realm, self._password)))
+        ha2 = digest(b":".join((request.method.encode(), path)))
+        nc_value = b"%08x" % nonce_count
+        cnonce = self._get_client_nonce(nonce_count, challenge.nonce)
+        if challenge.algorithm.lower().endswith("-sess"):
+            ha1 = digest(b":".join((ha1, challenge.nonce, cnonce)))
+
+        qop = self._resolve_qop(challenge.qop, request=request)
+        if qop is None:
+            digest_data = [ha1, challenge.nonce, ha2]
+        else:
+            digest_data = [challenge.nonce, nc_value, cnonce, qop, ha2]
+
+        format_args = {
+            "username": self._username,
+            "realm": challenge.realm,
+            "nonce": challenge.nonce,
+            "uri": path,
+            "response": digest(b":".join((ha1, b":".join(digest_data)))),
+            "algorithm": challenge.algorithm.encode(),
+        }
+        if challenge.opaque:
+            format_args["opaque"] = challenge.opaque
+        if qop:
+            format_args["qop"] = b"auth"
+            format_args["nc"] = nc_value
+            format_args["cnonce"] = cnonce
+        return "Digest " + self._get_header_value(format_args)
@@ -0,0 +1,175 @@
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class _ServerState:
+    __slots__ = ["state", "outcomes", "opened_at", "probes", "opens", "rejected"]
+
+    def __init__(self, window_size: int):
+        self.state = CLOSED
+        self.outcomes = deque(maxlen=window_size)
+        self.opened_at = 0.0
+        self.probes = 0
+        self.opens = 0
+        self.rejected = 0
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        failure_rate_threshold: float = 0.5,
+        window_size: int = 20,
+        min_calls: int = 10,
+        open_seconds: float = 30.0,
+        half_open_probes: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        A circuit breaker with one circuit per server key of the server config. A circuit opens when the failure rate
+        of its last window_size requests reaches failure_rate_threshold, then rejects the requests for open_seconds.
+        After that, it lets half_open_probes requests through: a successful probe closes the circuit and a failed one
+        opens it again. The failures are the 5xx responses, the timeouts and the network errors, not the other 4xx
+        responses, which are caused by the request itself.
+        Args:
+            failure_rate_threshold: the failure rate opening the circuit.
+            window_size: the number of recent requests used for the failure rate.
+            min_calls: the number of requests needed before the failure rate is trusted.
+            open_seconds: how long an open circuit rejects requests before probing.
+            half_open_probes: the number of concurrent probe requests of a half-open circuit.
+            clock: the monotonic clock, mainly for tests.
+
+        Examples:
+            .. code-block:: python
+                import tidbcloudy
+                from tidbcloudy.util.breaker import CircuitBreaker
+                breaker = CircuitBreaker(failure_rate_threshold=0.5, open_seconds=60)
+                api = tidbcloudy.TiDBCloud(public_key="your_public_key", private_key="your_private_key",
+                                           circuit_breaker=breaker)
+                print(breaker.stats())
+        """
+        if not 0 < failure_rate_threshold <= 1:
+            raise ValueError("failure_rate_threshold must be between 0 and 1")
+        self.failure_rate_threshold = failure_rate_threshold
+        self.window_size = window_size
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._servers: Dict[str, _ServerState] = {}
+
+    def _get_locked(self, server: str) -> _ServerState:
+        state = self._servers.get(server)
+        if state is None:
+            state = self._servers[server] = _ServerState(self.window_size)
+        return state
+
+    def _open_locked(self, state: _ServerState):
+        state.state = OPEN
+        state.opened_at = self._clock()
+        state.outcomes.clear()
+        state.opens += 1
+
+    def acquire(self, server: str) -> Optional[float]:
+        """
+        Ask whether a request to the server can be sent.
+        Args:
+            server: the server key of the request.
+
+        Returns:
+            None if the request can be sent, otherwise the seconds before the circuit lets a probe through, which is 0
+            when the circuit is already probing.
+
+        """
+        with self._lock:
+            state = self._get_locked(server)
+            if state.state == OPEN:
+                elapsed = self._clock() - state.opened_at
+                if elapsed < self.open_seconds:
+                    state.rejected += 1
+                    return self.open_seconds - elapsed
+                state.state = HALF_OPEN
+                state.probes = 0
+            if state.state == HALF_OPEN:
+                if state.probes >= self.half_open_probes:
+                    # A probe never recorded, for example a cancelled one, must not keep the circuit half-open forever
+                    if self._clock() - state.opened_at < 2 * self.open_seconds:
+                        state.rejected += 1
+                        return 0.0
+                    state.opened_at = self._clock() - self.open_seconds
+                    state.probes = 0
+                state.probes += 1
+            return None
+
+    def record(self, server: str, failure: bool):
+        """
+        Record the outcome of a request allowed by acquire.
+        Args:
+            server: the server key of the request.
+            failure: whether the request failed with a 5xx, a timeout or a network error.
+        """
+        with self._lock:
+            state = self._get_locked(server)
+            if state.state == HALF_OPEN:
+                if failure:
+                    self._open_locked(state)
+                else:
+                    state.state = CLOSED
+                    state.outcomes.clear()
+            elif state.state == CLOSED:
+                state.outcomes.append(failure)
+                if (
+                    len(state.outcomes) >= self.min_calls
+                    and sum(state.outcomes) / len(state.outcomes) >= self.failure_rate_threshold
+                ):
+                    self._open_locked(state)
+
+    def state(self, server: str) -> str:
+        """
+        Get the state of the circuit of the server, one of "closed", "open" and "half_open".
+        """
+        with self._lock:
+            state = self._servers.get(server)
+            if state is None:
+                return CLOSED
+            if state.state == OPEN and self._clock() - state.opened_at >= self.open_seconds:
+                return HALF_OPEN
+            return state.state
+
+    def reset(self, server: str = None):
+        """
+        Close the circuit of the server, or of all servers if None.
+        """
+        with self._lock:
+            servers = [server] if server is not None else list(self._servers)
+            for key in servers:
+                self._servers.pop(key, None)
+
+    def stats(self) -> dict:
+        """
+        Get the circuit states.
+
+        Returns:
+            a dict with the state, the failure rate of the window, the number of times the circuit opened and the
+            number of rejected requests of each server.
+
+        """
+        with self._lock:
+            result = {}
+            for server, state in self._servers.items():
+                current = state.state
+                if current == OPEN and self._clock() - state.opened_at >= self.open_seconds:
+                    current = HALF_OPEN
+                result[server] = {
+                    "state": current,
+                    "failure_rate": sum(state.outcomes) / len(state.outcomes) if state.outcomes else 0.0,
+                    "opens": state.opens,
+                    "rejected": state.rejected,
+                }
+            return result
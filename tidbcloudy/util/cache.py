@@ -0,0 +1,142 @@
+import threading
+import time
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+from typing import Any, Callable, Dict, Tuple
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        ttls: Dict[str, float] = None,
+        default_ttl: float = 60.0,
+        max_size: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        A TTL and LRU cache of decoded GET responses. Cached responses are shared, so callers must not mutate them.
+        Args:
+            ttls: the TTL in seconds of each path pattern, for example {"projects/*/clusters/*": 10}. The patterns use
+                fnmatch syntax and the first matching pattern wins; a TTL of 0 disables caching for the pattern.
+            default_ttl: the TTL in seconds of the paths not matching any pattern.
+            max_size: the maximum number of cached responses, the least recently used ones are evicted first.
+            clock: the monotonic clock, mainly for tests.
+
+        Examples:
+            .. code-block:: python
+                import tidbcloudy
+                from tidbcloudy.util.cache import ResponseCache
+                cache = ResponseCache(ttls={"projects/*/clusters/*/backups*": 300, "bills/*": 0}, default_ttl=30)
+                api = tidbcloudy.TiDBCloud(public_key="your_public_key", private_key="your_private_key", cache=cache)
+        """
+        self._ttls = dict(ttls) if ttls is not None else {}
+        self.default_ttl = default_ttl
+        self.max_size = max_size
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[tuple, Tuple[float, Any]]" = OrderedDict()
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def get_ttl(self, path: str) -> float:
+        for pattern, ttl in self._ttls.items():
+            if fnmatchcase(path, pattern):
+                return ttl
+        return self.default_ttl
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, key: tuple) -> Tuple[bool, Any]:
+        """
+        Look up a response.
+        Args:
+            key: the request key built by tidbcloudy.util.singleflight.request_key.
+
+        Returns:
+            a (hit, response) tuple, the response is None on a miss or an expired entry.
+
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expire_at, value = entry
+                if expire_at > self._clock():
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return True, value
+                del self._entries[key]
+            self._misses += 1
+            return False, None
+
+    def set(self, key: tuple, value: Any, generation: int = None):
+        """
+        Store a response.
+        Args:
+            key: the request key built by tidbcloudy.util.singleflight.request_key.
+            value: the decoded response.
+            generation: the generation read before sending the request. The response is dropped if an invalidation
+                happened since then, because it may describe the resource before the mutation.
+        """
+        ttl = self.get_ttl(key[1])
+        if ttl <= 0:
+            return
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[key] = (self._clock() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, server: str, path: str):
+        """
+        Drop the responses of the resource at path, of its sub-resources and of its parent resources, for example, a
+        mutation of projects/1/clusters/2 drops projects/1/clusters/2/backups, projects/1/clusters and projects.
+        Args:
+            server: the server key of the mutation.
+            path: the path of the mutation.
+        """
+        path = path.strip("/")
+        with self._lock:
+            self._generation += 1
+            for key in list(self._entries):
+                cached_server, cached_path = key[0], key[1].strip("/")
+                if cached_server != server:
+                    continue
+                if _is_prefix(cached_path, path) or _is_prefix(path, cached_path):
+                    del self._entries[key]
+                    self._invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """
+        Get the cache statistics.
+
+        Returns:
+            a dict with the size, hits, misses, hit ratio, evictions and invalidated entries of the cache.
+
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations,
+            }
+
+
+def _is_prefix(prefix: str, path: str) -> bool:
+    return path == prefix or path.startswith(prefix + "/")
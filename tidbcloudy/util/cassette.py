@@ -0,0 +1,282 @@
+import base64
+import gzip
+import json
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Union
+
+import httpx
+
+from tidbcloudy.util.transport import TransportProfile
+
+# The response headers that do not describe the recorded body
+_SKIPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "date", "set-cookie", "www-authenticate"}
+
+
+def _open(path: str, mode: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def load_cassette(path: str) -> List[dict]:
+    """
+    Load the interactions of a cassette file, which has one JSON object per line and is gzipped if the path ends
+    with ".gz".
+    Args:
+        path: the path of the cassette file.
+
+    Returns:
+        the recorded interactions, in the order they were recorded.
+
+    """
+    with _open(path, "r") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _encode_body(content: bytes) -> dict:
+    if not content:
+        return {}
+    try:
+        return {"body": content.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"body_b64": base64.b64encode(content).decode("ascii")}
+
+
+def _decode_body(interaction: dict, prefix: str = "") -> bytes:
+    if prefix + "body_b64" in interaction:
+        return base64.b64decode(interaction[prefix + "body_b64"])
+    return interaction.get(prefix + "body", "").encode("utf-8")
+
+
+def _match_key(method: str, path: str, params: Dict[str, str], body: bytes) -> tuple:
+    # JSON bodies match regardless of the key order and the spacing of the codec that encoded them
+    try:
+        body_key = json.dumps(json.loads(body), sort_keys=True, separators=(",", ":")) if body else ""
+    except ValueError:
+        body_key = body
+    return method.upper(), path, tuple(sorted(params.items())), body_key
+
+
+def _request_key(request: httpx.Request) -> tuple:
+    return _match_key(request.method, request.url.path, dict(request.url.params.multi_items()), request.content)
+
+
+class _Recorder:
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._file = _open(path, "w")
+
+    def record(self, request: httpx.Request, status: int, headers: httpx.Headers, content: bytes, latency: float):
+        interaction = {
+            "method": request.method,
+            "path": request.url.path,
+            "params": dict(request.url.params.multi_items()),
+        }
+        interaction.update({"request_" + key: value for key, value in _encode_body(request.content).items()})
+        interaction["status"] = status
+        interaction["headers"] = {key: value for key, value in headers.items() if key.lower() not in _SKIPPED_HEADERS}
+        interaction.update(_encode_body(content))
+        interaction["latency"] = round(latency, 6)
+        line = json.dumps(interaction, separators=(",", ":"), ensure_ascii=False)
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+def _is_challenge(status: int, headers: httpx.Headers) -> bool:
+    # The digest handshake depends on the credentials and the nonce, so it is not replayable
+    return status == 401 and "www-authenticate" in headers
+
+
+class RecordingTransport(httpx.BaseTransport):
+    def __init__(self, path: str, transport: httpx.BaseTransport = None):
+        """
+        Send the requests through another transport and append each request and its response to a cassette file.
+        The response bodies are read completely before they are returned. The digest challenges are not recorded.
+        Args:
+            path: the path of the cassette file, which is overwritten and gzipped if the path ends with ".gz".
+            transport: the transport sending the requests, use a new httpx.HTTPTransport if None.
+        """
+        self._transport = transport if transport is not None else httpx.HTTPTransport()
+        self._recorder = _Recorder(path)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.monotonic()
+        response = self._transport.handle_request(request)
+        try:
+            raw = b"".join(response.iter_raw())
+        finally:
+            response.close()
+        latency = time.monotonic() - start
+        result = httpx.Response(
+            response.status_code, headers=response.headers, content=raw, extensions=response.extensions
+        )
+        if not _is_challenge(response.status_code, response.headers):
+            self._recorder.record(request, response.status_code, response.headers, result.read(), latency)
+        return result
+
+    def close(self):
+        self._transport.close()
+        self._recorder.close()
+
+
+class AsyncRecordingTransport(httpx.AsyncBaseTransport):
+    def __init__(self, path: str, transport: httpx.AsyncBaseTransport = None):
+        """
+        The asyncio version of RecordingTransport.
+        """
+        self._transport = transport if transport is not None else httpx.AsyncHTTPTransport()
+        self._recorder = _Recorder(path)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.monotonic()
+        response = await self._transport.handle_async_request(request)
+        try:
+            raw = b"".join([chunk async for chunk in response.aiter_raw()])
+        finally:
+            await response.aclose()
+        latency = time.monotonic() - start
+        result = httpx.Response(
+            response.status_code, headers=response.headers, content=raw, extensions=response.extensions
+        )
+        if not _is_challenge(response.status_code, response.headers):
+            self._recorder.record(request, response.status_code, response.headers, await result.aread(), latency)
+        return result
+
+    async def aclose(self):
+        await self._transport.aclose()
+        self._recorder.close()
+
+
+class _Replayer:
+    def __init__(self, cassette: Union[str, List[dict]], latency_scale: Optional[float]):
+        interactions = load_cassette(cassette) if isinstance(cassette, str) else cassette
+        self.latency_scale = latency_scale
+        self._lock = threading.Lock()
+        self._queues: Dict[tuple, deque] = {}
+        for interaction in interactions:
+            key = _match_key(
+                interaction["method"],
+                interaction["path"],
+                interaction.get("params", {}),
+                _decode_body(interaction, "request_"),
+            )
+            self._queues.setdefault(key, deque()).append(interaction)
+
+    def next(self, request: httpx.Request) -> dict:
+        # The interactions of a request are served in the recorded order, and the last one is repeated once exhausted
+        with self._lock:
+            queue = self._queues.get(_request_key(request))
+            if not queue:
+                raise LookupError("No recorded interaction for {} {}".format(request.method, request.url))
+            return queue.popleft() if len(queue) > 1 else queue[0]
+
+    def delay(self, interaction: dict) -> float:
+        if self.latency_scale is None:
+            return 0.0
+        return interaction.get("latency", 0.0) * self.latency_scale
+
+    @staticmethod
+    def build_response(interaction: dict) -> httpx.Response:
+        return httpx.Response(
+            interaction["status"], headers=interaction.get("headers", {}), content=_decode_body(interaction)
+        )
+
+
+class ReplayTransport(httpx.BaseTransport):
+    def __init__(self, cassette: Union[str, List[dict]], latency_scale: float = None):
+        """
+        Serve the requests from the interactions of a cassette, without any network. The requests match on the
+        method, the path, the query parameters and the body. The interactions of the same request are served in the
+        recorded order, so a polling loop sees the recorded state changes, and the last one is repeated once
+        exhausted. A request without any recorded interaction raises LookupError.
+        Args:
+            cassette: the path of the cassette file, or the interactions loaded by load_cassette.
+            latency_scale: the factor of the recorded latencies, for example, 1 to replay at the original latency and
+                0.1 ten times faster, respond immediately if None.
+
+        Examples:
+            .. code-block:: python
+                import tidbcloudy
+                from tidbcloudy.util.cassette import RecordingTransportProfile, ReplayTransportProfile
+                # Record once against the real API
+                api = tidbcloudy.TiDBCloud(public_key="your_public_key", private_key="your_private_key",
+                                           transport_profile=RecordingTransportProfile("clusters.jsonl.gz"))
+                clusters = list(api.get_project("your_project_id").iter_clusters())
+                api.close()
+                # Replay it offline at the recorded latency
+                api = tidbcloudy.TiDBCloud(public_key="", private_key="",
+                                           transport_profile=ReplayTransportProfile("clusters.jsonl.gz", 1.0))
+        """
+        self._replayer = _Replayer(cassette, latency_scale)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.read()
+        interaction = self._replayer.next(request)
+        delay = self._replayer.delay(interaction)
+        if delay > 0:
+            time.sleep(delay)
+        return self._replayer.build_response(interaction)
+
+
+class AsyncReplayTransport(httpx.AsyncBaseTransport):
+    def __init__(self, cassette: Union[str, List[dict]], latency_scale: float = None):
+        """
+        The asyncio version of ReplayTransport.
+        """
+        self._replayer = _Replayer(cassette, latency_scale)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        import asyncio
+
+        await request.aread()
+        interaction = self._replayer.next(request)
+        delay = self._replayer.delay(interaction)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return self._replayer.build_response(interaction)
+
+
+class RecordingTransportProfile(TransportProfile):
+    def __init__(self, path: str, **kwargs):
+        """
+        The connection pool settings of a Context recording its requests to a cassette file with RecordingTransport.
+        Args:
+            path: the path of the cassette file.
+            kwargs: the connection pool settings of TransportProfile.
+        """
+        super().__init__(**kwargs)
+        self.path = path
+
+    def create_transport(self) -> RecordingTransport:
+        return RecordingTransport(self.path, super().create_transport())
+
+    def create_async_transport(self) -> AsyncRecordingTransport:
+        return AsyncRecordingTransport(self.path, super().create_async_transport())
+
+
+class ReplayTransportProfile(TransportProfile):
+    def __init__(self, cassette: Union[str, List[dict]], latency_scale: float = None):
+        """
+        The transport settings of a Context serving its requests from a cassette with ReplayTransport.
+        Args:
+            cassette: the path of the cassette file, or the interactions loaded by load_cassette.
+            latency_scale: the factor of the recorded latencies, respond immediately if None.
+        """
+        super().__init__()
+        self.cassette = cassette
+        self.latency_scale = latency_scale
+
+    def create_transport(self) -> ReplayTransport:
+        return ReplayTransport(self.cassette, self.latency_scale)
+
+    def create_async_transport(self) -> AsyncReplayTransport:
+        return AsyncReplayTransport(self.cassette, self.latency_scale)
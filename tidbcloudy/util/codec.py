@@ -0,0 +1,95 @@
+import json
+from typing import Any, Callable, Dict
+
+
+class JSONCodec:
+    name = "json"
+
+    def loads(self, data: bytes) -> Any:
+        """
+        Decode a response body.
+        Args:
+            data: the raw bytes of the response body.
+
+        Returns:
+            the decoded object.
+
+        """
+        return json.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        """
+        Encode a request body.
+        Args:
+            obj: the object to encode.
+
+        Returns:
+            the UTF-8 encoded JSON bytes.
+
+        """
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class OrjsonCodec(JSONCodec):
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._loads = orjson.loads
+        self._dumps = orjson.dumps
+
+    def loads(self, data: bytes) -> Any:
+        return self._loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._dumps(obj)
+
+
+class MsgspecCodec(JSONCodec):
+    name = "msgspec"
+
+    def __init__(self):
+        import msgspec
+
+        self._decoder = msgspec.json.Decoder()
+        self._encoder = msgspec.json.Encoder()
+
+    def loads(self, data: bytes) -> Any:
+        return self._decoder.decode(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj)
+
+
+CODECS: Dict[str, Callable[[], JSONCodec]] = {
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+    "json": JSONCodec,
+}
+
+
+def get_codec(name: str = None) -> JSONCodec:
+    """
+    Get a JSON codec.
+    Args:
+        name: the codec name, one of "orjson", "msgspec" and "json". If None, use the first installed one in this order.
+
+    Returns:
+        the codec.
+
+    Examples:
+        .. code-block:: python
+            import tidbcloudy
+            from tidbcloudy.util.codec import get_codec
+            api = tidbcloudy.TiDBCloud(public_key="your_public_key", private_key="your_private_key", codec=get_codec("json"))
+    """
+    if name is not None:
+        if name not in CODECS:
+            raise ValueError("Unknown codec {}, should be one of {}".format(name, ", ".join(CODECS)))
+        return CODECS[name]()
+    for codec_class in CODECS.values():
+        try:
+            return codec_class()
+        except ImportError:
+            continue
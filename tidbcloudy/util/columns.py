@@ -0,0 +1,220 @@
+from array import array
+from enum import Enum
+from operator import attrgetter
+from typing import Any, Dict, Iterable, List, Tuple
+
+from tidbcloudy._base import TiDBCloudyBase, TiDBCloudyListField, TiDBCloudyRecord
+from tidbcloudy.util.page import Page
+
+NUMBER = "number"
+BOOL = "bool"
+STRING = "string"
+ENUM = "enum"
+OBJECT = "object"
+
+
+def _kind(descriptor) -> str:
+    if isinstance(descriptor, TiDBCloudyListField):
+        return OBJECT
+    value_type = descriptor.value_type
+    if issubclass(value_type, Enum):
+        return ENUM
+    if descriptor.convert_from is not None and descriptor.convert_from is not value_type:
+        # A custom conversion, for example, a timestamp string to an int, decides the type of the value
+        return NUMBER if descriptor.convert_from in (int, float) else OBJECT
+    if value_type is bool:
+        return BOOL
+    if value_type in (int, float):
+        return NUMBER
+    if value_type is str:
+        return STRING
+    return OBJECT
+
+
+def column_paths(model: type) -> Dict[str, str]:
+    """
+    Get the flattened column paths of a model, such as "config.components.tikv.node_quantity" for Cluster. The nested
+    objects are flattened into the paths of their fields, and the list fields are columns of their lists.
+    Args:
+        model: the TiDBCloudyBase subclass.
+
+    Returns:
+        the kind of each path, one of "number", "bool", "string", "enum" and "object".
+
+    """
+    paths = {}
+    for key, descriptor in model._keys.items():
+        if not isinstance(descriptor, TiDBCloudyListField) and descriptor.nested:
+            for path, kind in column_paths(descriptor.value_type).items():
+                paths["{}.{}".format(key, path)] = kind
+        else:
+            paths[key] = _kind(descriptor)
+    return paths
+
+
+def _model_of(obj: Any) -> type:
+    if isinstance(obj, TiDBCloudyRecord):
+        return obj._model
+    if isinstance(obj, TiDBCloudyBase):
+        return type(obj)
+    raise TypeError("Expect a TiDBCloudyBase object or record, got {}".format(type(obj).__name__))
+
+
+def _resolve(model: type, path: str) -> str:
+    # Check that the path follows the nested fields of the model, and return the kind of its column
+    descriptor = None
+    for key in path.split("."):
+        if descriptor is not None:
+            if isinstance(descriptor, TiDBCloudyListField) or not descriptor.nested:
+                raise ValueError("Column {} does not follow the nested fields of {}".format(path, model.__name__))
+            model = descriptor.value_type
+        if key not in model._keys:
+            raise ValueError("Unknown column {} of {}".format(path, model.__name__))
+        descriptor = model._keys[key]
+    if not isinstance(descriptor, TiDBCloudyListField) and descriptor.nested:
+        raise ValueError("Column {} is a nested object, select its fields instead".format(path))
+    return _kind(descriptor)
+
+
+class ColumnBuilder:
+    def __init__(self, columns: List[str] = None, use_numpy: bool = None):
+        """
+        Collect the objects or the compact records of SDK listings into columns, one per flattened field path, so
+        the analysis of a fleet runs on whole columns instead of the attributes of each object. The number columns
+        are NumPy arrays if NumPy is installed and use_numpy is not False, otherwise array.array, and a number column
+        with a missing value holds floats with NaN for it. The string and enum columns are lists sharing the equal
+        strings, with the values of the enums. The other columns are lists of the values.
+        Args:
+            columns: the column paths, see column_paths. Use all the paths of the model of the first object if None.
+            use_numpy: whether to build NumPy arrays, use NumPy if it is installed if None.
+
+        Examples:
+            .. code-block:: python
+                import pandas
+                import tidbcloudy
+                from tidbcloudy.util.columns import ColumnBuilder
+                api = tidbcloudy.TiDBCloud(public_key="your_public_key", private_key="your_private_key")
+                builder = ColumnBuilder(["id", "status.cluster_status", "config.components.tikv.node_quantity"])
+                for project in api.iter_projects():
+                    builder.extend(project.iter_clusters(compact=True))
+                df = pandas.DataFrame(builder.build())
+                print(df.groupby("status.cluster_status")["config.components.tikv.node_quantity"].sum())
+        """
+        self._requested = columns
+        self._use_numpy = use_numpy
+        self._model = None
+        self._columns: List[Tuple[str, str, attrgetter, list]] = []
+        self._strings: Dict[str, str] = {}
+        self._rows = 0
+
+    def __len__(self) -> int:
+        return self._rows
+
+    @property
+    def columns(self) -> List[str]:
+        return [path for path, _, _, _ in self._columns]
+
+    def _setup(self, model: type):
+        self._model = model
+        if self._requested is None:
+            kinds = column_paths(model)
+        else:
+            kinds = {path: _resolve(model, path) for path in self._requested}
+        self._columns = [(path, kind, attrgetter(path), []) for path, kind in kinds.items()]
+
+    def extend(self, items: Iterable) -> "ColumnBuilder":
+        """
+        Add the objects of a listing.
+        Args:
+            items: a Page, a list or an iterator of the objects or the records of the same model.
+
+        Returns:
+            the builder itself.
+
+        """
+        if isinstance(items, Page):
+            items = items.items
+        share = self._strings.setdefault
+        for obj in items:
+            if self._model is None:
+                self._setup(_model_of(obj))
+            elif _model_of(obj) is not self._model:
+                raise TypeError("Expect {}, got {}".format(self._model.__name__, _model_of(obj).__name__))
+            for _, kind, get, values in self._columns:
+                try:
+                    value = get(obj)
+                except AttributeError:
+                    # A nested object on the path is None
+                    value = None
+                if value is not None:
+                    if kind == ENUM:
+                        value = value.value
+                    if type(value) is str:
+                        value = share(value, value)
+                values.append(value)
+            self._rows += 1
+        return self
+
+    def build(self) -> Dict[str, Any]:
+        """
+        Build the columns of the objects added so far.
+
+        Returns:
+            the column of each path, in the order of the paths. The requested columns are empty lists if no object
+            was added.
+
+        """
+        if self._model is None:
+            return {path: [] for path in self._requested or []}
+        numpy = None
+        if self._use_numpy is not False:
+            try:
+                import numpy
+            except ImportError:
+                if self._use_numpy:
+                    raise
+        return {path: _build_column(kind, values, numpy) for path, kind, _, values in self._columns}
+
+
+def _build_column(kind: str, values: list, numpy) -> Any:
+    if kind not in (NUMBER, BOOL):
+        return list(values)
+    if any(value is None for value in values):
+        numbers = [float("nan") if value is None else value for value in values]
+        typecode = "d"
+    elif kind == BOOL:
+        numbers, typecode = values, "b"
+    elif all(type(value) is int for value in values):
+        numbers, typecode = values, "q"
+    else:
+        numbers, typecode = values, "d"
+    try:
+        if numpy is not None:
+            dtypes = {"d": numpy.float64, "b": numpy.bool_, "q": numpy.int64}
+            return numpy.array(numbers, dtype=dtypes[typecode])
+        return array(typecode, numbers)
+    except (TypeError, ValueError, OverflowError):
+        # For example, a number field with string values in the response
+        return list(values)
+
+
+def to_columns(items: Iterable, columns: List[str] = None, use_numpy: bool = None) -> Dict[str, Any]:
+    """
+    Build the columns of the objects or the records of a listing, see ColumnBuilder.
+    Args:
+        items: a Page, a list or an iterator of the objects or the records of the same model.
+        columns: the column paths, use all the paths of the model if None.
+        use_numpy: whether to build NumPy arrays, use NumPy if it is installed if None.
+
+    Returns:
+        the column of each path.
+
+    Examples:
+        .. code-block:: python
+            import tidbcloudy
+            from tidbcloudy.util.columns import to_columns
+            api = tidbcloudy.TiDBCloud(public_key="your_public_key", private_key="your_private_key")
+            columns = to_columns(api.get_project(project_id).iter_clusters(compact=True))
+            print(sum(columns["config.components.tikv.node_quantity"]))
+    """
+    return ColumnBuilder(columns, use_numpy).extend(items).build()
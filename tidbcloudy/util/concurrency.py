@@ -0,0 +1,187 @@
+import threading
+from collections import deque
+from typing import TYPE_CHECKING, Deque, Dict, Hashable, Optional
+
+if TYPE_CHECKING:
+    import asyncio
+
+
+def _wake(future: "asyncio.Future"):
+    if not future.done():
+        future.set_result(None)
+
+
+class AdaptiveConcurrencyLimiter:
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        additive_increase: float = 1.0,
+        multiplicative_decrease: float = 0.5,
+        latency_tolerance: float = 2.0,
+        error_rate_threshold: float = 0.1,
+        window_size: int = 100,
+        min_samples: int = 10,
+    ):
+        """
+        Limit the in-flight requests with AIMD (additive increase, multiplicative decrease). Each latency is compared
+        with the baseline of its endpoint, the lowest of its last window_size latencies, so a fast endpoint does not
+        make a slower one look overloaded and an old fast sample is forgotten. While the p95 of these ratios over the
+        recent requests stays within latency_tolerance and the error rate stays below error_rate_threshold, the limit
+        grows by additive_increase per full window of in-flight requests.
+        A 429, a 5xx, a timeout or a p95 latency spike multiplies the limit by multiplicative_decrease, at most once
+        per generation of requests, so a burst of failures of requests sent at the same time only cuts once.
+        Args:
+            initial_limit: the initial number of in-flight request slots.
+            min_limit: the lower bound of the slots.
+            max_limit: the upper bound of the slots.
+            additive_increase: the slots added after a full window of healthy requests.
+            multiplicative_decrease: the factor applied to the slots on overload.
+            latency_tolerance: the p95 ratio of the latencies to their endpoint baselines considered healthy.
+            error_rate_threshold: the ratio of overloaded requests in the window considered healthy.
+            window_size: the number of recent requests used for the p95 latency ratio and the error rate, and of the
+                recent latencies of each endpoint used for its baseline.
+            min_samples: the number of requests needed before the p95 latency is trusted.
+        """
+        if not 0 < multiplicative_decrease < 1:
+            raise ValueError("multiplicative_decrease must be between 0 and 1")
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("min_limit <= initial_limit <= max_limit is required")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.additive_increase = additive_increase
+        self.multiplicative_decrease = multiplicative_decrease
+        self.latency_tolerance = latency_tolerance
+        self.error_rate_threshold = error_rate_threshold
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._async_waiters = deque()
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._generation = 0
+        self._window_size = window_size
+        # The ratios of the recent latencies to the baselines of their endpoints
+        self._latencies = deque(maxlen=window_size)
+        self._overloads = deque(maxlen=window_size)
+        self._baselines: Dict[Hashable, Deque[float]] = {}
+        self._increases = 0
+        self._decreases = 0
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _try_acquire_locked(self) -> Optional[int]:
+        if self._in_flight < int(self._limit):
+            self._in_flight += 1
+            return self._generation
+        return None
+
+    def acquire(self) -> int:
+        """
+        Block until a request slot is free.
+
+        Returns:
+            the token to pass to release.
+
+        """
+        with self._cond:
+            while True:
+                token = self._try_acquire_locked()
+                if token is not None:
+                    return token
+                self._cond.wait()
+
+    async def acquire_async(self) -> int:
+        """
+        The asyncio version of acquire, it waits without blocking the event loop.
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                token = self._try_acquire_locked()
+                if token is not None:
+                    return token
+                future = loop.create_future()
+                self._async_waiters.append((loop, future))
+            await future
+
+    def release(self, token: int, latency: float, overloaded: bool, endpoint: Hashable = None):
+        """
+        Free the request slot and adjust the limit.
+        Args:
+            token: the token returned by acquire.
+            latency: the latency of the request in seconds.
+            overloaded: whether the request failed with a 429, a 5xx or a timeout.
+            endpoint: the endpoint of the request, such as its method, server and path template, whose latencies are
+                compared with each other.
+        """
+        with self._cond:
+            self._in_flight -= 1
+            self._adjust_locked(token, latency, overloaded, endpoint)
+            self._cond.notify_all()
+            waiters = list(self._async_waiters)
+            self._async_waiters.clear()
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_wake, future)
+
+    def _p95_locked(self) -> Optional[float]:
+        if len(self._latencies) < self.min_samples:
+            return None
+        latencies = sorted(self._latencies)
+        return latencies[int(0.95 * (len(latencies) - 1))]
+
+    def _adjust_locked(self, token: int, latency: float, overloaded: bool, endpoint: Hashable):
+        self._overloads.append(overloaded)
+        if not overloaded:
+            baseline = self._baselines.get(endpoint)
+            if baseline is None:
+                baseline = self._baselines[endpoint] = deque(maxlen=self._window_size)
+            baseline.append(latency)
+            lowest = min(baseline)
+            self._latencies.append(latency / lowest if lowest > 0 else 1.0)
+        p95 = self._p95_locked()
+        latency_spike = p95 is not None and p95 > self.latency_tolerance
+        if overloaded or latency_spike:
+            if token == self._generation:
+                self._limit = max(self.min_limit, self._limit * self.multiplicative_decrease)
+                self._generation += 1
+                self._decreases += 1
+                # The latencies of the old limit no longer describe the new one
+                self._latencies.clear()
+            return
+        error_rate = sum(self._overloads) / len(self._overloads)
+        # Only grow when the slots are actually used, otherwise the limit drifts up without any evidence
+        if error_rate <= self.error_rate_threshold and self._in_flight + 1 >= int(self._limit):
+            limit = min(self.max_limit, self._limit + self.additive_increase / self._limit)
+            if int(limit) > int(self._limit):
+                self._increases += 1
+            self._limit = limit
+
+    def stats(self) -> dict:
+        """
+        Get the limiter state.
+
+        Returns:
+            a dict with the current limit, the in-flight requests, the p95 ratio of the latencies of the window to their
+            endpoint baselines, the error rate of the window, and the number of times the limit was increased and
+            decreased.
+
+        """
+        with self._lock:
+            return {
+                "limit": int(self._limit),
+                "in_flight": self._in_flight,
+                "p95_latency_ratio": self._p95_locked(),
+                "error_rate": sum(self._overloads) / len(self._overloads) if self._overloads else 0.0,
+                "increases": self._increases,
+                "decreases": self._decreases,
+            }
@@ -0,0 +1,89 @@
+import contextlib
+import contextvars
+import time
+from typing import Callable, Iterator, Optional, Union
+
+_current_deadline: contextvars.ContextVar = contextvars.ContextVar("tidbcloudy_deadline", default=None)
+
+
+class Deadline:
+    def __init__(self, timeout: float, clock: Callable[[], float] = time.monotonic):
+        """
+        A point in time by which an operation must finish. The same deadline can be shared by several calls, which
+        then share the remaining budget.
+        Args:
+            timeout: the budget in seconds from now.
+            clock: the monotonic clock, mainly for tests.
+
+        Examples:
+            .. code-block:: python
+                import tidbcloudy
+                from tidbcloudy.exception import TiDBCloudDeadlineException
+                from tidbcloudy.util.deadline import Deadline, deadline_scope
+                api = tidbcloudy.TiDBCloud(public_key="your_public_key", private_key="your_private_key")
+                # Keep the clusters found in 30 seconds
+                clusters = []
+                try:
+                    with deadline_scope(Deadline(30)):
+                        for project in api.iter_projects():
+                            for cluster in project.iter_clusters():
+                                clusters.append(cluster)
+                except TiDBCloudDeadlineException:
+                    print("Found {} clusters before the deadline".format(len(clusters)))
+        """
+        self._clock = clock
+        self._expire_at = clock() + timeout
+
+    @property
+    def expire_at(self) -> float:
+        return self._expire_at
+
+    def remaining(self) -> float:
+        return max(0.0, self._expire_at - self._clock())
+
+    @property
+    def expired(self) -> bool:
+        return self._clock() >= self._expire_at
+
+    def __repr__(self):
+        return "<Deadline remaining={:.3f}>".format(self.remaining())
+
+
+def earliest(*deadlines: Optional[Deadline]) -> Optional[Deadline]:
+    """
+    Get the earliest of the deadlines, ignoring None, or None if all of them are None.
+    """
+    result = None
+    for deadline in deadlines:
+        if deadline is not None and (result is None or deadline.expire_at < result.expire_at):
+            result = deadline
+    return result
+
+
+def current_deadline() -> Optional[Deadline]:
+    """
+    Get the deadline of the enclosing deadline_scope, or None outside any scope.
+    """
+    return _current_deadline.get()
+
+
+@contextlib.contextmanager
+def deadline_scope(deadline: Union[Deadline, float, None]) -> Iterator[Optional[Deadline]]:
+    """
+    Bound all SDK calls in the enclosed block by a deadline. The HTTP timeouts, retries, iterators and waiters in the
+    block use the remaining budget, and a nested scope can only shorten the deadline.
+    Args:
+        deadline: the deadline, or a budget in seconds from now, no new bound if None.
+
+    Returns:
+        the effective deadline of the block.
+
+    """
+    if isinstance(deadline, (int, float)):
+        deadline = Deadline(deadline)
+    effective = earliest(_current_deadline.get(), deadline)
+    token = _current_deadline.set(effective)
+    try:
+        yield effective
+    finally:
+        _current_deadline.reset(token)
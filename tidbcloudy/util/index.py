@@ -0,0 +1,72 @@
+import threading
+import time
+from typing import Callable, Dict, Generic, Hashable, Iterable, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLIndex(Generic[K, V]):
+    def __init__(self, ttl: float = 60.0, clock: Callable[[], float] = time.monotonic):
+        """
+        A map of objects by id, filled by the list calls and kept for a TTL, so looking up an object does not need to
+        scan the listing again. The indexed objects are shared, so callers must not mutate them, TiDBCloud indexes the
+        listed dicts and builds new projects from them.
+        Args:
+            ttl: the seconds an object stays in the index after it was listed, 0 disables the index.
+            clock: the monotonic clock, mainly for tests.
+        """
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: Dict[K, Tuple[float, V]] = {}
+
+    def put_many(self, items: Iterable[Tuple[K, V]]):
+        """
+        Index the objects of a listing.
+        Args:
+            items: the (id, object) pairs.
+        """
+        if self.ttl <= 0:
+            return
+        expires = self._clock() + self.ttl
+        with self._lock:
+            for key, value in items:
+                self._entries[key] = (expires, value)
+
+    def get_many(self, keys: Iterable[K]) -> Dict[K, V]:
+        """
+        Look up objects, dropping the expired ones.
+        Args:
+            keys: the ids.
+
+        Returns:
+            the objects found, keyed by id.
+
+        """
+        now = self._clock()
+        found = {}
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                if entry[0] <= now:
+                    del self._entries[key]
+                    continue
+                found[key] = entry[1]
+        return found
+
+    def invalidate(self, key: K = None):
+        """
+        Drop an object, or all objects if None.
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
@@ -0,0 +1,28 @@
+import functools
+from typing import Callable
+
+
+def deprecated(details: str) -> Callable:
+    """
+    Mark a function as deprecated with the deprecation package, which is only imported when the function is first
+    called instead of when the module defining it is imported.
+    Args:
+        details: the extra details of the deprecation warning, for example, the replacement.
+    """
+
+    def decorator(fn: Callable) -> Callable:
+        wrapped = None
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            nonlocal wrapped
+            if wrapped is None:
+                import deprecation
+
+                wrapped = deprecation.deprecated(details=details)(fn)
+            return wrapped(*args, **kwargs)
+
+        wrapper.__doc__ = "Deprecated: {}\n{}".format(details, fn.__doc__ or "")
+        return wrapper
+
+    return decorator
@@ -0,0 +1,207 @@
+import bisect
+import os
+import re
+import tempfile
+import threading
+from typing import Dict, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_ID_SEGMENT = re.compile(r"[^/]*\d[^/]*")
+
+# (method, server, endpoint)
+Labels = Tuple[str, str, str]
+
+
+def endpoint_template(path: str) -> str:
+    """
+    Build the endpoint template of a path by replacing the id segments, which are the segments containing a digit.
+    Args:
+        path: the path of the request, for example, "projects/1/clusters/2".
+
+    Returns:
+        the endpoint template, for example, "projects/{id}/clusters/{id}".
+
+    """
+    return _ID_SEGMENT.sub("{id}", path.strip("/"))
+
+
+class _Histogram:
+    __slots__ = ["counts", "sum", "count"]
+
+    def __init__(self, buckets: int):
+        self.counts = [0] * buckets
+        self.sum = 0.0
+        self.count = 0
+
+
+class MetricsRegistry:
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS, namespace: str = "tidbcloudy"):
+        """
+        The request metrics of one or several contexts, labeled by method, server and endpoint template: the latency
+        histograms, the response status counts, the request and response bytes, the retries and the in-flight requests.
+        Args:
+            buckets: the upper bounds in seconds of the latency histogram buckets.
+            namespace: the prefix of the metric names in the Prometheus text format.
+
+        Examples:
+            .. code-block:: python
+                import tidbcloudy
+                metrics = tidbcloudy.MetricsRegistry()
+                api = tidbcloudy.TiDBCloud(public_key="your_public_key", private_key="your_private_key", metrics=metrics)
+                api.list_projects()
+                metrics.write_prometheus("/var/lib/node_exporter/tidbcloudy.prom")
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._latencies: Dict[Labels, _Histogram] = {}
+        self._statuses: Dict[Tuple[str, str, str, str], int] = {}
+        self._bytes_out: Dict[Labels, int] = {}
+        self._bytes_in: Dict[Labels, int] = {}
+        self._retries: Dict[Labels, int] = {}
+        self._in_flight: Dict[Labels, int] = {}
+
+    def start_request(self, labels: Labels):
+        with self._lock:
+            self._in_flight[labels] = self._in_flight.get(labels, 0) + 1
+
+    def end_request(self, labels: Labels, status: str, latency: float, bytes_out: int, bytes_in: int):
+        """
+        Record a finished request.
+        Args:
+            labels: the (method, server, endpoint) labels of the request.
+            status: the status code of the response, or "error" if no response was received.
+            latency: the latency of the request in seconds.
+            bytes_out: the size of the request body.
+            bytes_in: the size of the response body.
+        """
+        with self._lock:
+            self._in_flight[labels] -= 1
+            histogram = self._latencies.get(labels)
+            if histogram is None:
+                histogram = self._latencies[labels] = _Histogram(len(self.buckets))
+            index = bisect.bisect_left(self.buckets, latency)
+            if index < len(self.buckets):
+                histogram.counts[index] += 1
+            histogram.sum += latency
+            histogram.count += 1
+            status_labels = labels + (status,)
+            self._statuses[status_labels] = self._statuses.get(status_labels, 0) + 1
+            self._bytes_out[labels] = self._bytes_out.get(labels, 0) + bytes_out
+            self._bytes_in[labels] = self._bytes_in.get(labels, 0) + bytes_in
+
+    def record_retry(self, labels: Labels):
+        with self._lock:
+            self._retries[labels] = self._retries.get(labels, 0) + 1
+
+    def to_object(self) -> dict:
+        """
+        Get the metrics.
+
+        Returns:
+            a dict keyed by "METHOD server endpoint", with the request count, the latency sum and cumulative bucket
+            counts, the count of each status, the request and response bytes, the retries and the in-flight requests.
+
+        """
+        with self._lock:
+            result = {}
+            keys = set(self._latencies) | set(self._in_flight) | set(self._retries)
+            for labels in sorted(keys):
+                histogram = self._latencies.get(labels, _Histogram(len(self.buckets)))
+                result["{} {} {}".format(*labels)] = {
+                    "requests": histogram.count,
+                    "latency_sum": histogram.sum,
+                    "latency_buckets": dict(zip(self.buckets, _cumulate(histogram.counts))),
+                    "statuses": {
+                        status_labels[3]: count
+                        for status_labels, count in sorted(self._statuses.items())
+                        if status_labels[:3] == labels
+                    },
+                    "bytes_out": self._bytes_out.get(labels, 0),
+                    "bytes_in": self._bytes_in.get(labels, 0),
+                    "retries": self._retries.get(labels, 0),
+                    "in_flight": self._in_flight.get(labels, 0),
+                }
+            return result
+
+    def to_prometheus(self) -> str:
+        """
+        Export the metrics in the Prometheus text exposition format.
+
+        Returns:
+            the metrics text.
+
+        """
+        prefix = self.namespace
+        lines = []
+        with self._lock:
+            lines.append(f"# HELP {prefix}_request_duration_seconds The latency of the TiDB Cloud API requests.")
+            lines.append(f"# TYPE {prefix}_request_duration_seconds histogram")
+            for labels, histogram in sorted(self._latencies.items()):
+                label_text = _format_labels(labels)
+                for bound, count in zip(self.buckets, _cumulate(histogram.counts)):
+                    lines.append(f'{prefix}_request_duration_seconds_bucket{{{label_text},le="{bound}"}} {count}')
+                lines.append(f'{prefix}_request_duration_seconds_bucket{{{label_text},le="+Inf"}} {histogram.count}')
+                lines.append(f"{prefix}_request_duration_seconds_sum{{{label_text}}} {histogram.sum}")
+                lines.append(f"{prefix}_request_duration_seconds_count{{{label_text}}} {histogram.count}")
+            lines.append(f"# HELP {prefix}_responses_total The responses by status code, or error without a response.")
+            lines.append(f"# TYPE {prefix}_responses_total counter")
+            for status_labels, count in sorted(self._statuses.items()):
+                label_text = _format_labels(status_labels[:3]) + ',status="{}"'.format(status_labels[3])
+                lines.append(f"{prefix}_responses_total{{{label_text}}} {count}")
+            for name, help_text, kind, values in [
+                ("request_bytes_total", "The bytes of the request bodies.", "counter", self._bytes_out),
+                ("response_bytes_total", "The bytes of the response bodies.", "counter", self._bytes_in),
+                ("retries_total", "The retried requests.", "counter", self._retries),
+                ("in_flight_requests", "The requests waiting for a response.", "gauge", self._in_flight),
+            ]:
+                lines.append(f"# HELP {prefix}_{name} {help_text}")
+                lines.append(f"# TYPE {prefix}_{name} {kind}")
+                for labels, value in sorted(values.items()):
+                    lines.append(f"{prefix}_{name}{{{_format_labels(labels)}}} {value}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str):
+        """
+        Write the metrics in the Prometheus text exposition format to a file, replacing it atomically so a scraper
+        never reads a partial file.
+        Args:
+            path: the path of the file.
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tidbcloudy-", suffix=".prom")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(self.to_prometheus())
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def clear(self):
+        with self._lock:
+            self._latencies.clear()
+            self._statuses.clear()
+            self._bytes_out.clear()
+            self._bytes_in.clear()
+            self._retries.clear()
+            self._in_flight = {labels: count for labels, count in self._in_flight.items() if count}
+
+
+def _cumulate(counts: Sequence[int]) -> list:
+    result = []
+    total = 0
+    for count in counts:
+        total += count
+        result.append(total)
+    return result
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels) -> str:
+    method, server, endpoint = labels
+    return 'method="{}",server="{}",endpoint="{}"'.format(_escape(method), _escape(server), _escape(endpoint))
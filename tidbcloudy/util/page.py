@@ -1,7 +1,38 @@
-from typing import Generic, List, TypeVar
+import contextvars
+import functools
+import time
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, Dict, Generic, Iterator, List, Optional, Tuple, TypeVar
+
+from tidbcloudy.util.deadline import Deadline, current_deadline, deadline_scope, earliest
+from tidbcloudy.util.stream import AsyncItemStream, ItemStream
 
 T = TypeVar("T")
 
+# The response bytes of the page being fetched by a paginator
+_fetched_bytes: contextvars.ContextVar = contextvars.ContextVar("tidbcloudy_fetched_bytes", default=None)
+# The pages of a page size needed before its mean latency is used to grow the page size
+_MIN_PAGE_SAMPLES = 2
+
+
+def page_query(page: int = None, page_size: int = None) -> dict:
+    """
+    Build the query parameters of a paged list request, omitting the unset ones.
+    Args:
+        page: the page number.
+        page_size: the page size of each page.
+
+    Returns:
+        the query parameters dict.
+
+    """
+    query = {}
+    if page is not None:
+        query["page"] = page
+    if page_size is not None:
+        query["page_size"] = page_size
+    return query
+
 
 class Page(Generic[T]):
     def __init__(self, items: List[T], page: int, page_size: int, total: int):
@@ -25,3 +56,350 @@ class Page(Generic[T]):
     @property
     def total(self):
         return self._total
+
+
+class StreamPage(Page[T]):
+    def __init__(self, items: Iterator[T], page: int, page_size: int, stream: ItemStream):
+        """
+        A page whose items are decoded while the response body is being received, see Context.stream_get. The items
+        can only be iterated once, and reading total before the iteration ends may buffer the remaining items. The
+        response is closed once the items are consumed, use the page as a context manager or call close to close it
+        when the iteration stops early.
+
+        Examples:
+            .. code-block:: python
+                with project.list_clusters(page_size=100, stream=True) as page:
+                    for cluster in page.items:
+                        if cluster.name == "target":
+                            break
+        """
+        super().__init__(items, page, page_size, None)
+        self._stream = stream
+
+    @property
+    def total(self):
+        return self._stream.total
+
+    def close(self):
+        """
+        Close the response, the items not received yet are discarded.
+        """
+        self._stream.close()
+
+    def __enter__(self) -> "StreamPage[T]":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class AsyncStreamPage(Page[T]):
+    def __init__(self, items: AsyncIterator[T], page: int, page_size: int, stream: AsyncItemStream):
+        """
+        The asyncio version of StreamPage, iterate its items with `async for` and read its total with read_total. Use
+        the page with `async with` or call aclose to close the response when the iteration stops early.
+        """
+        super().__init__(items, page, page_size, None)
+        self._stream = stream
+
+    @property
+    def total(self):
+        return self._stream.fields.get("total")
+
+    async def read_total(self):
+        return await self._stream.read_total()
+
+    async def aclose(self):
+        """
+        The async version of StreamPage.close.
+        """
+        await self._stream.aclose()
+
+    async def __aenter__(self) -> "AsyncStreamPage[T]":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+
+def record_fetched_bytes(size: int):
+    """
+    Count the body size of a response received for the page being fetched by a paginator, if any.
+    """
+    counter = _fetched_bytes.get()
+    if counter is not None:
+        counter[0] += size
+
+
+class _BasePaginator(Generic[T]):
+    def __init__(
+        self,
+        list_page: Callable,
+        page_size: int = 10,
+        *,
+        deadline: Deadline = None,
+        prefetch: int = 0,
+        max_page_size: int = None,
+    ):
+        if page_size <= 0:
+            raise ValueError("page_size must be positive")
+        self._list_page = list_page
+        self._page_size = page_size
+        self._deadline = deadline
+        self._prefetch = max(prefetch, 0)
+        self._max_page_size = max_page_size
+        self._offset = 0
+        self._total = None
+        # page size -> [latency sum, page count]
+        self._latencies: Dict[int, List[float]] = {}
+        self._pages = 0
+        self._items = 0
+        self._bytes = 0
+
+    @property
+    def page_size(self) -> int:
+        """
+        The page size of the next page, which grows with max_page_size.
+        """
+        return self._page_size
+
+    @property
+    def total(self) -> Optional[int]:
+        return self._total
+
+    @property
+    def stats(self) -> dict:
+        """
+        Get the counters of the pages, items and response bytes fetched so far, and the current page size. The bytes
+        do not count the responses served by the cache.
+        """
+        return {"pages": self._pages, "items": self._items, "bytes": self._bytes, "page_size": self._page_size}
+
+    def _start(self):
+        # The deadline scope of the caller is read when the iteration starts, not when the paginator is created
+        self._deadline = earliest(current_deadline(), self._deadline)
+
+    def _plan(self) -> Optional[Tuple[int, int]]:
+        # Return the page number and size of the next page to fetch, or None if all pages are planned
+        if self._total is not None and self._offset >= self._total:
+            return None
+        size = self._next_size()
+        page = self._offset // size + 1
+        self._offset += size
+        return page, size
+
+    def _next_size(self) -> int:
+        size = self._page_size
+        if self._max_page_size is None or size >= self._max_page_size:
+            return size
+        # A page number only addresses the offset if the offset is a multiple of the page size
+        candidate = min(size * 2, self._max_page_size)
+        if self._offset % candidate == 0 and self._overhead_dominates(size):
+            self._page_size = candidate
+        return self._page_size
+
+    def _overhead_dominates(self, size: int) -> bool:
+        # Fit latency = overhead + per_item * size on the two largest page sizes with enough pages fetched so far. With
+        # only the current size measured, try the next size
+        if self._latencies.get(size, (0.0, 0))[1] < _MIN_PAGE_SAMPLES:
+            return False
+        means = sorted(
+            (page_size, total / count)
+            for page_size, (total, count) in self._latencies.items()
+            if count >= _MIN_PAGE_SAMPLES
+        )
+        if len(means) < 2:
+            return True
+        (size_1, latency_1), (size_2, latency_2) = means[-2:]
+        per_item = (latency_2 - latency_1) / (size_2 - size_1)
+        if per_item <= 0:
+            return True
+        return latency_2 - per_item * size_2 >= per_item * size
+
+    def _complete(self, size: int, result: Tuple[Page[T], float, int]) -> List[T]:
+        page, latency, size_bytes = result
+        items = list(page.items)
+        latencies = self._latencies.setdefault(size, [0.0, 0])
+        latencies[0] += latency
+        latencies[1] += 1
+        self._pages += 1
+        self._items += len(items)
+        self._bytes += size_bytes
+        if page.total is not None:
+            self._total = page.total
+        elif not items:
+            self._total = self._offset
+        return items
+
+
+class Paginator(_BasePaginator[T], Iterator[T]):
+    def __init__(
+        self,
+        list_page: Callable[..., Page[T]],
+        page_size: int = 10,
+        *,
+        deadline: Deadline = None,
+        prefetch: int = 0,
+        max_page_size: int = None,
+    ):
+        """
+        Iterate the items of all pages of a list method, in order.
+        Args:
+            list_page: the list method, called with the page and page_size keyword arguments.
+            page_size: the page size of the first page.
+            deadline: the deadline of the whole iteration. Once it is exceeded, the iteration raises
+                TiDBCloudDeadlineException, the items yielded before are the ones read so far.
+            prefetch: the number of pages fetched in the background once the first page gives the total, 1 reads the
+                next page while the caller processes the current one. The pages are fetched one after another if 0.
+            max_page_size: the largest page size, for example, the server maximum. The page size doubles toward it
+                while the fixed latency of a request dominates its per-item latency. The page size is fixed if None.
+
+        Examples:
+            .. code-block:: python
+                import tidbcloudy
+                api = tidbcloudy.TiDBCloud(public_key="your_public_key", private_key="your_private_key")
+                clusters = api.get_project(project_id).iter_clusters(prefetch=1, max_page_size=100)
+                for cluster in clusters:
+                    print(cluster)
+                print(clusters.stats)
+        """
+        super().__init__(list_page, page_size, deadline=deadline, prefetch=prefetch, max_page_size=max_page_size)
+        self._generator = self._generate()
+
+    def __iter__(self) -> "Paginator[T]":
+        return self
+
+    def __next__(self) -> T:
+        return next(self._generator)
+
+    def close(self):
+        """
+        Stop the iteration and cancel the pages not fetched yet.
+        """
+        self._generator.close()
+
+    def _fetch(self, page: int, size: int) -> Tuple[Page[T], float, int]:
+        counter = [0]
+        token = _fetched_bytes.set(counter)
+        start = time.monotonic()
+        try:
+            with deadline_scope(self._deadline):
+                result = self._list_page(page=page, page_size=size)
+        finally:
+            _fetched_bytes.reset(token)
+        return result, time.monotonic() - start, counter[0]
+
+    def _generate(self) -> Iterator[T]:
+        # Only loaded by the paginators that prefetch, importing it takes a few milliseconds
+        from concurrent.futures import ThreadPoolExecutor
+
+        self._start()
+        executor = None
+        futures = deque()
+
+        def submit():
+            nonlocal executor
+            while self._total is not None and len(futures) < self._prefetch:
+                planned = self._plan()
+                if planned is None:
+                    return
+                if executor is None:
+                    executor = ThreadPoolExecutor(max_workers=self._prefetch, thread_name_prefix="tidbcloudy-page")
+                # Run each fetch in a copy of the current context, so it keeps the tracing span
+                future = executor.submit(contextvars.copy_context().run, self._fetch, *planned)
+                futures.append((planned[1], future))
+
+        try:
+            while True:
+                if futures:
+                    size, future = futures.popleft()
+                    fetch = future.result
+                else:
+                    planned = self._plan()
+                    if planned is None:
+                        return
+                    size = planned[1]
+                    fetch = functools.partial(self._fetch, *planned)
+                result = fetch()
+                items = self._complete(size, result)
+                submit()
+                yield from items
+        finally:
+            for _, future in futures:
+                future.cancel()
+            if executor is not None:
+                executor.shutdown(wait=False)
+
+
+class AsyncPaginator(_BasePaginator[T], AsyncIterator[T]):
+    def __init__(
+        self,
+        list_page: Callable[..., Awaitable[Page[T]]],
+        page_size: int = 10,
+        *,
+        deadline: Deadline = None,
+        prefetch: int = 0,
+        max_page_size: int = None,
+    ):
+        """
+        The asyncio version of Paginator, list_page is a coroutine function and the pages fetched in the background
+        are tasks.
+        """
+        super().__init__(list_page, page_size, deadline=deadline, prefetch=prefetch, max_page_size=max_page_size)
+        self._generator = self._generate()
+
+    def __aiter__(self) -> "AsyncPaginator[T]":
+        return self
+
+    async def __anext__(self) -> T:
+        return await self._generator.__anext__()
+
+    async def aclose(self):
+        await self._generator.aclose()
+
+    async def _fetch(self, page: int, size: int) -> Tuple[Page[T], float, int]:
+        counter = [0]
+        token = _fetched_bytes.set(counter)
+        start = time.monotonic()
+        try:
+            with deadline_scope(self._deadline):
+                result = await self._list_page(page=page, page_size=size)
+        finally:
+            _fetched_bytes.reset(token)
+        return result, time.monotonic() - start, counter[0]
+
+    async def _generate(self) -> AsyncIterator[T]:
+        import asyncio
+
+        self._start()
+        tasks = deque()
+
+        def submit():
+            while self._total is not None and len(tasks) < self._prefetch:
+                planned = self._plan()
+                if planned is None:
+                    return
+                tasks.append((planned[1], asyncio.ensure_future(self._fetch(*planned))))
+
+        try:
+            while True:
+                if tasks:
+                    size, fetch = tasks.popleft()
+                else:
+                    planned = self._plan()
+                    if planned is None:
+                        return
+                    size = planned[1]
+                    fetch = self._fetch(*planned)
+                result = await fetch
+                items = self._complete(size, result)
+                submit()
+                for item in items:
+                    yield item
+        finally:
+            for _, task in tasks:
+                if task.done():
+                    # Retrieve the error of a page that is not read, so asyncio does not log it as never retrieved
+                    task.cancelled() or task.exception()
+                else:
+                    task.cancel()
@@ -0,0 +1,142 @@
+import threading
+import time
+from typing import Callable, Dict
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float = 1, clock: Callable[[], float] = time.monotonic):
+        """
+        A token bucket that lets callers reserve a token ahead of time. The bucket may go into debt, so concurrent
+        callers are queued and spaced 1/rate seconds apart instead of failing after a burst.
+        Args:
+            rate: the tokens added per second.
+            burst: the maximum tokens the bucket can hold.
+            clock: the monotonic clock, mainly for tests.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._tokens = burst
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Take one token.
+
+        Returns:
+            the seconds the caller must wait before using the token.
+
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def refund(self):
+        """
+        Give back a reserved token that was not used.
+        """
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + 1)
+
+
+class RateLimiter:
+    _shared: Dict[str, "RateLimiter"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, rates: Dict[str, float], burst: float = 1, clock: Callable[[], float] = time.monotonic):
+        """
+        A client-side rate limiter with one token bucket per server key of the server config.
+        Args:
+            rates: the requests per second of each server key, for example {"v1beta": 10, "billing": 1}.
+                Servers not in the dict are not limited.
+            burst: the requests that can be sent at once after an idle period.
+            clock: the monotonic clock, mainly for tests.
+
+        Examples:
+            .. code-block:: python
+                import tidbcloudy
+                from tidbcloudy.util.ratelimit import RateLimiter
+                limiter = RateLimiter.for_key("your_public_key", {"v1beta": 10, "billing": 1})
+                api = tidbcloudy.TiDBCloud(public_key="your_public_key", private_key="your_private_key",
+                                           rate_limiter=limiter)
+        """
+        self._buckets = {server: TokenBucket(rate, burst, clock) for server, rate in rates.items()}
+        self._lock = threading.Lock()
+        self._waits: Dict[str, int] = {}
+        self._wait_seconds: Dict[str, float] = {}
+
+    @classmethod
+    def for_key(cls, public_key: str, rates: Dict[str, float], burst: float = 1) -> "RateLimiter":
+        """
+        Get the rate limiter shared by all contexts of the same public key in this process. The rates and burst are
+        only used when the limiter of the key is created for the first time.
+        """
+        with cls._shared_lock:
+            limiter = cls._shared.get(public_key)
+            if limiter is None:
+                limiter = cls(rates, burst)
+                cls._shared[public_key] = limiter
+            return limiter
+
+    def reserve(self, server: str) -> float:
+        """
+        Reserve a request slot of the server.
+        Args:
+            server: the server key of the request.
+
+        Returns:
+            the seconds the caller must wait before sending the request.
+
+        """
+        bucket = self._buckets.get(server)
+        if bucket is None:
+            return 0.0
+        delay = bucket.reserve()
+        if delay > 0:
+            with self._lock:
+                self._waits[server] = self._waits.get(server, 0) + 1
+                self._wait_seconds[server] = self._wait_seconds.get(server, 0.0) + delay
+        return delay
+
+    def refund(self, server: str, delay: float):
+        """
+        Give back a request slot reserved with reserve when the request is not sent, for example, because its deadline
+        is exceeded before the slot.
+        Args:
+            server: the server key of the request.
+            delay: the delay returned by reserve.
+        """
+        bucket = self._buckets.get(server)
+        if bucket is None:
+            return
+        bucket.refund()
+        if delay > 0:
+            with self._lock:
+                self._waits[server] -= 1
+                self._wait_seconds[server] -= delay
+
+    def stats(self) -> dict:
+        """
+        Get the throttling statistics.
+
+        Returns:
+            a dict with the rate, the number of delayed requests and the total delay in seconds of each server.
+
+        """
+        with self._lock:
+            return {
+                server: {
+                    "rate": bucket.rate,
+                    "waits": self._waits.get(server, 0),
+                    "wait_seconds": self._wait_seconds.get(server, 0.0),
+                }
+                for server, bucket in self._buckets.items()
+            }
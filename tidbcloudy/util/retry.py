@@ -0,0 +1,134 @@
+import random
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterable, Optional, Union
+
+import httpx
+
+# The request was never sent to the server, so it is safe to retry any method
+_NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class RetryPolicy:
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        retry_methods: Iterable[str] = ("GET",),
+        retry_statuses: Iterable[int] = (429, 500, 502, 503, 504),
+        respect_retry_after: bool = True,
+        rng: random.Random = None,
+    ):
+        """
+        Decide whether and when a failed request is retried.
+        Args:
+            max_retries: the maximum number of retries of one call, 0 disables retrying.
+            backoff_base: the backoff of the first retry in seconds, doubled on each retry.
+            backoff_max: the cap of the backoff and of the Retry-After header in seconds.
+            retry_methods: the idempotent methods retried by default, other methods need retry=True on the call.
+            retry_statuses: the response status codes treated as transient.
+            respect_retry_after: whether to wait for the Retry-After header of a 429 or 503 response.
+            rng: the random generator of the jitter, mainly for tests.
+        """
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_methods = frozenset(method.upper() for method in retry_methods)
+        self.retry_statuses = frozenset(retry_statuses)
+        self.respect_retry_after = respect_retry_after
+        self._rng = rng if rng is not None else random.Random()
+
+    def is_retryable(self, method: str, exc: Exception, retry: bool = None) -> bool:
+        """
+        Classify the error of a request.
+        Args:
+            method: the HTTP method of the request.
+            exc: the httpx.RequestError or httpx.HTTPStatusError raised by the request.
+            retry: True to retry a non-idempotent method, False to never retry, None to decide by retry_methods.
+
+        Returns:
+            whether the request can be retried.
+
+        """
+        if retry is False:
+            return False
+        idempotent = retry is True or method.upper() in self.retry_methods
+        if isinstance(exc, httpx.HTTPStatusError):
+            return idempotent and exc.response.status_code in self.retry_statuses
+        if isinstance(exc, _NOT_SENT_ERRORS):
+            return True
+        return idempotent and isinstance(exc, (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError))
+
+    def get_delay(self, attempt: int, exc: Exception = None) -> float:
+        """
+        Get the seconds to wait before the retry.
+        Args:
+            attempt: the number of retries already made, starting from 0.
+            exc: the error of the last request, used to read the Retry-After header.
+
+        Returns:
+            the Retry-After value if present, otherwise a full-jitter exponential backoff.
+
+        """
+        if self.respect_retry_after and isinstance(exc, httpx.HTTPStatusError):
+            retry_after = parse_retry_after(exc.response.headers.get("Retry-After"))
+            if retry_after is not None:
+                return min(retry_after, self.backoff_max)
+        backoff = min(self.backoff_max, self.backoff_base * (2**attempt))
+        return self._rng.uniform(0, backoff)
+
+    def __repr__(self):
+        return "<RetryPolicy max_retries={} backoff_base={} backoff_max={} retry_methods={}>".format(
+            self.max_retries, self.backoff_base, self.backoff_max, sorted(self.retry_methods)
+        )
+
+
+def parse_retry_after(value: Union[str, None]) -> Optional[float]:
+    """
+    Parse the Retry-After header.
+    Args:
+        value: the header value, either delay-seconds or an HTTP-date.
+
+    Returns:
+        the seconds to wait, or None if the value is missing or invalid.
+
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(tz=timezone.utc)).total_seconds())
+
+
+class RetryStats:
+    def __init__(self):
+        """
+        Count the retries and the calls that failed after retrying, per server.
+        """
+        self._lock = threading.Lock()
+        self._retries: Dict[str, int] = {}
+        self._exhausted: Dict[str, int] = {}
+
+    def record_retry(self, server: str):
+        with self._lock:
+            self._retries[server] = self._retries.get(server, 0) + 1
+
+    def record_exhausted(self, server: str):
+        with self._lock:
+            self._exhausted[server] = self._exhausted.get(server, 0) + 1
+
+    def to_object(self) -> dict:
+        with self._lock:
+            return {
+                server: {"retries": self._retries.get(server, 0), "exhausted": self._exhausted.get(server, 0)}
+                for server in set(self._retries) | set(self._exhausted)
+            }
@@ -0,0 +1,132 @@
+import functools
+import threading
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Hashable, Optional
+
+if TYPE_CHECKING:
+    import asyncio
+
+
+def request_key(server: str, path: str, params: Optional[dict] = None) -> tuple:
+    """
+    Build the key identifying a GET request.
+    Args:
+        server: the server key of the request.
+        path: the path of the request.
+        params: the query parameters of the request.
+
+    Returns:
+        a hashable key, the same for requests with the same server, path and params in any order.
+
+    """
+    if not params:
+        return server, path, ()
+    return server, path, tuple(sorted((str(key), str(value)) for key, value in params.items()))
+
+
+class _Call:
+    __slots__ = ["event", "result", "error"]
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class _AsyncCall:
+    __slots__ = ["task", "waiters"]
+
+    def __init__(self, task: "asyncio.Future"):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self):
+        """
+        Coalesce identical concurrent calls: the first caller of a key runs the call, and the callers arriving while it
+        is in flight wait for it and share its result or exception. The result object is shared, so callers must not
+        mutate it.
+        """
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._tasks: Dict[Hashable, _AsyncCall] = {}
+        self._leaders = 0
+        self._shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn, or wait for the in-flight call of the same key in another thread.
+        Args:
+            key: the key of the call.
+            fn: the call to run.
+
+        Returns:
+            the result of fn.
+
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self._leaders += 1
+            else:
+                self._shared += 1
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.result
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        The asyncio version of do, fn is a coroutine function and the callers share one event loop. The call runs in
+        its own task, so a cancelled caller, the first one included, only stops waiting for it. The task is cancelled
+        once no caller waits for it.
+        """
+        import asyncio
+
+        call = self._tasks.get(key)
+        if call is None:
+            call = _AsyncCall(asyncio.ensure_future(fn()))
+            self._tasks[key] = call
+            call.task.add_done_callback(functools.partial(self._finish_async, key, call))
+            self._leaders += 1
+        else:
+            self._shared += 1
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                call.task.cancel()
+
+    def _finish_async(self, key: Hashable, call: "_AsyncCall", task: "asyncio.Future"):
+        if self._tasks.get(key) is call:
+            del self._tasks[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved in case no caller is waiting
+            task.exception()
+
+    def stats(self) -> dict:
+        """
+        Get the coalescing statistics.
+
+        Returns:
+            a dict with the number of calls actually run and of calls that shared an in-flight result.
+
+        """
+        with self._lock:
+            return {"leaders": self._leaders, "shared": self._shared}
@@ -0,0 +1,257 @@
+import codecs
+import json
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Iterator, List, Optional, Tuple
+
+_WHITESPACE = " \t\r\n"
+_SEPARATORS = ",]}"
+# The characters a number decoded at the end of a chunk may continue with
+_NUMBER_CONTINUATION = "0123456789.eE+-"
+
+_START, _KEY, _ITEMS, _DONE = range(4)
+# What the parser expects next in the object or the array: the first member, a comma or the end, or a member
+_FIRST, _COMMA, _NEXT = range(3)
+
+
+class ItemsParser:
+    def __init__(self, items_key: str = "items"):
+        """
+        An incremental parser of a JSON object whose items_key field is a large array. The response bytes are fed in
+        chunks, each array element is decoded as soon as it is complete, and the other top-level fields, such as total,
+        are decoded into fields. Only the text of the element being received is buffered.
+        Args:
+            items_key: the key of the array to stream.
+        """
+        self._items_key = items_key
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._state = _START
+        self._expect = _FIRST
+        self.fields = {}
+
+    def feed(self, data: bytes) -> List[Any]:
+        """
+        Feed a chunk of the response body.
+        Args:
+            data: the next chunk.
+
+        Returns:
+            the elements completed by the chunk.
+
+        """
+        self._buffer += self._text_decoder.decode(data)
+        return self._parse(eof=False)
+
+    def close(self) -> List[Any]:
+        """
+        Finish parsing at the end of the response body.
+
+        Returns:
+            the last elements.
+
+        """
+        self._buffer += self._text_decoder.decode(b"", final=True)
+        items = self._parse(eof=True)
+        if self._state != _DONE or self._buffer.strip(_WHITESPACE):
+            raise ValueError("Incomplete or invalid JSON document")
+        return items
+
+    def _skip(self, pos: int) -> int:
+        buffer = self._buffer
+        while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+            pos += 1
+        return pos
+
+    def _decode(self, pos: int, eof: bool) -> Tuple[Any, Optional[int]]:
+        # Return the value starting at pos and its end, or an end of None if the value is not complete yet
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise ValueError("Invalid JSON value at character {}".format(pos))
+            return None, None
+        if isinstance(value, (dict, list, str)):
+            return value, end
+        # A number or a literal is only complete once a separator follows it, for example, "1." decodes as 1 but may
+        # continue as "1.5" in the next chunk
+        next_pos = self._skip(end)
+        if next_pos < len(self._buffer) and self._buffer[next_pos] in _SEPARATORS:
+            return value, end
+        if eof:
+            if next_pos < len(self._buffer):
+                raise ValueError("Invalid JSON value at character {}".format(pos))
+            return value, end
+        if next_pos == len(self._buffer) or all(char in _NUMBER_CONTINUATION for char in self._buffer[end:]):
+            return None, None
+        raise ValueError("Invalid JSON value at character {}".format(pos))
+
+    def _parse(self, eof: bool) -> List[Any]:
+        items = []
+        pos = 0
+        buffer = self._buffer
+        while self._state != _DONE:
+            start = self._skip(pos)
+            if start >= len(buffer):
+                break
+            if self._state == _START:
+                if buffer[start] != "{":
+                    raise ValueError("The JSON document is not an object")
+                self._state = _KEY
+                self._expect = _FIRST
+                pos = start + 1
+                continue
+            # The members of the object and the elements of the array are separated by exactly one comma
+            close = "}" if self._state == _KEY else "]"
+            if self._expect == _COMMA:
+                if buffer[start] == ",":
+                    self._expect = _NEXT
+                    pos = start + 1
+                    continue
+                if buffer[start] != close:
+                    raise ValueError("Expect , or {} at character {}".format(close, start))
+            if buffer[start] == close:
+                if self._expect == _NEXT:
+                    raise ValueError("Unexpected {} after a comma at character {}".format(close, start))
+                # The items array is a member of the object, so a comma or the end of the object follows it
+                self._state = _DONE if self._state == _KEY else _KEY
+                self._expect = _COMMA
+                pos = start + 1
+            elif self._state == _KEY:
+                key, end = self._decode(start, eof)
+                if end is None:
+                    break
+                value_pos = self._skip(end)
+                if value_pos >= len(buffer):
+                    break
+                if buffer[value_pos] != ":":
+                    raise ValueError("Invalid JSON object at character {}".format(value_pos))
+                value_pos = self._skip(value_pos + 1)
+                if value_pos >= len(buffer):
+                    break
+                if key == self._items_key and buffer[value_pos] == "[":
+                    self._state = _ITEMS
+                    self._expect = _FIRST
+                    pos = value_pos + 1
+                    continue
+                value, end = self._decode(value_pos, eof)
+                if end is None:
+                    break
+                self.fields[key] = value
+                self._expect = _COMMA
+                pos = end
+            else:
+                item, end = self._decode(start, eof)
+                if end is None:
+                    break
+                items.append(item)
+                self._expect = _COMMA
+                pos = end
+        self._buffer = buffer[pos:]
+        return items
+
+
+class ItemStream:
+    def __init__(self, chunks: Iterator[bytes], close: Callable[[], None] = None):
+        """
+        The items of a list response, decoded while the response body is being received.
+        Args:
+            chunks: the chunks of the response body.
+            close: the callback closing the response once the body is consumed.
+        """
+        self._chunks = chunks
+        self._parser = ItemsParser()
+        self._pending = deque()
+        self._close = close
+        self._finished = False
+
+    @property
+    def fields(self) -> dict:
+        """
+        The top-level fields other than items received so far.
+        """
+        return self._parser.fields
+
+    @property
+    def total(self) -> Optional[int]:
+        """
+        The total field of the response. If the server sends it after the items, reading it before the iteration ends
+        reads and buffers the remaining items.
+        """
+        while "total" not in self._parser.fields and not self._finished:
+            self._pending.extend(self._read())
+        return self._parser.fields.get("total")
+
+    def _read(self) -> List[Any]:
+        try:
+            chunk = next(self._chunks)
+        except StopIteration:
+            self._finished = True
+            self.close()
+            return self._parser.close()
+        except BaseException:
+            self.close()
+            raise
+        return self._parser.feed(chunk)
+
+    def __iter__(self) -> Iterator[Any]:
+        while True:
+            while self._pending:
+                yield self._pending.popleft()
+            if self._finished:
+                return
+            self._pending.extend(self._read())
+
+    def close(self):
+        if self._close is not None:
+            self._close()
+            self._close = None
+
+
+class AsyncItemStream:
+    def __init__(self, chunks: AsyncIterator[bytes], aclose: Callable = None):
+        """
+        The asyncio version of ItemStream, iterate it with `async for`. The total field is read with read_total.
+        """
+        self._chunks = chunks
+        self._parser = ItemsParser()
+        self._pending = deque()
+        self._aclose = aclose
+        self._finished = False
+
+    @property
+    def fields(self) -> dict:
+        return self._parser.fields
+
+    async def read_total(self) -> Optional[int]:
+        """
+        The async version of ItemStream.total.
+        """
+        while "total" not in self._parser.fields and not self._finished:
+            self._pending.extend(await self._read())
+        return self._parser.fields.get("total")
+
+    async def _read(self) -> List[Any]:
+        try:
+            chunk = await self._chunks.__anext__()
+        except StopAsyncIteration:
+            self._finished = True
+            await self.aclose()
+            return self._parser.close()
+        except BaseException:
+            await self.aclose()
+            raise
+        return self._parser.feed(chunk)
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        while True:
+            while self._pending:
+                yield self._pending.popleft()
+            if self._finished:
+                return
+            self._pending.extend(await self._read())
+
+    async def aclose(self):
+        if self._aclose is not None:
+            await self._aclose()
+            self._aclose = None
@@ -0,0 +1,196 @@
+import abc
+import contextlib
+import contextvars
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("tidbcloudy_current_span", default=None)
+
+
+class Span:
+    __slots__ = ["name", "trace_id", "span_id", "parent_id", "start_time", "end_time", "attributes", "error", "_start"]
+
+    def __init__(self, name: str, parent: "Span" = None, attributes: Dict[str, Any] = None):
+        """
+        A timed operation, which is either an SDK method or an HTTP request of it.
+        Args:
+            name: the name of the operation.
+            parent: the enclosing span, the span starts a new trace if None.
+            attributes: the attributes of the operation.
+        """
+        self.name = name
+        self.trace_id = parent.trace_id if parent is not None else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent is not None else None
+        self.start_time = time.time()
+        self.end_time = None
+        self.attributes = dict(attributes) if attributes else {}
+        self.error = None
+        self._start = time.perf_counter()
+
+    @property
+    def duration(self) -> Optional[float]:
+        if self.end_time is None:
+            return None
+        return self.end_time - self.start_time
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def end(self, error: BaseException = None):
+        if error is not None:
+            self.error = "{}: {}".format(type(error).__name__, error)
+        self.end_time = self.start_time + (time.perf_counter() - self._start)
+
+    def to_object(self) -> dict:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "duration": self.duration,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+    def __repr__(self):
+        return "<Span name={} duration={} error={}>".format(self.name, self.duration, self.error)
+
+
+class SpanExporter(abc.ABC):
+    @abc.abstractmethod
+    def export(self, span: Span):
+        """
+        Export a finished span. It is called in the thread that ran the operation, so it should be fast and
+        thread-safe.
+        Args:
+            span: the finished span.
+        """
+
+
+class InMemorySpanExporter(SpanExporter):
+    def __init__(self, max_spans: int = None):
+        """
+        Keep the finished spans in memory, to inspect them or dump them as JSON.
+        Args:
+            max_spans: the maximum number of spans kept, the oldest ones are dropped first, no limit if None.
+        """
+        self.max_spans = max_spans
+        self._lock = threading.Lock()
+        self._spans: List[Span] = []
+
+    def export(self, span: Span):
+        with self._lock:
+            self._spans.append(span)
+            if self.max_spans is not None and len(self._spans) > self.max_spans:
+                del self._spans[: len(self._spans) - self.max_spans]
+
+    @property
+    def spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self):
+        with self._lock:
+            self._spans.clear()
+
+    def to_json(self, **kwargs) -> str:
+        """
+        Dump the spans as a JSON array, the kwargs are passed to json.dumps.
+        """
+        return json.dumps([span.to_object() for span in self.spans], **kwargs)
+
+    def write_json(self, path: str):
+        with open(path, "w") as f:
+            f.write(self.to_json(indent=2))
+
+
+class Tracer:
+    def __init__(self, exporter: SpanExporter = None):
+        """
+        Create the spans of the SDK methods and of their HTTP requests, and pass them to the exporter once finished.
+        The spans of the HTTP requests are children of the span of the SDK method sending them.
+        Args:
+            exporter: the exporter of the finished spans, use a new InMemorySpanExporter if None.
+
+        Examples:
+            .. code-block:: python
+                import tidbcloudy
+                from tidbcloudy.util.tracing import Tracer
+                tracer = Tracer()
+                api = tidbcloudy.TiDBCloud(public_key="your_public_key", private_key="your_private_key", tracer=tracer)
+                api.get_project("your_project_id", update_from_server=True)
+                tracer.exporter.write_json("spans.json")
+        """
+        self.exporter = exporter if exporter is not None else InMemorySpanExporter()
+
+    @contextlib.contextmanager
+    def span(self, name: str, attributes: Dict[str, Any] = None) -> Iterator[Span]:
+        """
+        Run the enclosed block in a new span, which becomes the parent of the spans started in the block.
+        """
+        span = Span(name, _current_span.get(), attributes)
+        token = _current_span.set(span)
+        error = None
+        try:
+            yield span
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            _current_span.reset(token)
+            self.end_span(span, error)
+
+    def start_span(self, name: str, attributes: Dict[str, Any] = None) -> Span:
+        """
+        Start a leaf span, which is a child of the current span, and must be finished with end_span.
+        """
+        return Span(name, _current_span.get(), attributes)
+
+    def end_span(self, span: Span, error: BaseException = None):
+        span.end(error)
+        self.exporter.export(span)
+
+
+def traced(fn: Callable) -> Callable:
+    """
+    Run a method of an object bound to a context, such as TiDBCloud or Cluster, in a span named after the method when
+    the context has a tracer. A synchronous method of an object bound to an AsyncContext, or a coroutine method of an
+    object bound to a Context, raises TypeError instead of sending requests it cannot wait for.
+    """
+    name = fn.__qualname__
+
+    if inspect.iscoroutinefunction(fn):
+
+        @functools.wraps(fn)
+        async def async_wrapper(self, *args, **kwargs):
+            if not self._context.is_async:
+                raise TypeError("{} needs an object bound to an AsyncContext".format(name))
+            tracer = self._context.tracer
+            if tracer is None:
+                return await fn(self, *args, **kwargs)
+            with tracer.span(name):
+                return await fn(self, *args, **kwargs)
+
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        if self._context.is_async:
+            raise TypeError(
+                "{} needs an object bound to a Context, use the *_async methods with an AsyncContext".format(name)
+            )
+        tracer = self._context.tracer
+        if tracer is None:
+            return fn(self, *args, **kwargs)
+        with tracer.span(name):
+            return fn(self, *args, **kwargs)
+
+    return wrapper
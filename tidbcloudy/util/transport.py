@@ -0,0 +1,91 @@
+import threading
+import weakref
+from typing import Dict
+
+import httpx
+
+
+class TransportProfile:
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 5.0,
+        http2: bool = False,
+    ):
+        """
+        The connection pool settings shared by all servers of a Context.
+        Args:
+            max_connections: the maximum number of concurrent connections.
+            max_keepalive_connections: the maximum number of idle connections kept alive in the pool.
+            keepalive_expiry: the seconds an idle connection is kept alive.
+            http2: whether to multiplex requests over HTTP/2, requires `pip install httpx[http2]`.
+        """
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.http2 = http2
+
+    @property
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def create_transport(self) -> httpx.HTTPTransport:
+        return httpx.HTTPTransport(limits=self.limits, http2=self.http2)
+
+    def create_async_transport(self) -> httpx.AsyncHTTPTransport:
+        return httpx.AsyncHTTPTransport(limits=self.limits, http2=self.http2)
+
+    def __repr__(self):
+        return "<TransportProfile max_connections={} max_keepalive_connections={} keepalive_expiry={} http2={}>".format(
+            self.max_connections, self.max_keepalive_connections, self.keepalive_expiry, self.http2
+        )
+
+
+class PoolStats:
+    def __init__(self):
+        """
+        Count requests and newly opened connections per server. A connection is new when the response arrives on a
+        network stream that has not been seen before, so `reused` is the number of requests served by a warm
+        connection.
+        """
+        self._lock = threading.Lock()
+        self._streams = weakref.WeakSet()
+        self._requests: Dict[str, int] = {}
+        self._new_connections: Dict[str, int] = {}
+        self._http_versions: Dict[str, int] = {}
+
+    def record(self, server: str, resp: httpx.Response):
+        stream = resp.extensions.get("network_stream")
+        with self._lock:
+            self._requests[server] = self._requests.get(server, 0) + 1
+            self._http_versions[resp.http_version] = self._http_versions.get(resp.http_version, 0) + 1
+            if stream is not None and stream not in self._streams:
+                self._streams.add(stream)
+                self._new_connections[server] = self._new_connections.get(server, 0) + 1
+
+    def to_object(self, transport: httpx.BaseTransport = None) -> dict:
+        with self._lock:
+            servers = {
+                server: {
+                    "requests": count,
+                    "new_connections": self._new_connections.get(server, 0),
+                    "reused": count - self._new_connections.get(server, 0),
+                }
+                for server, count in self._requests.items()
+            }
+            obj = {"servers": servers, "http_versions": dict(self._http_versions)}
+        # Only the httpx built-in transports expose their httpcore pool
+        pool = getattr(transport, "_pool", None)
+        connections = getattr(pool, "connections", None)
+        if connections is not None:
+            connections = list(connections)
+            idle = sum(1 for conn in connections if conn.is_idle())
+            obj["connections"] = len(connections)
+            obj["idle"] = idle
+            obj["active"] = len(connections) - idle
+        return obj